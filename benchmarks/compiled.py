@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Compare the generated serializer functions against the interpreted path.
+
+Usage:
+
+    python -m benchmarks.compiled [count]
+"""
+import sys
+import timeit
+from tests.watson.serialize import support
+from watson.serialize import serializers
+
+
+class Flat(object):
+
+    class Meta(object):
+        attributes = ('id', 'name', 'email', 'score', 'enum_value', 'missing')
+        strategies = {
+            'enum_value': lambda x: x.name if x else ''
+        }
+
+    def __init__(self, id):
+        self.id = id
+        self.name = 'Flat {}'.format(id)
+        self.email = 'flat{}@example.com'.format(id)
+        self.score = id * 1.5
+        self.enum_value = support.ModelEnum.test
+        self.missing = None
+
+
+def time(objs, router, compiled, repeat):
+    def serialize():
+        serializer = serializers.Instance(router)
+        serializer.compiled = compiled
+        serializer(objs)
+    return min(timeit.repeat(serialize, number=1, repeat=repeat))
+
+
+def run(count=10000, repeat=5):
+    router = support.sample_router()
+    cases = {
+        'flat': [Flat(i) for i in range(count)],
+        'routed': [
+            support.generate_model(id=i, name='Model {}'.format(i))
+            for i in range(count)],
+    }
+    results = {}
+    for case, objs in cases.items():
+        results[case] = {
+            'interpreted': time(objs, router, False, repeat),
+            'compiled': time(objs, router, True, repeat),
+        }
+    return results
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for case, results in run(count).items():
+        print('{} ({} objects)'.format(case, count))
+        for name, duration in results.items():
+            print('  {:<12} {:>8.2f}ms'.format(name, duration * 1000))
+        print('  {:<12} {:>8.2f}x'.format(
+            'speedup', results['interpreted'] / results['compiled']))
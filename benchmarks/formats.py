@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Compare the encode time and payload size of JSON, MessagePack and CBOR.
+
+Each writer is timed encoding collections of the models in
+tests/watson/serialize/support.py, for every backend that is installed.
+
+Usage:
+
+    python -m benchmarks.formats [count]
+"""
+import json
+import sys
+import timeit
+from tests.watson.serialize import support
+from watson.serialize import encoders, serializers
+
+
+def collections(count):
+    return {
+        'flat': [
+            support.generate_model(id=i, name='Model {}'.format(i))
+            for i in range(count)],
+        'nested': [support.generate_nested_model() for i in range(count)],
+        'wide': [
+            support.WideModel(
+                id=i, name='Wide {}'.format(i),
+                email='WIDE{}@EXAMPLE.COM'.format(i))
+            for i in range(count)],
+    }
+
+
+def writers():
+    for backend in encoders.backends:
+        yield 'json ({})'.format(backend), encoders.JSONWriter(backend=backend)
+    for backend in encoders.msgpack_backends:
+        yield 'msgpack ({})'.format(backend), encoders.MessagePackWriter(
+            backend=backend)
+    for backend in encoders.cbor_backends:
+        yield 'cbor ({})'.format(backend), encoders.CBORWriter(backend=backend)
+
+
+def run(count=10000, repeat=5):
+    router = support.sample_router()
+    results = {}
+    for collection, objs in collections(count).items():
+
+        def dumps():
+            return json.dumps(serializers.Instance(router)(objs)).encode('utf-8')
+        results[(collection, 'json.dumps')] = (
+            min(timeit.repeat(dumps, number=1, repeat=repeat)), len(dumps()))
+        for name, writer in writers():
+
+            def write():
+                return writer.encode(serializers.Instance(router), objs)
+            results[(collection, name)] = (
+                min(timeit.repeat(write, number=1, repeat=repeat)), len(write()))
+    return results
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print('{} objects'.format(count))
+    for (collection, name), (duration, size) in run(count).items():
+        print('  {:<8} {:<18} {:>8.2f}ms {:>10} bytes'.format(
+            collection, name, duration * 1000, size))
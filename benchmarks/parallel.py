@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Find the collection size at which serializing across an executor pays off.
+
+Usage:
+
+    python -m benchmarks.parallel [workers]
+"""
+from concurrent import futures
+import hashlib
+import sys
+import timeit
+from tests.watson.serialize import support
+from watson.serialize import serializers
+
+
+def digest(value):
+    for _ in range(500):
+        value = hashlib.sha256(value.encode('utf-8')).hexdigest()
+    return value
+
+
+class Heavy(object):
+
+    class Meta(object):
+        attributes = ('id', 'name', 'email', 'token')
+        strategies = {
+            'email': lambda x: x.lower(),
+            'token': digest,
+        }
+
+    def __init__(self, id):
+        self.id = id
+        self.name = 'Heavy {}'.format(id)
+        self.email = 'Heavy{}@Example.com'.format(id)
+        self.token = str(id)
+
+
+def time(objs, router, executor, repeat):
+    def serialize():
+        serializer = serializers.Instance(router)
+        serializer.executor = executor
+        serializer.parallel_threshold = 0
+        serializer(objs)
+    return min(timeit.repeat(serialize, number=1, repeat=repeat))
+
+
+def run(workers=4, sizes=(100, 1000, 10000, 50000), repeat=3):
+    router = support.sample_router()
+    results = {}
+    with futures.ThreadPoolExecutor(workers) as threads, \
+            futures.ProcessPoolExecutor(workers) as processes:
+        for size in sizes:
+            objs = [Heavy(i) for i in range(size)]
+            results[size] = {
+                'serial': time(objs, router, None, repeat),
+                'threads': time(objs, router, threads, repeat),
+                'processes': time(objs, router, processes, repeat),
+            }
+    return results
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    for size, results in run(workers).items():
+        print('{} objects'.format(size))
+        for name, duration in results.items():
+            print('  {:<12} {:>8.2f}ms'.format(name, duration * 1000))
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""Run the benchmark suite and write the results as JSON.
+
+Each case is timed with `timeit`, and the best, mean and worst of the repeats
+are recorded in seconds. Passing a previous results file with `--compare`
+prints the ratio of each case against it, so that regressions can be spotted
+between runs.
+
+Usage:
+
+    python -m benchmarks.suite [--output results.json] [--compare previous.json]
+                               [--quick] [--repeat 5] [cases ...]
+"""
+import argparse
+import collections
+import datetime
+import decimal
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from watson.db import utils
+from watson.http import messages
+from tests.watson.serialize import support
+from watson.serialize import (
+    batches, deserializers, limits, pagination, selections, serializers)
+from watson.serialize.decorators import serialize
+
+
+class Wide(object):
+
+    class Meta(object):
+        attributes = tuple('field_{}'.format(i) for i in range(50))
+
+    def __init__(self, id):
+        for i, attr in enumerate(self.Meta.attributes):
+            setattr(self, attr, id * i)
+
+
+class Heavy(object):
+
+    class Meta(object):
+        attributes = ('id', 'created', 'price', 'tags', 'ratio')
+        strategies = {
+            'created': lambda x: x.isoformat(),
+            'price': lambda x: str(x.quantize(decimal.Decimal('0.01'))),
+            'tags': lambda x: ','.join(sorted(x)),
+            'ratio': lambda x: round(x, 3),
+        }
+
+    def __init__(self, id):
+        self.id = id
+        self.created = datetime.datetime(2020, 1, 1) + datetime.timedelta(minutes=id)
+        self.price = decimal.Decimal(id) / 7
+        self.tags = {'a', 'b', str(id)}
+        self.ratio = id / 3
+
+
+owners = {i: 'Owner {}'.format(i) for i in range(50)}
+
+
+def owner_names(ids):
+    # stands in for a single bulk query of the distinct ids
+    found = {id: owners[id] for id in set(ids)}
+    return [found[id] for id in ids]
+
+
+class Order(object):
+
+    statuses = ('open', 'paid', 'shipped')
+
+    class Meta(object):
+        attributes = ('id', 'owner_id', 'status')
+        batch_strategies = {
+            'owner_id': owner_names,
+            'status': batches.mapping(str.upper),
+        }
+
+    def __init__(self, id):
+        self.id = id
+        self.owner_id = id % 50
+        self.status = self.statuses[id % 3]
+
+
+class Author(object):
+
+    class Meta(object):
+        attributes = ('id', 'name', 'email', 'joined', 'bio')
+        strategies = {
+            'email': str.lower,
+            'joined': lambda x: x.isoformat(),
+        }
+        route = 'models'
+
+    def __init__(self, id):
+        self.id = id
+        self.name = 'Author {}'.format(id)
+        self.email = 'AUTHOR{}@EXAMPLE.COM'.format(id)
+        self.joined = datetime.datetime(2020, 1, 1) + datetime.timedelta(days=id)
+        self.bio = 'Biography of author {}'.format(id)
+
+
+class Post(object):
+
+    class Meta(object):
+        attributes = ('id', 'title', 'author')
+
+    def __init__(self, id, author):
+        self.id = id
+        self.title = 'Post {}'.format(id)
+        self.author = author
+
+
+def nested_model(depth):
+    root = model = support.generate_model(id=1, name='Model 1')
+    for i in range(2, depth + 1):
+        model.instance = support.generate_model(id=i, name='Model {}'.format(i))
+        model.instances = [
+            support.generate_model(id=i * 100 + j) for j in range(5)]
+        model = model.instance
+    return root
+
+
+def nested_expand(depth):
+    expand = 'instance(id,name,instances(id))'
+    for _ in range(depth - 1):
+        expand = 'instance(id,name,instances(id),{})'.format(expand)
+    return expand
+
+
+class Controller(support.Controller):
+
+    objs = [
+        support.generate_model(id=i, name='Model {}'.format(i))
+        for i in range(1, 1001)]
+
+    @serialize(router=support.sample_router())
+    def list_action(self):
+        return self.objs
+
+
+def cases(quick=False):
+    """Generate the benchmark cases.
+
+    Returns:
+        OrderedDict: The name of each case and the function to time
+    """
+    router = support.sample_router()
+    output = collections.OrderedDict()
+    sizes = (1000, 10000) if quick else (1000, 10000, 100000)
+    for size in sizes:
+        objs = [
+            support.generate_model(
+                id=i, name='Model {}'.format(i), enum_value=support.ModelEnum.test)
+            for i in range(1, size + 1)]
+        output['flat_{}'.format(size)] = (
+            lambda objs=objs: serializers.Instance(router)(objs))
+    output['columnar_{}'.format(size)] = (
+        lambda objs=objs: serializers.Instance(router).serialize_columns(objs))
+
+    def guarded(objs=objs):
+        serializer = serializers.Instance(router)
+        serializer.limits = limits.Limits(depth=5, items=size * 2)
+        serializer(objs)
+    output['limits_{}'.format(size)] = guarded
+
+    models = [nested_model(6) for _ in range(100)]
+    expand = [nested_expand(5)]
+    output['nested_expand'] = lambda: serializers.Instance(router)(
+        models, expand=expand)
+
+    wide = [Wide(i) for i in range(1, 1001)]
+    output['wide_meta'] = lambda: serializers.Instance(router)(wide)
+
+    mixed = [
+        Wide(i) if i % 2 else support.generate_model(id=i)
+        for i in range(1, 1001)]
+    output['mixed_collection'] = lambda: serializers.Instance(router)(mixed)
+
+    heavy = [Heavy(i) for i in range(1, 1001)]
+    output['heavy_strategies'] = lambda: serializers.Instance(router)(heavy)
+
+    orders = [Order(i) for i in range(1, 1001)]
+    output['batch_strategies'] = lambda: serializers.Instance(router)(orders)
+
+    payload = [
+        {'id': i, 'name': 'Wide {}'.format(i), 'email': 'wide{}@example.com'.format(i)}
+        for i in range(1, 1001)]
+    deserializer = deserializers.Deserializer(support.WideModel)
+    output['deserialize_1000'] = lambda: deserializer(payload)
+
+    authors = [Author(i) for i in range(20)]
+    posts = [Post(i, authors[i % 20]) for i in range(1, 1001)]
+    author_expand = ['author(*)']
+    output['shared_nested'] = lambda: serializers.Instance(router)(
+        posts, expand=author_expand)
+
+    def normalized():
+        serializer = serializers.Instance(router)
+        serializer.normalized = True
+        serializer(posts, expand=author_expand)
+    output['shared_normalized'] = normalized
+
+    query_string = 'id,name,{},instances(id,name,instance(*))'.format(
+        nested_expand(3))
+    output['split_attributes'] = lambda: serializers.split_attributes(query_string)
+    # uncached, as selections.selection would only parse the string once
+    output['parse_selection'] = lambda: selections._parse(
+        iter(selections._tokens.findall(query_string)))
+
+    session = support.sample_wide_session(1000)
+
+    def paginate():
+        paginator = utils.Pagination(
+            session.query(support.WideModel), page=2, limit=100)
+        serializers.Instance(router)(paginator)
+    output['pagination_sqlite'] = paginate
+
+    def deep_page():
+        paginator = utils.Pagination(
+            session.query(support.WideModel), page=9, limit=100)
+        serializers.Instance(router)(paginator)
+    output['deep_page_sqlite'] = deep_page
+
+    def deep_cursor():
+        cursor = pagination.Cursor(
+            session.query(support.WideModel), after=800, limit=100)
+        serializers.Instance(router)(cursor)
+    output['deep_cursor_sqlite'] = deep_cursor
+
+    controller = Controller()
+    controller.request = messages.Request.from_environ({
+        'QUERY_STRING': 'include=id,name&expand=instance(id)'
+    })
+    controller.response = messages.Response()
+    output['decorator'] = controller.list_action
+    return output
+
+
+def revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names=None, quick=False, repeat=5):
+    """Time each of the benchmark cases.
+
+    Args:
+        names (list): The cases to run, defaults to all of them
+        quick (boolean): Skip the largest collection sizes
+        repeat (int): The number of times each case is timed
+
+    Returns:
+        dict: The environment the suite was run in and the results of each case
+    """
+    results = collections.OrderedDict()
+    for name, func in cases(quick).items():
+        if names and name not in names:
+            continue
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+        results[name] = {
+            'min': min(timings),
+            'mean': sum(timings) / len(timings),
+            'max': max(timings),
+            'number': number,
+            'repeat': repeat,
+        }
+    return {
+        'meta': {
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'revision': revision(),
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('cases', nargs='*', help='the cases to run')
+    parser.add_argument('--output', help='write the results to a JSON file')
+    parser.add_argument('--compare', help='a previous results file to compare against')
+    parser.add_argument('--quick', action='store_true', help='skip the 100k case')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+    output = run(args.cases, args.quick, args.repeat)
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)['results']
+    for name, result in output['results'].items():
+        line = '{:<20} {:>10.3f}ms'.format(name, result['min'] * 1000)
+        if name in previous:
+            line += '  {:>6.2f}x'.format(result['min'] / previous[name]['min'])
+        print(line)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Compare encoding the serialized dicts against writing JSON directly.
+
+Usage:
+
+    python -m benchmarks.writer [count]
+"""
+import json
+import sys
+import timeit
+from tests.watson.serialize import support
+from watson.serialize import encoders, serializers
+
+
+def run(count=10000, repeat=5):
+    router = support.sample_router()
+    objs = [
+        support.generate_model(id=i, name='Model {}'.format(i))
+        for i in range(count)]
+
+    def dumps():
+        json.dumps(serializers.Instance(router)(objs)).encode('utf-8')
+    results = {
+        'json.dumps': min(timeit.repeat(dumps, number=1, repeat=repeat))
+    }
+    for backend in encoders.backends:
+        writer = encoders.JSONWriter(backend=backend)
+
+        def write():
+            writer.encode(serializers.Instance(router), objs)
+        results['writer ({})'.format(backend)] = min(
+            timeit.repeat(write, number=1, repeat=repeat))
+    return results
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print('{} objects'.format(count))
+    for name, duration in run(count).items():
+        print('  {:<16} {:>8.2f}ms'.format(name, duration * 1000))
@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
+import contextlib
 import enum
 import sqlalchemy
 from sqlalchemy.ext import declarative
-from sqlalchemy import orm, Column, Integer
+from sqlalchemy import event, orm, Column, ForeignKey, Integer, String
 from watson.db import repositories, utils
 from watson.routing import routers
 from watson.serialize.decorators import serialize
-from watson.serialize import errors
+from watson.serialize import caches, encoders, errors, instrumentation, limits
 
 
 BaseModel = declarative.declarative_base()
@@ -56,6 +57,96 @@ class SubModel(BaseModel):
     value = None
 
 
+class WideModel(BaseModel):
+
+    __tablename__ = 'wide_models'
+
+    class Meta(object):
+        attributes = (
+            'id',
+            'name',
+            'email'
+        )
+        strategies = {
+            'email': lambda x: x.lower()
+        }
+        route = 'models'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    email = Column(String)
+    description = Column(String)
+    notes = Column(String)
+
+
+class Author(BaseModel):
+
+    __tablename__ = 'authors'
+
+    class Meta(object):
+        attributes = (
+            'id',
+            'name'
+        )
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class Comment(BaseModel):
+
+    __tablename__ = 'comments'
+
+    class Meta(object):
+        attributes = (
+            'id',
+            'body',
+            'author'
+        )
+
+    id = Column(Integer, primary_key=True)
+    body = Column(String)
+    article_id = Column(Integer, ForeignKey('articles.id'))
+    author_id = Column(Integer, ForeignKey('authors.id'))
+    author = orm.relationship(Author)
+
+
+class Article(BaseModel):
+
+    __tablename__ = 'articles'
+
+    class Meta(object):
+        attributes = (
+            'id',
+            'title',
+            'author',
+            'comments'
+        )
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    author_id = Column(Integer, ForeignKey('authors.id'))
+    author = orm.relationship(Author)
+    comments = orm.relationship(Comment)
+
+
+class Document(BaseModel):
+
+    __tablename__ = 'documents'
+
+    class Meta(object):
+        attributes = (
+            'id',
+            'title'
+        )
+        route = 'models'
+        version = 'revision'
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(50))
+    revision = Column(Integer, nullable=False, default=1)
+
+
 class Repository(repositories.Base):
     __model__ = Model
 
@@ -66,10 +157,106 @@ def generate_model(**kwargs):
     return model
 
 
-def sample_repository():
+def generate_nested_model():
+    model = Model(id=1, name='Model1', enum_value=ModelEnum.test)
+    model.instance = SubModel(id=2, value='SubModel')
+    model2 = Model(id=3, name='Model2', instance=model)
+    model.instances = [
+        model2
+    ]
+    return model
+
+
+async def generate_async_models(count):
+    for i in range(1, count + 1):
+        yield generate_model(id=i, name='Model {}'.format(i))
+
+
+class AsyncResult(object):
+    """Mimics the result of AsyncSession.stream, which yields rows.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    def keys(self):
+        return ['Model']
+
+    def scalars(self):
+        return self.values
+
+    def __aiter__(self):
+        raise AssertionError('rows should not be iterated')
+
+
+def sample_session():
     engine = sqlalchemy.create_engine('sqlite:///:memory:')
     session = orm.sessionmaker(bind=engine)()
     BaseModel.metadata.create_all(engine)
+    return session
+
+
+@contextlib.contextmanager
+def record_queries(session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+    engine = session.get_bind()
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def sample_wide_session(count=5):
+    session = sample_session()
+    session.add_all([
+        WideModel(
+            id=i,
+            name='Wide {}'.format(i),
+            email='WIDE{}@EXAMPLE.COM'.format(i),
+            description='description',
+            notes='notes')
+        for i in range(1, count + 1)])
+    session.commit()
+    session.expunge_all()
+    return session
+
+
+def sample_document_session(count=5):
+    session = sample_session()
+    session.add_all([
+        Document(id=i, title='Document {}'.format(i), revision=1)
+        for i in range(1, count + 1)])
+    session.commit()
+    session.expunge_all()
+    return session
+
+
+def sample_article_session(count=10):
+    session = sample_session()
+    authors = [Author(id=i, name='Author {}'.format(i)) for i in range(1, 4)]
+    session.add_all([
+        Article(
+            id=i,
+            title='Article {}'.format(i),
+            author=authors[i % 3],
+            comments=[
+                Comment(
+                    id=i * 10 + j,
+                    body='Comment {}'.format(j),
+                    author=authors[j % 3])
+                for j in range(3)])
+        for i in range(1, count + 1)])
+    session.commit()
+    session.expunge_all()
+    return session
+
+
+def sample_repository():
+    session = sample_session()
     model = generate_model()
     session.add(model)
     session.commit()
@@ -91,7 +278,39 @@ class RestError(errors.Base):
     pass
 
 
+class FakeCacheClient(object):
+    """A memcached/redis style client that stores values in a dict.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.timeouts = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=0):
+        self.data[key] = value
+        self.timeouts[key] = timeout
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def flush_all(self):
+        self.data.clear()
+
+
+def model_version(controller, **kwargs):
+    return controller.version
+
+
+response_cache = caches.Memory()
+
+
 class Controller(object):
+    calls = 0
+    version = 1
+
     @serialize(router=sample_router())
     def action(self):
         return generate_model(id=1, name='Test')
@@ -104,14 +323,106 @@ class Controller(object):
 
     @serialize(router=sample_router())
     def nested_object_action(self):
-        model = Model(id=1, name='Model1', enum_value=ModelEnum.test)
-        model.instance = SubModel(id=2, value='SubModel')
-        model2 = Model(id=3, name='Model2', instance=model)
-        model.instances = [
-            model2
-        ]
-        return model
+        return generate_nested_model()
+
+    @serialize(router=sample_router(), compiled=True)
+    def compiled_action(self):
+        return generate_nested_model()
+
+    @serialize(router=sample_router(), encoder=encoders.JSONWriter())
+    def encoded_action(self):
+        return generate_model(id=1, name='Test')
+
+    @serialize(router=sample_router(), cache=response_cache, version=model_version)
+    def cached_action(self, id=1):
+        self.calls += 1
+        return generate_model(id=id, name='Test')
+
+    @serialize(
+        router=sample_router(), encoder=encoders.JSONWriter(),
+        cache=caches.Client(FakeCacheClient()), timeout=60)
+    def cached_encoded_action(self):
+        self.calls += 1
+        return generate_model(id=1, name='Test')
+
+    @serialize(router=sample_router(), cache=response_cache)
+    def cached_error_action(self):
+        self.calls += 1
+        raise RestError(code='10')
+
+    @serialize(router=sample_router(), fragments=caches.Fragments())
+    def fragment_action(self):
+        return generate_nested_model()
 
     @serialize(router=sample_router())
     def error_action(self):
         raise RestError(code='10')
+
+    @serialize(router=sample_router(), stats=instrumentation.Header())
+    def instrumented_action(self):
+        return [generate_model(id=i, name='Test') for i in range(1, 4)]
+
+    @serialize(
+        router=sample_router(), encoder=encoders.JSONWriter(),
+        stats=instrumentation.Header())
+    def instrumented_encoded_action(self):
+        return [generate_model(id=i, name='Test') for i in range(1, 4)]
+
+    @serialize(router=sample_router(), columnar='columns')
+    def columnar_action(self):
+        return [generate_model(id=i, name='Test') for i in range(1, 4)]
+
+    @serialize(router=sample_router(), columnar='rows')
+    def columnar_error_action(self):
+        raise RestError(code='10')
+
+    @serialize(router=sample_router(), limits=limits.Limits(items=2))
+    def limited_action(self):
+        return [generate_model(id=i, name='Test') for i in range(1, 4)]
+
+    @serialize(router=sample_router(), etag=True)
+    def etag_action(self):
+        return self.documents
+
+    @serialize(router=sample_router(), encoder=encoders.JSONWriter(), etag=True)
+    def etag_encoded_action(self):
+        return self.documents
+
+    @serialize(
+        router=sample_router(), encoder=encoders.JSONWriter(), etag=True,
+        cache=caches.Memory())
+    def etag_cached_action(self):
+        self.calls += 1
+        return self.documents
+
+    @serialize(router=sample_router(), etag=True, cache=caches.Memory())
+    async def async_etag_cached_action(self):
+        self.calls += 1
+        return self.documents
+
+    @serialize(router=sample_router(), encoder=[
+        encoders.JSONWriter(), encoders.MessagePackWriter(),
+        encoders.CBORWriter()])
+    def negotiated_action(self):
+        return [generate_model(id=i, name='Test') for i in range(1, 3)]
+
+    @serialize(
+        router=sample_router(), encoder=encoders.JSONWriter(), normalized=True)
+    def normalized_action(self):
+        return [generate_nested_model(), generate_nested_model()]
+
+    @serialize(router=sample_router())
+    async def async_action(self):
+        return generate_model(id=1, name='Test')
+
+    @serialize(router=sample_router())
+    async def async_collection_action(self):
+        return generate_async_models(5)
+
+    @serialize(router=sample_router(), encoder=encoders.JSONWriter())
+    async def async_encoded_action(self):
+        return generate_async_models(2)
+
+    @serialize(router=sample_router())
+    async def async_error_action(self):
+        raise RestError(code='10')
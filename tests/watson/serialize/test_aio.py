@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+from tests.watson.serialize import support
+from watson.serialize import aio, serializers
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncSerialize(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+        self.serializer = serializers.Instance(self.router)
+
+    def test_async_iterable(self):
+        output = run(self.serializer.aserialize(
+            support.generate_async_models(3), include=['name']))
+        assert [item['name'] for item in output['items']] == [
+            'Model 1', 'Model 2', 'Model 3']
+        assert output['items'][0]['meta']['href'] == '/models/1'
+        assert output['meta']['total'] == 3
+
+    def test_matches_sync_output(self):
+        objs = [support.generate_model(id=i, name='test') for i in range(1, 4)]
+        assert run(self.serializer.aserialize(objs)) == self.serializer(objs)
+        obj = support.generate_nested_model()
+        assert run(self.serializer.aserialize(obj)) == self.serializer(obj)
+
+    def test_result_scalars(self):
+        result = support.AsyncResult(support.generate_async_models(2))
+        output = run(self.serializer.aserialize(result))
+        assert [item['id'] for item in output['items']] == [1, 2]
+
+    def test_yields_to_event_loop(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def serialize():
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            before = len(ticks)
+            items = [
+                item async for item in self.serializer.aiter_serialize(
+                    support.generate_async_models(50), chunk_size=10)]
+            task.cancel()
+            return items, len(ticks) - before
+
+        items, ticked = run(serialize())
+        assert len(items) == 50
+        assert ticked >= 5
+
+    def test_sync_iterable_yields(self):
+        objs = [support.generate_model(id=i) for i in range(1, 21)]
+
+        async def serialize():
+            return [
+                item async for item in aio.iter_serialize(
+                    self.serializer, objs, chunk_size=5)]
+        assert run(serialize()) == self.serializer(objs)['items']
+
+    def test_collect(self):
+        items = run(aio.collect(support.generate_async_models(3), chunk_size=2))
+        assert [item.id for item in items] == [1, 2, 3]
+        objs = [1, 2]
+        assert run(aio.collect(objs)) is objs
+
+
+class TestOffload(object):
+
+    def test_runs_outside_the_loop(self):
+        async def offloaded():
+            return await aio.offload(lambda value: (
+                value, threading.get_ident()), 1)
+        value, thread = run(offloaded())
+        assert value == 1
+        assert thread != threading.get_ident()
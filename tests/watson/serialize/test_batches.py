@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from concurrent import futures
+from tests.watson.serialize import support
+from watson.serialize import (
+    batches, caches, encoders, instrumentation, serializers)
+
+
+calls = []
+
+
+def owner_hrefs(values):
+    calls.append(list(values))
+    return ['/owners/{}'.format(value) for value in values]
+
+
+class Order(object):
+
+    class Meta(object):
+        attributes = ('id', 'owner_id', 'status')
+        strategies = {
+            'owner_id': lambda x: 'not used'
+        }
+        batch_strategies = {
+            'owner_id': owner_hrefs,
+            'status': batches.mapping(lambda x: x.upper()),
+        }
+
+    def __init__(self, id, owner_id=None, status=None):
+        self.id = id
+        self.owner_id = owner_id
+        self.status = status
+
+
+async def generate_orders(count):
+    for i in range(1, count + 1):
+        yield Order(i, i * 10)
+
+
+class TestBatchStrategies(object):
+
+    def setup(self):
+        del calls[:]
+        self.serializer = serializers.Instance(support.sample_router())
+
+    def test_resolved_into_plan(self):
+        self.serializer._assign_meta(Order(1))
+        plan = self.serializer._plan()
+        field = plan.fields[1]
+        assert field.batch is owner_hrefs
+        assert field.strategy is None
+        assert plan.batched
+
+    def test_called_once_per_collection(self):
+        objs = [Order(i, i * 10, 'open') for i in range(1, 4)]
+        output = self.serializer(objs)
+        assert calls == [[10, 20, 30]]
+        assert [item['owner_id'] for item in output['items']] == [
+            '/owners/10', '/owners/20', '/owners/30']
+        assert output['items'][0]['status'] == 'OPEN'
+
+    def test_skips_missing_and_null_values(self):
+        objs = [Order(1, 10), Order(2), Order(3, 30)]
+        output = self.serializer(objs)
+        assert calls == [[10, 30]]
+        assert 'owner_id' not in output['items'][1]
+        assert output['items'][2]['owner_id'] == '/owners/30'
+
+    def test_single_object(self):
+        assert self.serializer(Order(1, 10)) == {
+            'id': 1, 'owner_id': '/owners/10'}
+
+    def test_paged_by_batch_size(self):
+        self.serializer.batch_size = 2
+        output = self.serializer([Order(i, i) for i in range(1, 6)])
+        assert calls == [[1, 2], [3, 4], [5]]
+        assert len(output['items']) == 5
+
+    def test_mixed_collection(self):
+        objs = [
+            support.WideModel(id=1, name='one'), Order(2, 20),
+            'raw', Order(3, 30)]
+        output = self.serializer(objs)
+        assert calls == [[20, 30]]
+        assert output['items'][0] == {
+            'id': 1, 'name': 'one', 'meta': {'href': '/models/1'}}
+        assert output['items'][2] == 'raw'
+        assert output['items'][3]['owner_id'] == '/owners/30'
+
+    def test_compiled(self):
+        self.serializer.compiled = True
+        output = self.serializer([Order(1, 10), Order(2, 20)])
+        assert calls == [[10, 20]]
+        assert output['items'][1]['owner_id'] == '/owners/20'
+
+    def test_json_writer(self):
+        writer = encoders.JSONWriter()
+        output = writer.encode(self.serializer, [Order(1, 10), Order(2, 20)])
+        assert calls == [[10, 20]]
+        assert b'"owner_id":"/owners/20"' in output
+
+    def test_thread_executor(self):
+        with futures.ThreadPoolExecutor(2) as executor:
+            self.serializer.executor = executor
+            self.serializer.parallel_threshold = 2
+            self.serializer.parallel_chunk_size = 2
+            output = self.serializer([Order(i, i) for i in range(1, 5)])
+        assert sorted(calls) == [[1, 2], [3, 4]]
+        assert [item['owner_id'] for item in output['items']] == [
+            '/owners/1', '/owners/2', '/owners/3', '/owners/4']
+
+    def test_columns(self):
+        output = self.serializer.serialize_columns(
+            [Order(1, 10), Order(2), Order(3, 30)])
+        assert calls == [[10, 30]]
+        assert output['data']['owner_id'] == ['/owners/10', None, '/owners/30']
+
+    def test_async_iterable(self):
+        output = asyncio.run(self.serializer.aserialize(
+            generate_orders(3), chunk_size=2))
+        assert calls == [[10, 20], [30]]
+        assert output['items'][2]['owner_id'] == '/owners/30'
+
+    def test_instrumented(self):
+        self.serializer.stats = instrumentation.Stats()
+        self.serializer([Order(1, 10), Order(2, 20)])
+        assert self.serializer.stats.strategies['Order.owner_id'] > 0
+        assert calls == [[10, 20]]
+
+    def test_fragment_cache(self):
+        self.serializer.fragment_cache = caches.Fragments()
+        objs = [Order(1, 10), Order(2, 20)]
+        first = self.serializer(objs)
+        assert self.serializer(objs) == first
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+import time
+from tests.watson.serialize import support
+from watson.serialize import caches, serializers
+
+
+class TestKey(object):
+
+    def test_key(self):
+        assert caches.key('a', 1) == caches.key('a', 1)
+        assert caches.key('a', 1) != caches.key('a', 2)
+        assert len(caches.key('a' * 500)) == 40
+
+
+class TestMemory(object):
+
+    def test_get_set(self):
+        cache = caches.Memory()
+        assert cache.get('a', 'default') == 'default'
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert repr(cache)
+
+    def test_evicts_least_recently_used(self):
+        cache = caches.Memory(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert len(cache) == 2
+
+    def test_timeout(self):
+        cache = caches.Memory(timeout=60)
+        cache.set('a', 1)
+        cache.set('b', 2, timeout=0.01)
+        time.sleep(0.02)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert 'b' not in cache
+
+    def test_delete_flush(self):
+        cache = caches.Memory()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        del cache['a']
+        assert 'a' not in cache
+        assert cache.flush()
+        assert not len(cache)
+
+
+class TestClient(object):
+
+    def setup(self):
+        self.client = support.FakeCacheClient()
+        self.cache = caches.Client(self.client, prefix='test.', timeout=30)
+
+    def test_get_set(self):
+        assert self.cache.get('a') is None
+        self.cache.set('a', {'id': 1})
+        assert self.cache.get('a') == {'id': 1}
+        assert self.client.timeouts['test.a'] == 30
+        self.cache.set('b', b'bytes', timeout=5)
+        assert self.cache.get('b') == b'bytes'
+        assert self.client.timeouts['test.b'] == 5
+
+    def test_delete_flush(self):
+        self.cache.set('a', 1)
+        del self.cache['a']
+        assert self.cache.get('a') is None
+        self.cache.set('b', 1)
+        assert self.cache.flush()
+        assert not self.client.data
+
+
+class Versioned(object):
+
+    calls = 0
+
+    class Meta(object):
+        attributes = ('id', 'name')
+        strategies = {
+            'name': lambda x: Versioned.count(x)
+        }
+        version = 'updated'
+
+    def __init__(self, id, name, updated=1):
+        self.id = id
+        self.name = name
+        self.updated = updated
+
+    @classmethod
+    def count(cls, value):
+        cls.calls += 1
+        return value
+
+
+class TestFragments(object):
+
+    def setup(self):
+        Versioned.calls = 0
+        self.router = support.sample_router()
+        self.fragments = caches.Fragments()
+        self.serializer = self._serializer()
+
+    def _serializer(self):
+        serializer = serializers.Instance(self.router)
+        serializer.fragment_cache = self.fragments
+        return serializer
+
+    def test_shared_nested_object(self):
+        shared = Versioned(1, 'shared')
+        models = [support.generate_model(id=i, instance=shared) for i in range(5)]
+        output = self.serializer(models, expand=['instance(*)'])
+        assert Versioned.calls == 1
+        assert output['items'][4]['instance'] == {'id': 1, 'name': 'shared'}
+        assert self.fragments.hits == 4
+
+    def test_plans_and_versions(self):
+        obj = Versioned(1, 'name')
+        self._serializer()(obj)
+        self._serializer()(obj, include=['id'])
+        assert self._serializer()(obj) == {'id': 1, 'name': 'name'}
+        assert Versioned.calls == 1
+        obj.name, obj.updated = 'changed', 2
+        assert self._serializer()(obj)['name'] == 'changed'
+        assert Versioned.calls == 2
+        assert len(self.fragments) == 1
+
+    def test_previous(self):
+        obj = Versioned(1, 'name')
+        self.serializer(obj)
+        plan = self.serializer._plan()
+        variant = (self.router, False)
+        obj.name, obj.updated = 'changed', 2
+        assert self.fragments.get(obj, plan, variant) is None
+        assert self.fragments.previous(obj, plan, variant) == {
+            'id': 1, 'name': 'name'}
+        assert self.fragments.previous(obj, plan) is None
+        assert self.fragments.previous(Versioned(2, 'other'), plan) is None
+
+    def test_without_identifier(self):
+        assert self._serializer()(Versioned(None, 'first'))['name'] == 'first'
+        assert self._serializer()(Versioned(None, 'second'))['name'] == 'second'
+        assert not len(self.fragments)
+
+    def test_invalidate(self):
+        obj, other = Versioned(1, 'name'), Versioned(2, 'other')
+        self._serializer()([obj, other])
+        self.fragments.invalidate(Versioned, 1)
+        self._serializer()([obj, other])
+        assert Versioned.calls == 3
+        self.fragments.invalidate(Versioned)
+        assert not len(self.fragments)
+        self._serializer()(obj)
+        assert self.fragments.flush()
+        assert not len(self.fragments)
+
+    def test_listen(self):
+        session = support.sample_wide_session()
+        self.fragments.listen(support.WideModel)
+        model = session.query(support.WideModel).get(1)
+        self._serializer()(model)
+        assert len(self.fragments) == 1
+        model.name = 'Changed'
+        session.commit()
+        assert not len(self.fragments)
+        self._serializer()(model)
+        session.delete(model)
+        session.commit()
+        assert not len(self.fragments)
+
+    def test_invalidate_nested(self):
+        model = support.generate_nested_model()
+        expand = ['instance(*)', 'instances(instance(instance(*)))']
+        self._serializer()(model, expand=expand)
+        model.instance.value = 'Changed'
+        self.fragments.invalidate(support.SubModel, 2)
+        output = self._serializer()(model, expand=expand)
+        assert output['instance']['value'] == 'Changed'
+        nested = output['instances']['items'][0]['instance']['instance']
+        assert nested['value'] == 'Changed'
+        model.instance.value = 'Changed again'
+        self.fragments.invalidate(support.SubModel)
+        output = self._serializer()(model, expand=expand)
+        assert output['instance']['value'] == 'Changed again'
+
+    def test_listen_nested(self):
+        session = support.sample_article_session(count=2)
+        self.fragments.listen(support.Author)
+        articles = session.query(support.Article).all()
+        self._serializer()(articles, include=['author'], expand=['author(*)'])
+        assert len(self.fragments) == 4
+        articles[0].author.name = 'Changed'
+        session.commit()
+        assert len(self.fragments) == 2
+        output = self._serializer()(
+            articles, include=['author'], expand=['author(*)'])
+        assert output['items'][0]['author']['name'] == 'Changed'
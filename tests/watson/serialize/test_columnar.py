@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import pytest
+from tests.watson.serialize import support
+from watson.db import utils
+from watson.serialize import columnar, errors, limits, serializers
+
+
+class Status(object):
+
+    class Meta(object):
+        attributes = ('id', 'status', 'label')
+        strategies = {
+            'label': lambda x: x.upper()
+        }
+        column_strategies = {
+            'status': columnar.mapping(lambda x: x.name if x else '')
+        }
+
+    def __init__(self, id, status=None, label=None):
+        self.id = id
+        self.status = status
+        self.label = label
+
+
+class TestColumnar(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+        self.serializer = serializers.Instance(self.router)
+
+    def test_columns(self):
+        objs = [
+            support.WideModel(id=1, name='one', email='ONE@EXAMPLE.COM'),
+            support.WideModel(id=2, name='two')]
+        output = self.serializer.serialize_columns(objs)
+        assert output['columns'] == ['id', 'name', 'email']
+        assert output['data'] == {
+            'id': [1, 2],
+            'name': ['one', 'two'],
+            'email': ['one@example.com', None]}
+        assert output['hrefs'] == ['/models/1', '/models/2']
+        assert output['meta']['total'] == 2
+
+    def test_rows(self):
+        objs = [support.WideModel(id=i, name=str(i)) for i in range(1, 4)]
+        output = self.serializer.serialize_columns(
+            objs, include=['name'], orient='rows')
+        assert output['columns'] == ['id', 'name']
+        assert output['data'] == [[1, '1'], [2, '2'], [3, '3']]
+
+    def test_invalid_orient(self):
+        with pytest.raises(ValueError):
+            self.serializer.serialize_columns([], orient='index')
+
+    def test_mixed_collection(self):
+        with pytest.raises(ValueError):
+            self.serializer.serialize_columns(
+                [support.generate_model(id=1), support.SubModel(id=2)])
+        with pytest.raises(ValueError):
+            self.serializer.serialize_columns([support.generate_model(id=1), 2])
+
+    def test_empty(self):
+        output = self.serializer.serialize_columns([])
+        assert output == {'columns': [], 'data': {}}
+
+    def test_column_strategies(self):
+        objs = [
+            Status(1, support.ModelEnum.test, 'a'),
+            Status(2, None, 'b'),
+            Status(3, support.ModelEnum.test)]
+        output = self.serializer.serialize_columns(objs)
+        assert output['data']['status'] == ['test', '', 'test']
+        assert output['data']['label'] == ['A', 'B', None]
+        assert 'hrefs' not in output
+
+    def test_nested_values(self):
+        model = support.generate_model(id=1)
+        model.instance = support.SubModel(id=2, value='sub')
+        output = self.serializer.serialize_columns(
+            [model], include=['instance'])
+        assert output['data']['instance'] == [
+            {'id': 2, 'meta': {'href': '/submodels/2'}}]
+
+    def test_pagination(self):
+        session = support.sample_wide_session(5)
+        paginator = utils.Pagination(
+            session.query(support.WideModel), limit=2)
+        output = self.serializer.serialize_columns(paginator)
+        assert output['data']['id'] == [1, 2]
+        assert output['meta']['total'] == 5
+
+    def test_projected_rows(self):
+        session = support.sample_wide_session(3)
+        self.serializer.project = True
+        output = self.serializer.serialize_columns(
+            session.query(support.WideModel), orient='rows')
+        assert output['data'][0] == [1, 'Wide 1', 'wide1@example.com']
+
+    def test_limits(self):
+        objs = [support.WideModel(id=i, name='Wide') for i in range(1, 4)]
+        self.serializer.limits = limits.Limits(items=3)
+        self.serializer.serialize_columns(objs)
+        self.serializer.limits = limits.Limits(items=2)
+        with pytest.raises(errors.LimitExceeded) as exc:
+            self.serializer.serialize_columns(objs)
+        assert exc.value.limit == 'items'
+        self.serializer.limits = limits.Limits(size=100)
+        self.serializer.serialize_columns(objs[:1])
+        with pytest.raises(errors.LimitExceeded) as exc:
+            self.serializer.serialize_columns(objs)
+        assert exc.value.limit == 'size'
+
+    def test_mapping_converts_distinct_values_once(self):
+        calls = []
+
+        def strategy(value):
+            calls.append(value)
+            return str(value)
+        column = columnar.mapping(strategy)
+        assert column([1, 1, 2, [3]]) == ['1', '1', '2', '[3]']
+        assert calls == [1, 2, [3]]
+
+    def test_array(self):
+        column = columnar.array([1, 2, 3])
+        assert list(column) == [1, 2, 3]
+
+    def test_numpy_is_not_imported_with_the_module(self):
+        code = (
+            'import sys, watson.serialize.columnar; '
+            'print("numpy" in sys.modules)')
+        output = subprocess.check_output([sys.executable, '-c', code])
+        assert output.strip() == b'False'
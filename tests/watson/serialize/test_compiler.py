@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+from tests.watson.serialize import support
+from watson.serialize import compiler, plans, serializers
+
+
+class TestCompiler(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+        self.serializer = serializers.Instance(self.router)
+        self.compiled = serializers.Instance(self.router)
+        self.compiled.compiled = True
+
+    def _nested_model(self):
+        model = support.generate_model(id=1, name='test')
+        model.instance = support.SubModel(id=2, value='sub')
+        model.instances = [support.SubModel(id=3, value='sub2')]
+        return model
+
+    def test_generate(self):
+        plan = plans.Plan(
+            meta=support.Model.Meta,
+            identifier='id',
+            fields=(
+                plans.Field('id', None, (), ()),
+                plans.Field('enum_value', support.Model.Meta.strategies['enum_value'], (), ())),
+            include_null=False,
+            route=None,
+            expose_meta=True)
+        func = compiler.generate(plan)
+        output = func(support.generate_model(id=1), False, None)
+        assert output == {'id': 1, 'enum_value': 'test'}
+        assert 'getattr' in func.__source__
+
+    def test_function_cached(self):
+        self.compiled(support.generate_model(id=1))
+        plan = self.compiled._plan()
+        assert compiler.function(plan) is compiler.function(plan)
+
+    def test_matches_interpreted(self):
+        for kwargs in (
+                {},
+                {'include': ['*']},
+                {'include': ['name'], 'exclude': ['enum_value']},
+                {'expand': ['instance(*)', 'instances(value)']}):
+            model = self._nested_model()
+            assert self.compiled(model, **kwargs) == self.serializer(model, **kwargs)
+
+    def test_matches_interpreted_collection(self):
+        models = [self._nested_model() for _ in range(3)]
+        output = self.compiled(models, expand=['instances(*)'])
+        assert output == self.serializer(models, expand=['instances(*)'])
+        assert output['items'][0]['instances']['items'][0]['value'] == 'sub2'
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import io
+import json
 from watson.http import messages
 from tests.watson.serialize import support
+from watson.serialize import packers, serializers
 
 
 class TestDecorators(object):
@@ -8,6 +12,7 @@ class TestDecorators(object):
     def setup(self):
         self.router = support.sample_router()
         self.controller = support.Controller()
+        support.response_cache.flush()
 
     def test_serialize(self):
         self.controller.request = messages.Request.from_environ({})
@@ -42,3 +47,231 @@ class TestDecorators(object):
         output = self.controller.nested_object_action()
         assert 'name' in output
         assert 'value' in output['instance']
+
+    def test_compiled(self):
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'expand=instance(id, value)'
+        })
+        output = self.controller.compiled_action()
+        assert output['instance']['value'] == 'SubModel'
+
+    def test_encoder(self):
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'include=name'
+        })
+        self.controller.response = messages.Response()
+        response = self.controller.encoded_action()
+        assert response is self.controller.response
+        assert response.headers['Content-Type'].startswith('application/json')
+        assert json.loads(response.body) == {
+            'id': 1, 'name': 'Test', 'meta': {'href': '/models/1'}}
+
+    def test_cache(self):
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'include=name'
+        })
+        first = self.controller.cached_action()
+        second = self.controller.cached_action()
+        assert first == second
+        assert self.controller.calls == 1
+        self.controller.cached_action(id=2)
+        assert self.controller.calls == 2
+
+    def test_cache_keyed_on_args_and_version(self):
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'include=id'
+        })
+        output = self.controller.cached_action()
+        assert 'name' not in output
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'include=name'
+        })
+        output = self.controller.cached_action()
+        assert 'name' in output
+        self.controller.version = 2
+        self.controller.cached_action()
+        assert self.controller.calls == 3
+
+    def test_cache_ignores_other_methods(self):
+        self.controller.request = messages.Request.from_environ({
+            'REQUEST_METHOD': 'POST',
+            'wsgi.input': io.BytesIO()
+        })
+        self.controller.cached_action(id=3)
+        self.controller.cached_action(id=3)
+        assert self.controller.calls == 2
+
+    def test_cache_encoded(self):
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        first = self.controller.cached_encoded_action().raw_body
+        self.controller.response = messages.Response()
+        response = self.controller.cached_encoded_action()
+        assert response.raw_body == first
+        assert response.headers['Content-Type'].startswith('application/json')
+        assert self.controller.calls == 1
+
+    def test_cache_skips_errors(self):
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        self.controller.cached_error_action()
+        self.controller.cached_error_action()
+        assert self.controller.calls == 2
+
+    def test_fragments(self):
+        self.controller.request = messages.Request.from_environ({})
+        first = self.controller.fragment_action()
+        second = self.controller.fragment_action()
+        assert first == second
+        assert first['instance'] is second['instance']
+
+    def test_async(self):
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'include=name'
+        })
+        output = asyncio.run(self.controller.async_action())
+        assert output['name'] == 'Test'
+        output = asyncio.run(self.controller.async_collection_action())
+        assert len(output['items']) == 5
+        assert output['items'][4]['name'] == 'Model 5'
+
+    def test_async_encoder(self):
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'include=id'
+        })
+        self.controller.response = messages.Response()
+        response = asyncio.run(self.controller.async_encoded_action())
+        assert [item['id'] for item in json.loads(response.body)['items']] == [1, 2]
+
+    def test_async_status_code(self):
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        output = asyncio.run(self.controller.async_error_action())
+        assert self.controller.response.status_code == 406
+        assert 'message' in output
+
+    def test_stats_header(self):
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        output = self.controller.instrumented_action()
+        assert len(output['items']) == 3
+        assert 'serialize;dur=' in self.controller.response.headers['Server-Timing']
+
+    def test_stats_header_encoded(self):
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        response = self.controller.instrumented_encoded_action()
+        assert 'serialize;dur=' in response.headers['Server-Timing']
+
+    def test_columnar(self):
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'include=name'
+        })
+        output = self.controller.columnar_action()
+        assert output['columns'] == ['id', 'name']
+        assert output['data']['name'] == ['Test', 'Test', 'Test']
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        output = self.controller.columnar_error_action()
+        assert self.controller.response.status_code == 406
+        assert 'message' in output
+
+    def test_etag(self):
+        session = support.sample_document_session(2)
+        self.controller.documents = session.query(support.Document).all()
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        output = self.controller.etag_action()
+        etag = self.controller.response.headers.get('ETag')
+        assert len(output['items']) == 2
+        self.controller.request = messages.Request.from_environ({
+            'HTTP_IF_NONE_MATCH': etag
+        })
+        self.controller.response = messages.Response()
+        output = self.controller.etag_action()
+        assert output is self.controller.response
+        assert output.status_code == 304
+        assert not output.body
+        self.controller.documents[0].revision = 2
+        self.controller.response = messages.Response()
+        output = self.controller.etag_action()
+        assert self.controller.response.status_code == 200
+        assert self.controller.response.headers.get('ETag') != etag
+
+    def test_etag_encoded(self):
+        session = support.sample_document_session(2)
+        self.controller.documents = session.query(support.Document).all()
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        self.controller.etag_encoded_action()
+        etag = self.controller.response.headers.get('ETag')
+        self.controller.etag_action()
+        assert self.controller.response.headers.get('ETag') != etag
+
+    def test_etag_cached(self):
+        session = support.sample_document_session(2)
+        self.controller.documents = session.query(support.Document).all()
+        for action in (
+                self.controller.etag_cached_action,
+                self.controller.async_etag_cached_action):
+            def call():
+                output = action()
+                if asyncio.iscoroutine(output):
+                    output = asyncio.run(output)
+                return output
+            self.controller.calls = 0
+            self.controller.request = messages.Request.from_environ({})
+            self.controller.response = messages.Response()
+            call()
+            etag = self.controller.response.headers.get('ETag')
+            assert etag
+            self.controller.response = messages.Response()
+            call()
+            assert self.controller.response.status_code == 200
+            assert self.controller.response.headers.get('ETag') == etag
+            self.controller.request = messages.Request.from_environ({
+                'HTTP_IF_NONE_MATCH': etag
+            })
+            self.controller.response = messages.Response()
+            output = call()
+            assert output is self.controller.response
+            assert output.status_code == 304
+            assert not output.body
+            assert self.controller.calls == 1
+
+    def test_negotiated_encoder(self):
+        expected = serializers.Instance(self.router)(
+            [support.generate_model(id=i, name='Test') for i in range(1, 3)])
+        for accept, mimetype, dumps in (
+                (None, 'application/json; charset=utf-8', None),
+                ('application/msgpack', 'application/msgpack', packers.msgpack),
+                ('application/cbor, */*;q=0.1', 'application/cbor', packers.cbor)):
+            environ = {'HTTP_ACCEPT': accept} if accept else {}
+            self.controller.request = messages.Request.from_environ(environ)
+            self.controller.response = messages.Response()
+            response = self.controller.negotiated_action()
+            assert response.headers['Content-Type'] == mimetype
+            assert response.headers['Vary'] == 'Accept'
+            if dumps:
+                assert response.raw_body == dumps(expected)
+            else:
+                assert json.loads(response.body) == expected
+
+    def test_normalized(self):
+        self.controller.request = messages.Request.from_environ({
+            'QUERY_STRING': 'expand=instance(*)'
+        })
+        self.controller.response = messages.Response()
+        response = self.controller.normalized_action()
+        output = json.loads(response.body)
+        assert output['items'][1]['instance'] == {
+            'id': 2, 'meta': {'href': '/submodels/2'}}
+        assert output['included']['tests.watson.serialize.support.SubModel'][
+            '2']['value'] == 'SubModel'
+
+    def test_limits(self):
+        self.controller.request = messages.Request.from_environ({})
+        self.controller.response = messages.Response()
+        output = self.controller.limited_action()
+        assert self.controller.response.status_code == 413
+        assert output['code'] == '4131'
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from tests.watson.serialize import support
+from watson.serialize import batches, caches, deltas, serializers
+
+
+class Note(object):
+
+    class Meta(object):
+        attributes = ('id', 'body', 'status', 'author')
+        batch_strategies = {
+            'status': batches.mapping(lambda x: x.upper())
+        }
+        route = 'models'
+        version = 'revision'
+
+    def __init__(self, id, body=None, status=None, author=None, revision=1):
+        self.id = id
+        self.body = body
+        self.status = status
+        self.author = author
+        self.revision = revision
+
+
+class TestDiff(object):
+
+    def test_changed_and_removed(self):
+        assert deltas.diff(
+            {'id': 1, 'name': 'a', 'age': 3}, {'id': 1, 'name': 'b'}) == {
+            'name': 'b', 'age': None}
+
+    def test_nested(self):
+        previous = {'author': {'id': 1, 'name': 'a'}, 'tags': [1, 2]}
+        current = {'author': {'id': 1, 'name': 'b'}, 'tags': [1, 2, 3]}
+        assert deltas.diff(previous, current) == {
+            'author': {'name': 'b'}, 'tags': [1, 2, 3]}
+
+    def test_unchanged(self):
+        assert deltas.diff({'id': 1}, {'id': 1}) == {}
+
+
+class TestChanged(object):
+
+    def test_history(self):
+        session = support.sample_document_session(1)
+        document = session.get(support.Document, 1)
+        assert deltas.changed(document) == set()
+        document.title = 'Changed'
+        assert deltas.changed(document) == {'title'}
+        session.flush()
+        assert deltas.changed(document) == set()
+
+    def test_not_mapped(self):
+        assert deltas.changed(Note(1)) is None
+        assert deltas.changed('value') is None
+
+
+class TestDelta(object):
+
+    def setup(self):
+        self.serializer = serializers.Instance(support.sample_router())
+
+    def test_history(self):
+        session = support.sample_document_session(1)
+        document = session.get(support.Document, 1)
+        assert self.serializer.delta(document) is None
+        document.title = 'Changed'
+        assert self.serializer.delta(document) == {
+            'title': 'Changed', 'meta': {'href': '/models/1'}}
+        document.title = None
+        assert self.serializer.delta(document) == {
+            'title': None, 'meta': {'href': '/models/1'}}
+        assert self.serializer.delta(document, include=['id']) is None
+
+    def test_previous(self):
+        note = Note(1, 'body', 'open', author=support.Author(id=1, name='a'))
+        previous = self.serializer(note, expand=['author(*)'])
+        note.body = None
+        note.author.name = 'b'
+        assert self.serializer.delta(
+            note, expand=['author(*)'], previous=previous) == {
+            'body': None, 'author': {'name': 'b'},
+            'meta': {'href': '/models/1'}}
+        assert self.serializer.delta(note, previous=previous) == {
+            'body': None, 'author': {'name': None},
+            'meta': {'href': '/models/1'}}
+
+    def test_fragments(self):
+        self.serializer.fragment_cache = caches.Fragments()
+        note = Note(1, 'body', 'open')
+        assert self.serializer(note)['status'] == 'OPEN'
+        note.status, note.revision = 'closed', 2
+        assert self.serializer.delta(note) == {
+            'status': 'CLOSED', 'meta': {'href': '/models/1'}}
+        assert self.serializer.delta(note) is None
+        assert self.serializer(note)['status'] == 'CLOSED'
+
+    def test_full(self):
+        assert self.serializer.delta(Note(1, 'body')) == {
+            'id': 1, 'body': 'body', 'meta': {'href': '/models/1'}}
+        assert self.serializer.delta(None) is None
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import enum
+import pytest
+from tests.watson.serialize import support
+from watson.serialize import deserializers, errors, serializers
+
+
+class Status(enum.Enum):
+    open = 'open'
+    closed = 'closed'
+
+
+def parse_status(value):
+    try:
+        return Status[value]
+    except KeyError:
+        raise ValueError('Must be open or closed.')
+
+
+class Ticket(object):
+
+    class Meta(object):
+        attributes = ('id', 'title', 'status', 'priority')
+        read_only = ('id',)
+        required = ('title',)
+        strategies = {
+            'status': lambda x: x.name
+        }
+        inverse_strategies = {
+            'status': parse_status,
+            'priority': int,
+        }
+
+    id = None
+    title = None
+    status = None
+    priority = None
+
+
+class TestDeserializer(object):
+
+    def setup(self):
+        self.deserializer = deserializers.Deserializer(Ticket)
+
+    def _errors(self, data, **kwargs):
+        with pytest.raises(errors.Invalid) as exc:
+            self.deserializer(data, **kwargs)
+        return exc.value.errors
+
+    def test_object(self):
+        ticket = self.deserializer(
+            {'id': 5, 'title': 'Test', 'status': 'open', 'priority': '2'})
+        assert isinstance(ticket, Ticket)
+        assert ticket.id is None
+        assert ticket.title == 'Test'
+        assert ticket.status is Status.open
+        assert ticket.priority == 2
+
+    def test_round_trip(self):
+        ticket = self.deserializer({'title': 'Test', 'status': 'closed'})
+        output = serializers.Instance(support.sample_router())(ticket)
+        assert self.deserializer(output).status is Status.closed
+
+    def test_collects_errors(self):
+        assert self._errors([
+            {'title': 'Valid'},
+            {'status': 'pending', 'priority': ['high']},
+            'invalid',
+            {'title': None},
+        ]) == {
+            '/1/title': 'This field is required.',
+            '/1/status': 'Must be open or closed.',
+            '/1/priority': 'Invalid value.',
+            '/2': 'Expected an object.',
+            '/3/title': 'This field may not be null.',
+        }
+        assert self._errors('invalid') == {'': 'Expected an object.'}
+
+    def test_update(self):
+        ticket = self.deserializer({'title': 'Test', 'priority': 1})
+        updated = self.deserializer(
+            {'status': 'closed'}, instance=ticket, partial=True)
+        assert updated is ticket
+        assert ticket.title == 'Test'
+        assert ticket.status is Status.closed
+
+    def test_invalid_update_is_not_assigned(self):
+        ticket = self.deserializer({'title': 'Test'})
+        self._errors({'title': 'Changed', 'status': 'pending'}, instance=ticket)
+        assert ticket.title == 'Test'
+        assert ticket.status is None
+
+    def test_strict(self):
+        self.deserializer.strict = True
+        assert self._errors({'title': 'Test', 'unknown': 1, 'id': 1}) == {
+            '/unknown': 'Unknown field.', '/id': 'Unknown field.'}
+
+    def test_bulk(self):
+        tickets = self.deserializer([
+            {'title': 'Ticket {}'.format(i), 'priority': i}
+            for i in range(1000)])
+        assert len(tickets) == 1000
+        assert tickets[-1].priority == 999
+
+    def test_generated_once_per_meta(self):
+        func = deserializers.function(Ticket)
+        self.deserializer([{'title': 'Test'}])
+        assert deserializers.function(Ticket) is func
+        assert self.deserializer.function is func
+        assert 'strategy_' in func.__source__
+
+    def test_error_output(self):
+        with pytest.raises(errors.Invalid) as exc:
+            self.deserializer({})
+        output = serializers.Instance(support.sample_router())(exc.value)
+        assert output['code'] == '4222'
+        assert output['errors'] == {'/title': 'This field is required.'}
+        assert exc.value.status_code == 422
+
+
+class TestSQLAlchemy(object):
+
+    def test_column_types(self):
+        deserializer = deserializers.Deserializer(support.Document)
+        assert deserializer({'id': 1, 'title': 'Test'}).title == 'Test'
+        with pytest.raises(errors.Invalid) as exc:
+            deserializer([
+                {'id': '1', 'title': 1},
+                {'id': True, 'title': 'x' * 51},
+            ])
+        assert exc.value.errors == {
+            '/0/id': 'Expected an integer.',
+            '/0/title': 'Expected a string.',
+            '/1/id': 'Expected an integer.',
+            '/1/title': 'Ensure this value has at most 50 characters.',
+        }
+
+    def test_relationships(self):
+        deserializer = deserializers.Deserializer(support.Article)
+        article = deserializer({
+            'id': 1,
+            'title': 'Article',
+            'author': {'id': 1, 'name': 'Author'},
+            'comments': [{'id': 2, 'body': 'Comment'}],
+        })
+        assert isinstance(article.author, support.Author)
+        assert article.comments[0].body == 'Comment'
+        session = support.sample_session()
+        session.add(article)
+        session.commit()
+        with pytest.raises(errors.Invalid) as exc:
+            deserializer({
+                'author': 'Author',
+                'comments': [{'body': 1}, None],
+            })
+        assert exc.value.errors == {
+            '/author': 'Expected an object.',
+            '/comments/0/body': 'Expected a string.',
+            '/comments/1': 'Expected an object.',
+        }
+        with pytest.raises(errors.Invalid) as exc:
+            deserializer({'comments': {}})
+        assert exc.value.errors == {'/comments': 'Expected a list.'}
+
+    def test_strict_relationships(self):
+        deserializer = deserializers.Deserializer(support.Article, strict=True)
+        with pytest.raises(errors.Invalid) as exc:
+            deserializer({
+                'author': {'name': 'Author', 'bogus': 1},
+                'comments': [{'bogus': 2}],
+            })
+        assert exc.value.errors == {
+            '/author/bogus': 'Unknown field.',
+            '/comments/0/bogus': 'Unknown field.',
+        }
+
+    def test_repr(self):
+        deserializer = deserializers.Deserializer(support.Author)
+        assert repr(deserializer) == (
+            '<watson.serialize.deserializers.Deserializer '
+            'model:tests.watson.serialize.support.Author>')
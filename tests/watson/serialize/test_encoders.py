@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+import json
+import pytest
+from tests.watson.serialize import support
+from watson.db import utils
+from watson.serialize import encoders, packers, serializers
+
+
+class TestJSON(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+        self.encoder = encoders.JSON(chunk_size=2)
+
+    def _decode(self, chunks):
+        return json.loads(b''.join(chunks).decode('utf-8'))
+
+    def test_encode_instance(self):
+        serializer = serializers.Instance(self.router)
+        model = support.generate_model(id=1, name='test')
+        output = self._decode(self.encoder.iterencode(serializer, model))
+        assert output['name'] == 'test'
+
+    def test_encode_collection(self):
+        models = [support.generate_model(id=i, name='test') for i in range(5)]
+        chunks = list(self.encoder.iterencode(
+            serializers.Instance(self.router), models, include=['name']))
+        assert len(chunks) == 3
+        expected = serializers.Instance(self.router)(models, include=['name'])
+        assert self._decode(chunks) == expected
+        assert self._decode(chunks)['meta']['total'] == 5
+
+    def test_encode_empty_collection(self):
+        output = self._decode(self.encoder.iterencode(
+            serializers.Instance(self.router), []))
+        assert output == {'items': [], 'meta': {'limit': 0, 'page': 1, 'total': 0}}
+
+    def test_encode_without_meta(self):
+        class Model(object):
+            class Meta(object):
+                attributes = ('id',)
+                expose_meta = False
+
+            def __init__(self, id):
+                self.id = id
+        output = self._decode(self.encoder.iterencode(
+            serializers.Instance(self.router), [Model(1), Model(2)]))
+        assert output == [{'id': 1}, {'id': 2}]
+
+    def test_encode_pagination(self):
+        repository = support.sample_repository()
+        paginator = utils.Pagination(repository.query)
+        output = self._decode(self.encoder.iterencode(
+            serializers.Instance(self.router), paginator))
+        assert output['meta']['href'] == '/models?page=1'
+        assert len(output['items']) == 1
+
+
+class TestJSONWriter(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+
+    def _compare(self, writer, instance, **kwargs):
+        output = writer.encode(
+            serializers.Instance(self.router), instance, **kwargs)
+        assert isinstance(output, bytes)
+        expected = serializers.Instance(self.router)(instance, **kwargs)
+        assert json.loads(output.decode('utf-8')) == expected
+
+    def test_backends(self):
+        assert 'json' in encoders.backends
+        for backend in encoders.backends:
+            writer = encoders.JSONWriter(backend=backend)
+            assert writer.backend == backend
+            self._compare(writer, support.generate_nested_model())
+
+    def test_matches_serializer(self):
+        writer = encoders.JSONWriter(backend='json')
+        for kwargs in (
+                {},
+                {'include': ['*']},
+                {'exclude': ['name']},
+                {'expand': ['instance(*)', 'instances(id,instance(*))']}):
+            self._compare(writer, support.generate_nested_model(), **kwargs)
+
+    def test_collection(self):
+        writer = encoders.JSONWriter(backend='json')
+        models = [support.generate_model(id=i, name='test') for i in range(3)]
+        self._compare(writer, models)
+        self._compare(writer, [])
+        self._compare(writer, [1, 'a'])
+
+    def test_pagination(self):
+        writer = encoders.JSONWriter()
+        repository = support.sample_repository()
+        self._compare(writer, utils.Pagination(repository.query))
+
+    def test_none(self):
+        writer = encoders.JSONWriter()
+        assert writer.encode(serializers.Instance(self.router), None) == b'null'
+
+    def test_reuses_buffer(self):
+        buffer = bytearray()
+        writer = encoders.JSONWriter(buffer=buffer)
+        writer.encode(
+            serializers.Instance(self.router), support.generate_model(id=1))
+        output = writer.encode(
+            serializers.Instance(self.router), support.generate_model(id=2))
+        assert writer.buffer is buffer
+        assert bytes(buffer) == output
+        assert json.loads(output.decode('utf-8'))['id'] == 2
+
+
+class TestPackedWriters(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+
+    def _compare(self, writer, dumps, instance, **kwargs):
+        output = writer.encode(
+            serializers.Instance(self.router), instance, **kwargs)
+        assert isinstance(output, bytes)
+        expected = serializers.Instance(self.router)(instance, **kwargs)
+        assert output == dumps(expected)
+
+    @pytest.mark.parametrize('writer, dumps', [
+        (encoders.MessagePackWriter(backend='python'), packers.msgpack),
+        (encoders.CBORWriter(backend='python'), packers.cbor),
+    ])
+    def test_matches_serializer(self, writer, dumps):
+        for kwargs in (
+                {},
+                {'include': ['*']},
+                {'exclude': ['name']},
+                {'expand': ['instance(*)', 'instances(id,instance(*))']}):
+            self._compare(
+                writer, dumps, support.generate_nested_model(), **kwargs)
+        models = [support.generate_model(id=i, name='test') for i in range(20)]
+        self._compare(writer, dumps, models)
+        self._compare(writer, dumps, [])
+        self._compare(writer, dumps, [1, 'a', None])
+        self._compare(writer, dumps, None)
+        repository = support.sample_repository()
+        self._compare(writer, dumps, utils.Pagination(repository.query))
+
+    def test_backends(self):
+        for writer_class, backends in (
+                (encoders.MessagePackWriter, encoders.msgpack_backends),
+                (encoders.CBORWriter, encoders.cbor_backends)):
+            assert 'python' in backends
+            for backend in backends:
+                writer = writer_class(backend=backend)
+                assert writer.backend == backend
+                assert writer.charset is None
+                output = writer.encode(
+                    serializers.Instance(self.router),
+                    support.generate_nested_model())
+                assert output == writer_class(backend='python').encode(
+                    serializers.Instance(self.router),
+                    support.generate_nested_model())
+
+
+class TestNegotiate(object):
+
+    def setup(self):
+        self.writers = [
+            encoders.JSONWriter(), encoders.MessagePackWriter(),
+            encoders.CBORWriter()]
+
+    def test_default(self):
+        assert encoders.negotiate(None, self.writers) is self.writers[0]
+        assert encoders.negotiate('*/*', self.writers) is self.writers[0]
+        assert encoders.negotiate('text/html', self.writers) is self.writers[0]
+
+    def test_exact(self):
+        assert encoders.negotiate(
+            'application/cbor', self.writers) is self.writers[2]
+        assert encoders.negotiate(
+            'text/html, application/msgpack', self.writers) is self.writers[1]
+
+    def test_quality(self):
+        accept = 'application/json;q=0.5, application/msgpack;q=0.9, */*;q=0.1'
+        assert encoders.negotiate(accept, self.writers) is self.writers[1]
+        accept = 'application/*, application/json;q=0'
+        assert encoders.negotiate(accept, self.writers) is self.writers[1]
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from tests.watson.serialize import support
+from watson.db import utils
+from watson.serialize import etags, pagination, serializers
+
+
+class TestCompute(object):
+
+    def setup(self):
+        self.serializer = serializers.Instance(support.sample_router())
+        self.session = support.sample_document_session(3)
+        self.documents = self.session.query(support.Document).all()
+
+    def compute(self, instance, *args, **kwargs):
+        return etags.compute(
+            serializers.Instance(support.sample_router()), instance,
+            *args, **kwargs)
+
+    def test_object(self):
+        etag = self.compute(self.documents[0])
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == self.compute(self.documents[0])
+        assert etag != self.compute(self.documents[1])
+        self.documents[0].revision = 2
+        assert etag != self.compute(self.documents[0])
+
+    def test_selection(self):
+        etag = self.compute(self.documents)
+        assert etag == self.compute(self.documents)
+        assert etag != self.compute(self.documents, include=['id'])
+        assert etag != self.compute(self.documents, exclude=['title'])
+        assert etag != self.compute(self.documents, None, None, None, 'application/json')
+
+    def test_collection_versions(self):
+        etag = self.compute(self.documents)
+        self.documents[2].revision = 2
+        assert etag != self.compute(self.documents)
+        assert etag != self.compute(self.documents[:2])
+
+    def test_query(self):
+        query = self.session.query(support.Document)
+        with support.record_queries(self.session) as statements:
+            etag = self.compute(query)
+        assert etag == self.compute(self.documents)
+        assert 'title' not in statements[0]
+
+    def test_paginated(self):
+        query = self.session.query(support.Document)
+        first = self.compute(utils.Pagination(query, limit=2))
+        assert first != self.compute(utils.Pagination(query, page=2, limit=2))
+        assert first != self.compute(pagination.Cursor(query, limit=2))
+
+    def test_unversioned(self):
+        model = support.generate_model(id=1)
+        assert self.compute(model) is None
+        assert self.compute([self.documents[0], model]) is None
+        assert self.compute(iter(self.documents)) is None
+        assert self.compute(None) is None
+
+    def test_matches(self):
+        assert etags.matches('"a"', '"a"')
+        assert etags.matches('"b", W/"a"', '"a"')
+        assert etags.matches('*', '"a"')
+        assert not etags.matches('"b"', '"a"')
+        assert not etags.matches(None, '"a"')
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from concurrent import futures
+from tests.watson.serialize import support
+from watson.serialize import batches, caches, included, serializers
+
+
+calls = []
+
+
+def upper(value):
+    calls.append(value)
+    return value.upper()
+
+
+class Person(object):
+
+    class Meta(object):
+        attributes = ('id', 'name', 'email', 'friend')
+        strategies = {
+            'name': upper
+        }
+        route = 'models'
+        type = 'Person'
+
+    def __init__(self, id, name=None, email=None, friend=None):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.friend = friend
+
+
+class Member(Person):
+
+    class Meta(object):
+        attributes = ('id', 'name')
+        batch_strategies = {
+            'name': batches.mapping(str.upper)
+        }
+
+
+class Post(object):
+
+    class Meta(object):
+        attributes = ('id', 'author', 'readers')
+
+    def __init__(self, id, author=None, readers=None):
+        self.id = id
+        self.author = author
+        self.readers = readers
+
+
+class TestIncluded(object):
+
+    def setup(self):
+        del calls[:]
+        self.serializer = serializers.Instance(support.sample_router())
+        self.serializer.normalized = True
+        self.authors = [
+            Person(i, 'Person {}'.format(i), 'p{}@example.com'.format(i))
+            for i in range(1, 4)]
+
+    def test_deduplicates(self):
+        posts = [Post(i, self.authors[i % 3]) for i in range(1, 51)]
+        output = self.serializer(posts, expand=['author(id,name,email)'])
+        assert len(calls) == 3
+        assert output['items'][0] == {
+            'id': 1, 'author': {'id': 2, 'meta': {'href': '/models/2'}}}
+        assert output['included'] == {'Person': {
+            str(person.id): {
+                'id': person.id, 'name': person.name.upper(),
+                'email': person.email,
+                'meta': {'href': '/models/{}'.format(person.id)}}
+            for person in self.authors}}
+        assert output['meta']['total'] == 50
+
+    def test_lists_and_single_objects(self):
+        post = Post(1, self.authors[0], readers=self.authors)
+        output = self.serializer(
+            post, expand=['author(id,name,email)', 'readers(id,name)'])
+        assert output['readers']['items'][2] == {
+            'id': 3, 'meta': {'href': '/models/3'}}
+        assert output['included']['Person']['1'] == {
+            'id': 1, 'name': 'PERSON 1', 'email': 'p1@example.com',
+            'meta': {'href': '/models/1'}}
+        assert output['included']['Person']['2'] == {
+            'id': 2, 'name': 'PERSON 2', 'meta': {'href': '/models/2'}}
+
+    def test_references_are_not_included(self):
+        posts = [Post(i, self.authors[0]) for i in range(1, 3)]
+        output = self.serializer(posts)
+        assert output['items'][1]['author'] == {
+            'id': 1, 'meta': {'href': '/models/1'}}
+        assert output['included'] == {}
+
+    def test_cycles(self):
+        first, second = Person(1, 'first'), Person(2, 'second')
+        first.friend, second.friend = second, first
+        output = self.serializer(first, expand=['friend(*,friend(*))'])
+        assert output['friend'] == {'id': 2, 'meta': {'href': '/models/2'}}
+        assert output['included']['Person']['2']['friend'] == {
+            'id': 1, 'meta': {'href': '/models/1'}}
+
+    def test_without_envelope(self):
+        class Plain(object):
+            class Meta(object):
+                attributes = ('id', 'author')
+                expose_meta = False
+
+            def __init__(self, id, author):
+                self.id = id
+                self.author = author
+        output = self.serializer(
+            [Plain(1, self.authors[0])], expand=['author(id,email)'])
+        href = {'href': '/models/1'}
+        assert output == {
+            'items': [{'id': 1, 'author': {'id': 1, 'meta': href}}],
+            'included': {'Person': {'1': {
+                'id': 1, 'email': 'p1@example.com', 'meta': href}}}}
+
+    def test_fragment_cache(self):
+        self.serializer.fragment_cache = caches.Fragments()
+        post = Post(1, self.authors[0], readers=[self.authors[0]])
+        first = self.serializer(
+            Post(2, self.authors[0]), expand=['author(id,name)'])
+        output = self.serializer(
+            post, expand=['author(id,name)', 'readers(id,email)'])
+        assert output['included']['Person']['1'] == {
+            'id': 1, 'name': 'PERSON 1', 'email': 'p1@example.com',
+            'meta': {'href': '/models/1'}}
+        assert first['included']['Person']['1'] == {
+            'id': 1, 'name': 'PERSON 1', 'meta': {'href': '/models/1'}}
+
+    def test_fragment_cache_between_modes(self):
+        self.serializer.fragment_cache = caches.Fragments()
+        post = Post(1, self.authors[0])
+        expand = ['author(id,name)']
+        for _ in range(2):
+            output = self.serializer(post, expand=expand)
+            assert output['included']['Person']['1']['name'] == 'PERSON 1'
+        self.serializer.normalized = False
+        output = self.serializer(post, expand=expand)
+        assert 'included' not in output
+        assert output['author']['name'] == 'PERSON 1'
+
+    def test_batched_objects(self):
+        posts = [Post(i, Member(i % 2, 'member')) for i in range(4)]
+        output = self.serializer(posts, expand=['author(*)'])
+        name = 'tests.watson.serialize.test_included.Member'
+        assert list(output['included']) == [name]
+        assert output['included'][name]['1']['name'] == 'MEMBER'
+
+    def test_classes_with_the_same_name(self):
+        class Member(object):
+
+            class Meta(object):
+                attributes = ('id', 'name')
+
+            def __init__(self, id, name):
+                self.id = id
+                self.name = name
+        members = [Member(1, 'Local'), globals()['Member'](1, 'Global')]
+        output = self.serializer(
+            Post(1, readers=members), expand=['readers(*)'])
+        assert sorted(output['included']) == [
+            'tests.watson.serialize.test_included.Member',
+            'tests.watson.serialize.test_included.TestIncluded.'
+            'test_classes_with_the_same_name.<locals>.Member']
+
+    def test_objects_without_identifier(self):
+        readers = [Post(None, author) for author in self.authors[:2]]
+        output = self.serializer(
+            Post(1, readers=readers), expand=['readers(author(id,name))'])
+        assert output['readers']['items'][1] == {
+            'author': {'id': 2, 'meta': {'href': '/models/2'}}}
+        assert sorted(output['included']['Person']) == ['1', '2']
+
+    def test_thread_executor(self):
+        posts = [Post(i, self.authors[i % 3]) for i in range(1, 11)]
+        with futures.ThreadPoolExecutor(2) as executor:
+            self.serializer.executor = executor
+            self.serializer.parallel_threshold = 2
+            self.serializer.parallel_chunk_size = 2
+            output = self.serializer(posts, expand=['author(id,name,email)'])
+        assert len(output['included']['Person']) == 3
+
+    def test_reset_between_calls(self):
+        post = Post(1, self.authors[0])
+        self.serializer(post, expand=['author(id,name,email)'])
+        items = list(self.serializer.iter_serialize(
+            [post], expand=['author(id,name,email)']))
+        assert items[0]['author']['name'] == 'PERSON 1'
+        self.serializer.normalized = False
+        assert 'included' not in self.serializer(post, expand=['author(id,name,email)'])
+
+    def test_interleaved_async_calls(self):
+        async def posts(authors):
+            for i, author in enumerate(authors):
+                yield Post(i, author)
+
+        async def serialize():
+            return await asyncio.gather(*[
+                self.serializer.aserialize(
+                    posts(authors), expand=['author(id,name,email)'],
+                    chunk_size=1)
+                for authors in (self.authors[:2], self.authors[2:])])
+        first, second = asyncio.run(serialize())
+        assert sorted(first['included']['Person']) == ['1', '2']
+        assert sorted(second['included']['Person']) == ['3']
+
+    def test_merge(self):
+        objects = included.Included()
+        assert objects.add('plan', 1)
+        assert not objects.add('plan', 1)
+        fragment = {'id': 1, 'name': 'a'}
+        objects.set('Person', 1, fragment)
+        objects.set('Person', 1, {'id': 1, 'email': 'b'})
+        assert objects.objects == {
+            'Person': {'1': {'id': 1, 'name': 'a', 'email': 'b'}}}
+        assert fragment == {'id': 1, 'name': 'a'}
+        assert len(objects) == 1
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import logging
+from watson.http import messages
+from tests.watson.serialize import support
+from watson.serialize import caches, encoders, instrumentation, plans, serializers
+
+
+class TestStats(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+        self.serializer = serializers.Instance(self.router)
+        self.serializer.plan_cache = plans.Cache()
+        self.serializer.stats = instrumentation.Stats()
+
+    def test_disabled_by_default(self):
+        assert serializers.Instance(self.router).stats is None
+
+    def test_records_collection(self):
+        objs = [
+            support.generate_model(
+                id=i, name='test', enum_value=support.ModelEnum.test)
+            for i in range(1, 6)]
+        output = self.serializer(objs)
+        stats = self.serializer.stats
+        assert len(output['items']) == 5
+        assert stats.calls == 1
+        assert stats.objects == 5
+        assert stats.depth == 0
+        assert stats.misses['plans'] == 1
+        assert set(stats.timings) == {
+            'serialize', 'plan', 'fields', 'href', 'collection_meta'}
+        assert list(stats.strategies) == ['Model.enum_value']
+        self.serializer(objs)
+        assert stats.calls == 2
+        assert stats.hits['plans'] == 1
+
+    def test_records_nesting(self):
+        output = self.serializer(
+            support.generate_nested_model(), expand=['instance(id,value)'])
+        stats = self.serializer.stats
+        assert output['instance']['value'] == 'SubModel'
+        # model, instance, instances[0] and instances[0].instance
+        assert stats.objects == 4
+        assert stats.depth == 2
+        assert 'nested' in stats.timings
+
+    def test_output_unchanged(self):
+        model = support.generate_nested_model()
+        expected = serializers.Instance(self.router)(model)
+        self.serializer.compiled = True
+        assert self.serializer(model) == expected
+
+    def test_fragments(self):
+        fragments = caches.Fragments()
+        self.serializer.fragment_cache = fragments
+        model = support.generate_model(id=1, name='test')
+        self.serializer(model)
+        self.serializer(model)
+        stats = self.serializer.stats
+        assert stats.misses['fragments'] == 1
+        assert stats.hits['fragments'] == 1
+
+    def test_writer(self):
+        objs = [support.generate_model(id=i) for i in range(1, 4)]
+        encoders.JSONWriter().encode(self.serializer, objs)
+        assert self.serializer.stats.objects == 3
+
+    def test_timed_strategy_equality(self):
+        strategy = support.Model.Meta.strategies['enum_value']
+        timed = instrumentation.Timed(strategy, 'enum_value', {})
+        assert timed == strategy
+        assert strategy == timed
+        assert hash(timed) == hash(strategy)
+
+    def test_server_timing(self):
+        stats = instrumentation.Stats()
+        stats.add('serialize', 0.0015)
+        stats.add('plan', 0.0001)
+        assert stats.server_timing() == 'plan;dur=0.100, serialize;dur=1.500'
+
+
+class TestReporters(object):
+
+    def setup(self):
+        self.stats = instrumentation.Stats()
+        self.stats.objects = 3
+        self.stats.add('serialize', 0.002)
+
+    def test_header(self):
+        controller = support.Controller()
+        controller.response = messages.Response()
+        instrumentation.Header()(controller, self.stats)
+        assert controller.response.headers['Server-Timing'] == 'serialize;dur=2.000'
+
+    def test_log(self):
+        records = []
+
+        class Handler(logging.Handler):
+            def emit(self, record):
+                records.append(record)
+        logger = logging.getLogger('tests.serialize')
+        logger.addHandler(Handler())
+        logger.setLevel(logging.DEBUG)
+        instrumentation.Log(logger)(support.Controller(), self.stats)
+        assert records[0].serialize_stats['objects'] == 3
+        assert 'serialized 3 objects' in records[0].getMessage()
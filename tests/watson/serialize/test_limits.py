@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+from concurrent import futures
+import pytest
+from tests.watson.serialize import support
+from watson.serialize import caches, encoders, errors, limits, serializers
+
+
+class Node(object):
+
+    class Meta(object):
+        attributes = ('id', 'name', 'children', 'parent')
+        route = 'models'
+
+    def __init__(self, id, name=None, children=None, parent=None):
+        self.id = id
+        self.name = name
+        self.children = children
+        self.parent = parent
+
+
+class Leaf(object):
+
+    class Meta(object):
+        attributes = ('id', 'name', 'children')
+        limits = limits.Limits(depth=1, fanout=2)
+
+    def __init__(self, id, children=None):
+        self.id = id
+        self.name = 'Leaf {}'.format(id)
+        self.children = children
+
+
+def chain(depth):
+    root = node = Node(1, 'Node 1')
+    for i in range(2, depth + 1):
+        node.children = [Node(i, 'Node {}'.format(i))]
+        node = node.children[0]
+    return root
+
+
+class TestLimits(object):
+
+    def setup(self):
+        self.serializer = serializers.Instance(support.sample_router())
+        self.serializer.limits = limits.Limits()
+
+    def test_cycle_references(self):
+        node = Node(1, 'Node 1')
+        node.children = [node]
+        output = self.serializer(node)
+        assert output['children']['items'] == [
+            {'id': 1, 'meta': {'href': '/models/1'}}]
+
+    def test_indirect_cycle(self):
+        first, second = Node(1, 'Node 1'), Node(2, 'Node 2')
+        first.children = [second]
+        second.children = [first]
+        output = self.serializer([first, second])
+        nested = output['items'][0]['children']['items'][0]
+        assert nested['name'] == 'Node 2'
+        assert nested['children']['items'] == [
+            {'id': 1, 'meta': {'href': '/models/1'}}]
+
+    def test_shared_objects_are_not_cycles(self):
+        shared = Node(3, 'Shared')
+        nodes = [Node(1, children=[shared]), Node(2, children=[shared])]
+        output = self.serializer(nodes)
+        for item in output['items']:
+            assert item['children']['items'][0]['name'] == 'Shared'
+
+    def test_depth(self):
+        self.serializer.limits = limits.Limits(depth=2)
+        output = self.serializer(chain(4))
+        second = output['children']['items'][0]
+        third = second['children']['items'][0]
+        assert third['name'] == 'Node 3'
+        assert third['children']['items'] == [
+            {'id': 4, 'meta': {'href': '/models/4'}}]
+
+    def test_depth_with_expand(self):
+        self.serializer.limits = limits.Limits(depth=1)
+        expand = ['children(children(children(children(name))))']
+        output = self.serializer(chain(5), expand=expand)
+        second = output['children']['items'][0]
+        assert second['children']['items'] == [
+            {'id': 3, 'meta': {'href': '/models/3'}}]
+        output = encoders.JSONWriter('json').encode(
+            self.serializer, chain(5), expand=expand)
+        assert b'"children":{"items":[{"id":3,"meta":{"href":"/models/3"}}]' in output
+
+    def test_items(self):
+        self.serializer.limits = limits.Limits(items=3)
+        self.serializer(chain(3))
+        with pytest.raises(errors.LimitExceeded) as exc:
+            self.serializer(chain(4))
+        assert exc.value.status_code == 413
+        assert exc.value.limit == 'items'
+
+    def test_fanout(self):
+        self.serializer.limits = limits.Limits(fanout=2)
+        node = Node(1, children=[Node(i) for i in range(2, 5)])
+        with pytest.raises(errors.LimitExceeded):
+            self.serializer(node)
+        # the top level collection is not a nested list
+        self.serializer(node.children)
+
+    def test_size(self):
+        self.serializer.limits = limits.Limits(size=200)
+        self.serializer([Node(i, 'Node') for i in range(1, 3)])
+        with pytest.raises(errors.LimitExceeded) as exc:
+            self.serializer([Node(i, 'Node') for i in range(1, 10)])
+        assert exc.value.limit == 'size'
+
+    def test_size_of_each_object(self):
+        self.serializer.limits = limits.Limits(size=500)
+        nodes = [Node(1, 'Node')] + [Node(i, 'Node' * 50) for i in range(2, 5)]
+        with pytest.raises(errors.LimitExceeded) as exc:
+            self.serializer(nodes)
+        assert exc.value.limit == 'size'
+
+    def test_fragments_ignore_limits(self):
+        self.serializer.fragment_cache = caches.Fragments()
+        self.serializer.limits = None
+        self.serializer(chain(4))
+        self.serializer.limits = limits.Limits(depth=1)
+        output = self.serializer(chain(4))
+        assert output['children']['items'][0]['children']['items'] == [
+            {'id': 3, 'meta': {'href': '/models/3'}}]
+        self.serializer.limits = limits.Limits(items=3)
+        with pytest.raises(errors.LimitExceeded):
+            self.serializer(chain(4))
+
+    def test_limited_output_is_not_stored_as_fragments(self):
+        self.serializer.fragment_cache = caches.Fragments()
+        self.serializer.limits = limits.Limits(depth=1)
+        self.serializer(chain(4))
+        self.serializer.limits = None
+        output = self.serializer(chain(4))
+        third = output['children']['items'][0]['children']['items'][0]
+        assert third['name'] == 'Node 3'
+        assert len(self.serializer.fragment_cache) == 4
+
+    def test_meta_limits(self):
+        leaf = Leaf(2, children=[Leaf(3, children=[Leaf(4)])])
+        output = self.serializer(Node(1, children=[leaf]))
+        nested = output['children']['items'][0]
+        assert nested['name'] == 'Leaf 2'
+        assert nested['children']['items'] == [{'id': 3}]
+        with pytest.raises(errors.LimitExceeded):
+            self.serializer(Node(1, children=[Leaf(i) for i in range(3)]))
+
+    def test_disabled(self):
+        self.serializer.limits = None
+        output = self.serializer(chain(3))
+        assert output['children']['items'][0]['name'] == 'Node 2'
+
+    def test_guard_reset_per_call(self):
+        self.serializer.limits = limits.Limits(items=2)
+        for _ in range(3):
+            self.serializer(chain(2))
+
+    def test_interleaved_calls(self):
+        self.serializer.limits = limits.Limits(items=3)
+        first = self.serializer.iter_serialize([Node(i) for i in range(3)])
+        second = self.serializer.iter_serialize([Node(i) for i in range(3)])
+        for _ in range(3):
+            next(first)
+            next(second)
+
+    def test_json_writer(self):
+        node = Node(1, 'Node 1')
+        node.children = [node]
+        output = encoders.JSONWriter().encode(self.serializer, node)
+        assert b'"children":{"items":[{"id":1,"meta":{"href":"/models/1"}}]' in output
+        self.serializer.limits = limits.Limits(size=50)
+        with pytest.raises(errors.LimitExceeded):
+            encoders.JSONWriter().encode(
+                self.serializer, [Node(i, 'Node') for i in range(1, 10)])
+
+    def test_thread_executor(self):
+        shared = Node(100, 'Shared')
+        nodes = [Node(i, children=[shared]) for i in range(1, 9)]
+        with futures.ThreadPoolExecutor(2) as executor:
+            self.serializer.executor = executor
+            self.serializer.parallel_threshold = 2
+            self.serializer.parallel_chunk_size = 2
+            output = self.serializer(nodes)
+        assert all(
+            item['children']['items'][0]['name'] == 'Shared'
+            for item in output['items'])
+
+    def test_estimate(self):
+        assert limits._estimate({'id': 1, 'meta': {'href': '/a'}}) == len(
+            '{"id":1,"meta":{"href":"/a"}}')
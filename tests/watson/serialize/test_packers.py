@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import pytest
+from watson.serialize import packers
+
+
+class TestMessagePack(object):
+
+    @pytest.mark.parametrize('value, expected', [
+        (None, 'c0'),
+        (False, 'c2'),
+        (True, 'c3'),
+        (1, '01'),
+        (127, '7f'),
+        (128, 'cc80'),
+        (256, 'cd0100'),
+        (2 ** 16, 'ce00010000'),
+        (2 ** 32, 'cf0000000100000000'),
+        (-1, 'ff'),
+        (-32, 'e0'),
+        (-33, 'd0df'),
+        (-129, 'd1ff7f'),
+        (-2 ** 31, 'd280000000'),
+        (-2 ** 63, 'd38000000000000000'),
+        (1.5, 'cb3ff8000000000000'),
+        ('', 'a0'),
+        ('a', 'a161'),
+        ('a' * 32, 'd920' + '61' * 32),
+        (b'\x00', 'c40100'),
+        ([1, 2], '920102'),
+        ((1, 2), '920102'),
+        ({'a': 1}, '81a16101'),
+    ])
+    def test_encode(self, value, expected):
+        assert packers.msgpack(value).hex() == expected
+
+    def test_headers(self):
+        assert packers.msgpack_array(15).hex() == '9f'
+        assert packers.msgpack_array(16).hex() == 'dc0010'
+        assert packers.msgpack_array(2 ** 16).hex() == 'dd00010000'
+        assert packers.msgpack_map(16).hex() == 'de0010'
+
+    def test_unsupported(self):
+        with pytest.raises(OverflowError):
+            packers.msgpack(2 ** 64)
+        with pytest.raises(TypeError):
+            packers.msgpack(object())
+
+
+class TestCBOR(object):
+
+    # examples from appendix A of RFC 8949
+    @pytest.mark.parametrize('value, expected', [
+        (0, '00'),
+        (23, '17'),
+        (24, '1818'),
+        (100, '1864'),
+        (1000, '1903e8'),
+        (1000000, '1a000f4240'),
+        (1000000000000, '1b000000e8d4a51000'),
+        (-1, '20'),
+        (-100, '3863'),
+        (-1000, '3903e7'),
+        (1.1, 'fb3ff199999999999a'),
+        (False, 'f4'),
+        (True, 'f5'),
+        (None, 'f6'),
+        ('', '60'),
+        ('IETF', '6449455446'),
+        ('ü', '62c3bc'),
+        (b'\x01\x02\x03\x04', '4401020304'),
+        ([], '80'),
+        ([1, 2, 3], '83010203'),
+        ({}, 'a0'),
+        ({'a': 1, 'b': [2, 3]}, 'a26161016162820203'),
+    ])
+    def test_encode(self, value, expected):
+        assert packers.cbor(value).hex() == expected
+
+    def test_headers(self):
+        assert packers.cbor_array(25).hex() == '9819'
+        assert packers.cbor_map(2).hex() == 'a2'
+
+    def test_unsupported(self):
+        with pytest.raises(OverflowError):
+            packers.cbor(2 ** 64)
+        with pytest.raises(TypeError):
+            packers.cbor(object())
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import pytest
+from tests.watson.serialize import support
+from watson.serialize import encoders, errors, pagination, serializers
+
+
+class TestCursor(object):
+
+    def setup(self):
+        self.session = support.sample_wide_session(7)
+        self.query = self.session.query(support.WideModel)
+
+    def test_first_page(self):
+        cursor = pagination.Cursor(self.query, limit=3)
+        assert [item.id for item in cursor] == [1, 2, 3]
+        assert cursor.has_next
+        assert not cursor.has_previous
+        assert cursor.next == 3
+        assert cursor.previous is None
+
+    def test_after(self):
+        cursor = pagination.Cursor(self.query, after='3', limit=3)
+        assert [item.id for item in cursor] == [4, 5, 6]
+        assert cursor.next == 6
+        assert cursor.previous == 4
+
+    def test_invalid_key(self):
+        with pytest.raises(errors.InvalidCursor) as exc:
+            pagination.Cursor(self.query, after='abc')
+        assert exc.value.status_code == 400
+        with pytest.raises(errors.InvalidCursor):
+            pagination.Cursor(self.query, before='1.5')
+
+    def test_last_page(self):
+        cursor = pagination.Cursor(self.query, after=6, limit=3)
+        assert [item.id for item in cursor] == [7]
+        assert not cursor.has_next
+        assert cursor.next is None
+
+    def test_before(self):
+        cursor = pagination.Cursor(self.query, before=4, limit=2)
+        assert [item.id for item in cursor] == [2, 3]
+        assert cursor.previous == 2
+        assert cursor.next == 3
+        cursor = pagination.Cursor(self.query, before=3, limit=2)
+        assert [item.id for item in cursor] == [1, 2]
+        assert cursor.previous is None
+
+    def test_totals_skipped_by_default(self):
+        with support.record_queries(self.session) as statements:
+            cursor = pagination.Cursor(self.query, limit=3)
+            assert cursor.total is None
+        assert len(statements) == 1
+        assert 'count' not in statements[0].lower()
+
+    def test_totals(self):
+        assert pagination.Cursor(self.query, totals='count').total == 7
+        assert pagination.Cursor(
+            self.query, totals=lambda query: 100).total == 100
+        # sqlite keeps no statistics to estimate with
+        assert pagination.Cursor(self.query, totals='estimate').total is None
+
+    def test_key(self):
+        cursor = pagination.Cursor(
+            self.query, key=support.WideModel.name, after='Wide 5', limit=5)
+        assert [item.id for item in cursor] == [6, 7]
+
+
+class TestSerializeCursor(object):
+
+    def setup(self):
+        self.session = support.sample_wide_session(7)
+        self.query = self.session.query(support.WideModel)
+        self.serializer = serializers.Instance(support.sample_router())
+
+    def test_meta(self):
+        cursor = pagination.Cursor(self.query, after=3, limit=2)
+        output = self.serializer(cursor, include=['name'])
+        assert [item['id'] for item in output['items']] == [4, 5]
+        assert output['meta'] == {
+            'limit': 2,
+            'total': None,
+            'href': '/models?after=3',
+            'next': '/models?after=5',
+            'prev': '/models?before=4'}
+
+    def test_first_page_meta(self):
+        cursor = pagination.Cursor(self.query, limit=5, totals='count')
+        output = self.serializer(cursor)
+        assert output['meta'] == {
+            'limit': 5,
+            'total': 7,
+            'href': '/models',
+            'next': '/models?after=5'}
+
+    def test_eager_load(self):
+        self.serializer.eager_load = True
+        cursor = pagination.Cursor(self.query, limit=2)
+        output = self.serializer(cursor)
+        assert [item['id'] for item in output['items']] == [1, 2]
+
+    def test_json_writer(self):
+        cursor = pagination.Cursor(self.query, after=5, limit=5)
+        output = encoders.JSONWriter().encode(self.serializer, cursor)
+        assert b'"prev":"/models?before=6"' in output
+        assert b'"next"' not in output
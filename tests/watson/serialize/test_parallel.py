@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from concurrent import futures
+from tests.watson.serialize import support
+from watson.serialize import parallel, serializers
+
+
+def generate_models(count):
+    return [
+        support.generate_model(
+            id=i, name='Model {}'.format(i), enum_value=support.ModelEnum.test)
+        for i in range(1, count + 1)]
+
+
+class TestParallel(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+        self.objs = generate_models(50)
+        self.expected = serializers.Instance(self.router)(self.objs)
+
+    def serializer(self, executor):
+        serializer = serializers.Instance(self.router)
+        serializer.executor = executor
+        serializer.parallel_threshold = 10
+        serializer.parallel_chunk_size = 7
+        return serializer
+
+    def test_threads_preserve_order(self):
+        with futures.ThreadPoolExecutor(4) as executor:
+            output = self.serializer(executor)(self.objs)
+        assert output == self.expected
+
+    def test_processes_preserve_order(self):
+        with futures.ProcessPoolExecutor(2) as executor:
+            output = self.serializer(executor)(self.objs)
+        assert output == self.expected
+        assert output['items'][0]['enum_value'] == 'test'
+
+    def test_processes_without_strategies(self):
+        with futures.ProcessPoolExecutor(2) as executor:
+            output = self.serializer(executor)(self.objs, include=['id', 'name'])
+        assert output == serializers.Instance(self.router)(
+            self.objs, include=['id', 'name'])
+
+    def test_below_threshold_is_serial(self):
+        class Executor(futures.ThreadPoolExecutor):
+            def map(self, *args, **kwargs):
+                raise AssertionError('executor should not be used')
+        with Executor(1) as executor:
+            serializer = self.serializer(executor)
+            serializer.parallel_threshold = 100
+            assert serializer(self.objs) == self.expected
+
+    def test_compiled(self):
+        with futures.ThreadPoolExecutor(2) as executor:
+            serializer = self.serializer(executor)
+            serializer.compiled = True
+            assert serializer(self.objs) == self.expected
+
+    def test_detached(self):
+        obj = support.generate_model(id=1, name='test')
+        detached = parallel.Detached(obj, {'enum_value': 'test', 'name': parallel.Missing})
+        assert detached.enum_value == 'test'
+        assert detached.id == 1
+        assert getattr(detached, 'name', None) is None
+
+    def test_apply_strategies(self):
+        rows = [(support.ModelEnum.test,), (None,), (parallel.Missing,)]
+        assert parallel.apply_strategies(
+            support.Model.Meta, ('enum_value',), False, rows) == [
+                ('test',), (None,), (parallel.Missing,)]
+        assert parallel.apply_strategies(
+            support.Model.Meta, ('enum_value',), True, rows[1:2]) == [('',)]
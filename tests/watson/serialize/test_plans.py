@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+from tests.watson.serialize import support
+from watson.routing import routers
+from watson.serialize import plans, serializers
+
+
+class TestCache(object):
+
+    def test_get_set(self):
+        cache = plans.Cache(maxsize=2)
+        assert cache.get('a') is None
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        assert cache.info() == plans.CacheInfo(1, 1, 2, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = plans.Cache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert len(cache) == 2
+
+    def test_clear(self):
+        cache = plans.Cache()
+        cache.set('a', 1)
+        cache.get('a')
+        cache.clear()
+        assert cache.info() == plans.CacheInfo(0, 0, 512, 0)
+
+
+class TestPlan(object):
+
+    def setup(self):
+        self.cache = plans.Cache()
+        self.serializer = serializers.Instance(support.sample_router())
+        self.serializer.plan_cache = self.cache
+
+    def test_compiled_once_per_collection(self):
+        objs = [support.generate_model(id=i, name='test') for i in range(10)]
+        self.serializer(objs, expand=['instances(id)'])
+        info = self.cache.info()
+        assert info.misses == 1
+        assert info.currsize == 1
+
+    def test_reused_across_calls(self):
+        model = support.generate_model(id=1, name='test')
+        self.serializer(model, include=['name'])
+        self.serializer(model, include=['name'])
+        info = self.cache.info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_plan_contents(self):
+        model = support.generate_model(id=1, name='test')
+        self.serializer(model)
+        plan = self.serializer._plan(
+            include=['*'], expand=['instance(id,value)'], exclude=['name'])
+        assert plan.meta is support.Model.Meta
+        assert plan.identifier == 'id'
+        assert plan.include_null
+        assert plan.route == 'models'
+        assert plan.attributes == ('id', 'instances', 'instance', 'enum_value')
+        instance = plan.fields[2]
+        assert instance.include == ('id', 'value')
+        assert plan.fields[3].strategy
+
+    def test_arguments_not_mutated(self):
+        model = support.generate_model(id=1, name='test')
+        include, exclude = ['*'], ['id', 'name']
+        output = self.serializer(model, include=include, exclude=exclude)
+        assert include == ['*']
+        assert exclude == ['id', 'name']
+        assert output['id'] == 1
+        assert 'name' not in output
+
+
+class TestHref(object):
+
+    def setup(self):
+        self.router = support.sample_router()
+
+    def test_templated(self):
+        href = plans.Href(self.router, 'models', 'id')
+        assert href.templated
+        assert href(5) == '/models/5'
+        assert href(5) == self.router.assemble('models', id=5)
+
+    def test_empty_value_falls_back(self):
+        href = plans.Href(self.router, 'models', 'id')
+        assert href(0) == self.router.assemble('models', id=0)
+        assert href(None) == '/models'
+
+    def test_untemplated_route_falls_back(self):
+        router = routers.Dict({'literal': {'path': '/literal'}})
+        href = plans.Href(router, 'literal', 'id')
+        assert not href.templated
+        assert href(1) == '/literal'
+
+    def test_cached_per_router(self):
+        serializer = serializers.Instance(self.router)
+        serializer(support.generate_model(id=1))
+        plan = serializer._plan()
+        assert plan.href(self.router) is plan.href(self.router)
+        assert plan.href(support.sample_router()) is not plan.href(self.router)
+
+    def test_collection_hrefs(self):
+        serializer = serializers.Instance(self.router)
+        objs = [support.generate_model(id=i) for i in range(1, 4)]
+        output = serializer(objs)
+        assert [item['meta']['href'] for item in output['items']] == [
+            '/models/1', '/models/2', '/models/3']
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import json
+from tests.watson.serialize import support
+from watson.db import utils
+from watson.serialize import encoders, queries, serializers
+
+
+class TestQueries(object):
+
+    def setup(self):
+        self.session = support.sample_wide_session()
+        self.serializer = serializers.Instance(support.sample_router())
+        self.serializer(support.WideModel(id=1))
+        self.plan = self.serializer._plan()
+
+    def test_entity(self):
+        query = self.session.query(support.WideModel)
+        assert queries.entity(query) is support.WideModel
+        assert not queries.entity(self.session.query(support.WideModel.id))
+        assert not queries.entity([])
+
+    def test_columns(self):
+        assert queries.columns(support.WideModel, self.plan) == [
+            'id', 'name', 'email']
+
+    def test_rows(self):
+        query = self.session.query(support.WideModel)
+        rows = queries.rows(query, support.WideModel, self.plan)
+        assert rows.first() == (1, 'Wide 1', 'WIDE1@EXAMPLE.COM')
+
+    def test_rows_requires_columns(self):
+        self.serializer = serializers.Instance(support.sample_router())
+        self.serializer(support.generate_model(id=1))
+        plan = self.serializer._plan()
+        query = self.session.query(support.Model)
+        assert queries.rows(query, support.Model, plan) is None
+        assert queries.project(query, support.Model, plan) is not query
+
+
+class TestProjectedSerializer(object):
+
+    def setup(self):
+        self.session = support.sample_wide_session()
+        self.router = support.sample_router()
+
+    def _serializer(self, project):
+        serializer = serializers.Instance(self.router)
+        serializer.project = project
+        return serializer
+
+    def test_only_selects_required_columns(self):
+        query = self.session.query(support.WideModel)
+        with support.record_queries(self.session) as statements:
+            output = self._serializer(True)(query, include=['name'])
+        assert len(statements) == 1
+        assert 'description' not in statements[0]
+        assert 'email' not in statements[0]
+        assert output['items'][0] == {
+            'id': 1, 'name': 'Wide 1', 'meta': {'href': '/models/1'}}
+
+    def test_matches_unprojected(self):
+        for kwargs in ({}, {'include': ['email']}, {'exclude': ['name']}):
+            projected = self._serializer(True)(
+                self.session.query(support.WideModel), **kwargs)
+            expected = self._serializer(False)(
+                self.session.query(support.WideModel), **kwargs)
+            assert projected == expected
+            assert projected['items'][0]['email'] == 'wide1@example.com'
+
+    def test_load_only_for_non_column_attributes(self):
+        self.session.add(support.generate_model(id=1))
+        self.session.commit()
+        query = self.session.query(support.Model)
+        output = self._serializer(True)(query)
+        assert output['items'][0]['id'] == 1
+
+    def test_iter_serialize(self):
+        query = self.session.query(support.WideModel)
+        output = list(self._serializer(True).iter_serialize(
+            query, chunk_size=2))
+        assert len(output) == 5
+
+    def test_writer(self):
+        writer = encoders.JSONWriter()
+        query = self.session.query(support.WideModel)
+        with support.record_queries(self.session) as statements:
+            output = writer.encode(self._serializer(True), query, include=['name'])
+        assert 'email' not in statements[0]
+        output = json.loads(output.decode('utf-8'))
+        assert output == self._serializer(False)(query, include=['name'])
+
+
+class TestEagerLoading(object):
+
+    def setup(self):
+        self.session = support.sample_article_session(count=100)
+        self.router = support.sample_router()
+
+    def _serialize(self, instance, eager_load, **kwargs):
+        serializer = serializers.Instance(self.router)
+        serializer.eager_load = eager_load
+        with support.record_queries(self.session) as statements:
+            output = serializer(instance, **kwargs)
+        return output, statements
+
+    def test_query(self):
+        query = self.session.query(support.Article)
+        expand = ['author(*)', 'comments(id,author(name))']
+        expected, lazy = self._serialize(query, False, expand=expand)
+        self.session.expunge_all()
+        output, eager = self._serialize(query, True, expand=expand)
+        assert output == expected
+        assert len(lazy) > 100
+        assert len(eager) == 2
+        comment = output['items'][0]['comments']['items'][0]
+        assert comment['author']['name'] == 'Author 1'
+
+    def test_pagination(self):
+        expand = ['comments(author(name))']
+        counts = []
+        for eager_load in (False, True):
+            self.session.expunge_all()
+            serializer = serializers.Instance(self.router)
+            serializer.eager_load = eager_load
+            with support.record_queries(self.session) as statements:
+                paginator = utils.Pagination(
+                    self.session.query(support.Article), limit=50)
+                output = serializer(paginator, expand=expand)
+            assert len(output['items']) == 50
+            counts.append(len(statements))
+        assert counts[0] > 50
+        # page, count, the page again with its relationships, and comments
+        assert counts[1] == 4
+
+    def test_eager_options(self):
+        serializer = serializers.Instance(self.router)
+        serializer(support.Article(id=1), include=['title'])
+        plan = serializer._plan(include=['title'])
+        assert not queries.eager_options(
+            support.Article, plan, serializer._nested_plan)
+        plan = serializer._plan(expand=['comments(author)'])
+        options = queries.eager_options(
+            support.Article, plan, serializer._nested_plan)
+        assert len(options) == 2
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from tests.watson.serialize import support
+from watson.serialize import selections, serializers
+from watson.serialize.selections import Attribute, Selection
+
+
+class TestParse(object):
+
+    def test_flat(self):
+        assert selections.parse('id, name') == (
+            Attribute('id', None), Attribute('name', None))
+
+    def test_nested(self):
+        attributes = selections.parse(
+            'instance(id, value),instances(id,instance(*))')
+        assert attributes[0] == Attribute(
+            'instance', Selection(include=('id', 'value')))
+        assert attributes[1] == Attribute('instances', Selection(
+            include=('id',),
+            expand=(Attribute('instance', Selection(include=('*',))),)))
+
+    def test_empty_parentheses(self):
+        assert selections.parse('instance()') == (
+            Attribute('instance', Selection()),)
+
+    def test_ignores_empty_and_unbalanced(self):
+        assert selections.parse('') == ()
+        assert selections.parse('id,,name)') == (
+            Attribute('id', None), Attribute('name', None))
+
+    def test_unclosed(self):
+        assert selections.parse('instance(id,instance(value') == (
+            Attribute('instance', Selection(
+                include=('id',),
+                expand=(Attribute('instance', Selection(include=('value',))),))),)
+
+    def test_deeply_nested(self):
+        attributes = selections.parse('instance' + '(' * 5000)
+        assert attributes[0].name == 'instance'
+
+    def test_cached(self):
+        assert selections.parse('id,name') is selections.parse('id,name')
+
+
+class TestSelection(object):
+
+    def test_from_query_string(self):
+        selection = selections.selection(
+            include='name,id', expand='instance(id),someThing(id)', exclude='name')
+        assert selection.include == ('name', 'id')
+        assert [a.name for a in selection.expand] == ['instance', 'some_thing']
+        assert selection.exclude == ('name',)
+        assert selection is selections.selection(
+            include='name,id', expand='instance(id),someThing(id)', exclude='name')
+
+    def test_kwargs(self):
+        assert selections.selection().kwargs() == {
+            'expand': None, 'include': None, 'exclude': None}
+
+    def test_expands_accepts_parsed_attributes(self):
+        expand = selections.expands(['instance(id)'])
+        assert selections.expands(expand) == expand
+
+    def test_serializer_output_matches_strings(self):
+        serializer = serializers.Instance(support.sample_router())
+        model = support.generate_nested_model()
+        kwargs = {
+            'include': ['name', 'id'],
+            'expand': ['instance(id, value)', 'instances(id,instance(*))']
+        }
+        selection = selections.selection(
+            include='name,id',
+            expand='instance(id, value),instances(id,instance(*))')
+        output = serializer(model, **selection.kwargs())
+        assert output == serializers.Instance(support.sample_router())(model, **kwargs)
+        assert output['instances']['items'][0]['instance']['name'] == 'Model1'
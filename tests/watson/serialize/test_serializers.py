@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
+import json
 from tests.watson.serialize import support
 from watson.db import utils
-from watson.serialize import serializers
+from watson.serialize import encoders, plans, serializers
 
 
 class TestInstance(object):
@@ -136,6 +137,74 @@ class TestInstance(object):
         output = self.serializer(paginator)
         assert output['meta']['href'] == '/models?page=1'
 
+    def test_iter_serialize(self):
+        objs = (support.generate_model(id=i, name='test') for i in range(3))
+        output = self.serializer.iter_serialize(objs, include=['name'])
+        assert not isinstance(output, list)
+        assert [item['id'] for item in output] == [0, 1, 2]
+
+    def test_iter_serialize_query(self):
+        repository = support.sample_repository()
+        output = list(self.serializer.iter_serialize(
+            repository.query, chunk_size=1))
+        assert output[0]['meta']['href'] == '/models/1'
+
+    def test_mixed_collection(self):
+        objs = [
+            support.WideModel(id=1, name='test', email='A@B.COM'),
+            support.SubModel(id=2, value='sub'),
+            support.WideModel(id=3, name='test'),
+            'not a model',
+        ]
+        output = self.serializer(objs)['items']
+        assert output[0] == {
+            'id': 1, 'name': 'test', 'email': 'a@b.com',
+            'meta': {'href': '/models/1'}}
+        assert output[1] == {
+            'id': 2, 'value': 'sub', 'meta': {'href': '/submodels/2'}}
+        assert output[2]['name'] == 'test'
+        assert output[3] == 'not a model'
+
+    def test_mixed_collection_planned_once_per_class(self):
+        cache = plans.Cache()
+        self.serializer.plan_cache = cache
+        objs = [
+            support.SubModel(id=i) if i % 2 else support.WideModel(id=i)
+            for i in range(1, 11)]
+        output = self.serializer(objs, include=['value'])['items']
+        assert output[0] == {'id': 1, 'meta': {'href': '/submodels/1'}}
+        assert output[1] == {'id': 2, 'meta': {'href': '/models/2'}}
+        assert cache.info().misses == 2
+        assert len(cache) == 2
+
+    def test_mixed_collection_encoded(self):
+        objs = [
+            support.WideModel(id=1, name='test'),
+            support.SubModel(id=2, value='sub')]
+        output = json.loads(encoders.JSONWriter().encode(self.serializer, objs))
+        assert output['items'] == self.serializer(objs)['items']
+
+    def test_nested_serializers_reused(self):
+        objs = [support.generate_nested_model() for _ in range(5)]
+        expected = [serializers.Instance(self.router)(obj) for obj in objs]
+        assert [self.serializer(obj) for obj in objs] == expected
+        children = self.serializer._children
+        assert set(children) == {
+            ('object', support.SubModel.Meta), ('list', support.Model.Meta)}
+        nested = children[('object', support.SubModel.Meta)]
+        assert nested.depth == 1
+        assert nested.meta is support.SubModel.Meta
+
+    def test_nested_list_serializers_keyed_by_meta(self):
+        model = support.generate_model(id=1)
+        model.instances = [support.SubModel(id=2, value='sub')]
+        other = support.generate_model(id=3)
+        other.instances = [support.WideModel(id=4, name='wide')]
+        assert self.serializer(model)['instances']['meta']['href'] == '/submodels'
+        output = self.serializer(other)['instances']
+        assert output['meta']['href'] == '/models'
+        assert output['items'][0]['name'] == 'wide'
+
     def test_camelcased_names(self):
         model = support.generate_model(id=1)
         output = self.serializer(model, include=['enumValue'])
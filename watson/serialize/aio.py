@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+import time
+from collections import abc as collections
+
+__all__ = ['serialize', 'iter_serialize', 'collect', 'offload', 'scalars']
+
+
+def scalars(values):
+    """Unwrap the entities from a single column SQLAlchemy result.
+
+    Results returned by `AsyncSession.execute` and `AsyncSession.stream` (and
+    their synchronous equivalents) yield rows rather than the entities
+    themselves, so they are converted into their scalars when selecting a
+    single entity or column.
+
+    Args:
+        values (mixed): The value to unwrap
+
+    Returns:
+        The scalars of the result, or the value if it is not a result
+    """
+    if hasattr(values, 'Meta') or not hasattr(values, 'scalars'):
+        return values
+    keys = getattr(values, 'keys', None)
+    if keys is None or len(keys()) != 1:
+        return values
+    return values.scalars()
+
+
+def is_iterable(values):
+    return isinstance(values, (collections.AsyncIterable, collections.Iterable))
+
+
+async def iter_serialize(
+        serializer, values, expand=None, include=None, exclude=None,
+        chunk_size=100, context=None):
+    """Serialize the items of a sync or async iterable as they arrive.
+
+    Control is yielded to the event loop after every `chunk_size` items so
+    that serializing a large collection does not block other tasks. Items of
+    an async iterable are serialized in pages of `chunk_size`, which is also
+    the page that batch strategies are applied to.
+
+    Args:
+        serializer (watson.serialize.serializers.Instance): The serializer
+        values (mixed): An iterable, async iterable or SQLAlchemy result
+        expand (list): Attributes to be expanded on the object
+        include (list): Attributes to be included in the output
+        exclude (list): Attributes to be excluded from the list
+        chunk_size (int): The number of items to serialize between yields
+        context (watson.serialize.serializers.Context): The state of the call,
+            created if not specified
+
+    Yields:
+        The serialized representation of each item
+    """
+    if context is None:
+        context = serializer._context()
+    values = scalars(values)
+    count = 0
+    if not isinstance(values, collections.AsyncIterable):
+        for value in serializer._iter_serialize(
+                values, context, expand, include, exclude):
+            yield value
+            count += 1
+            if not count % chunk_size:
+                await asyncio.sleep(0)
+        return
+    dispatch = {}
+    page = []
+    async for value in values:
+        page.append(value)
+        if len(page) == chunk_size:
+            for item in _serialize_page(
+                    serializer, page, dispatch, context,
+                    expand, include, exclude):
+                yield item
+            page = []
+            await asyncio.sleep(0)
+    for value in _serialize_page(
+            serializer, page, dispatch, context, expand, include, exclude):
+        yield value
+
+
+def _serialize_page(
+        serializer, page, dispatch, context, expand, include, exclude):
+    for value, current, plan, writer, href in serializer._iter_planned(
+            page, expand, include, exclude, dispatch):
+        if current is not None:
+            value = current._serialize_planned(
+                value, plan, writer, href, context)
+        yield value
+
+
+async def serialize(
+        serializer, instance, expand=None, include=None, exclude=None,
+        chunk_size=100):
+    """Serialize an object, iterable or async iterable without blocking the loop.
+
+    Args:
+        serializer (watson.serialize.serializers.Instance): The serializer
+        instance (mixed): The object to be serialized
+        expand (list): Attributes to be expanded on the object
+        include (list): Attributes to be included in the output
+        exclude (list): Attributes to be excluded from the list
+        chunk_size (int): The number of items to serialize between yields
+
+    Returns:
+        A list/dictionary representation of the instance
+    """
+    values = scalars(instance)
+    if not is_iterable(values):
+        return serializer(instance, expand, include, exclude)
+    stats = serializer.stats
+    start = time.perf_counter()
+    context = serializer._context(normalized=True)
+    obj = [
+        value async for value in iter_serialize(
+            serializer, values, expand, include, exclude, chunk_size, context)]
+    obj = serializer._attach_collection_meta(obj, instance)
+    if context.included is not None:
+        obj = serializer._attach_included(obj, context)
+    if stats is not None and not serializer.depth:
+        # time spent waiting on the loop or the iterable is included
+        stats.calls += 1
+        stats.add('serialize', time.perf_counter() - start)
+    return obj
+
+
+async def collect(values, chunk_size=100):
+    """Consume an async iterable into a list.
+
+    Used when the output is written by an encoder, which requires the complete
+    collection. Sync iterables and objects are returned untouched.
+
+    Args:
+        values (mixed): The async iterable or SQLAlchemy result to consume
+        chunk_size (int): The number of items to consume between yields
+
+    Returns:
+        list
+    """
+    values = scalars(values)
+    if not isinstance(values, collections.AsyncIterable):
+        return values
+    items = []
+    async for value in values:
+        items.append(value)
+        if not len(items) % chunk_size:
+            await asyncio.sleep(0)
+    return items
+
+
+async def offload(func, *args):
+    """Call a blocking function in the default executor of the running loop.
+
+    Used when the output has to be produced at once (such as when it is
+    written by an encoder), so that a large response does not block the loop.
+
+    Args:
+        func (callable): The function to call
+        args (mixed): The arguments to call it with
+
+    Returns:
+        The return value of the function
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import itertools
+from watson.serialize.parallel import Detached, _applied
+
+__all__ = ['apply', 'mapping', 'pages']
+
+_missing = object()
+
+
+def mapping(strategy):
+    """Vectorize a strategy by converting each distinct value only once.
+
+    This suits attributes with a small number of distinct values, such as enums.
+
+    Args:
+        strategy (callable): The strategy to apply to each distinct value
+
+    Returns:
+        callable: A batch (or column) strategy
+
+    Usage:
+
+        .. code-block: python
+
+            class Meta(object):
+                batch_strategies = {
+                    'status': batches.mapping(lambda x: x.name)
+                }
+    """
+    def batch(values):
+        converted = {}
+        output = []
+        for value in values:
+            try:
+                output.append(converted[value])
+            except KeyError:
+                output.append(converted.setdefault(value, strategy(value)))
+            except TypeError:  # unhashable values
+                output.append(strategy(value))
+        return output
+    return batch
+
+
+def pages(values, size):
+    """Split an iterable into lists of at most `size` items.
+
+    Args:
+        values (mixed): The iterable to split
+        size (int): The maximum number of items in each page
+
+    Yields:
+        list
+    """
+    values = iter(values)
+    while True:
+        page = list(itertools.islice(values, size))
+        if not page:
+            return
+        yield page
+
+
+def _derive_plan(plan):
+    return plan._replace(fields=tuple(
+        field._replace(strategy=_applied, batch=None) if field.batch else field
+        for field in plan.fields))
+
+
+def _batched_plan(serializer, plan):
+    if serializer.stats is not None:
+        # instrumented plans compare equal to the plans they wrap, so they
+        # cannot share the cache without recording into another Stats
+        return _derive_plan(plan)
+    key = ('batched', plan)
+    batched = serializer.plan_cache.get(key)
+    if batched is None:
+        batched = serializer.plan_cache.set(key, _derive_plan(plan))
+    return batched
+
+
+def apply(serializer, values, plan):
+    """Apply the batch strategies of a plan to a page of objects.
+
+    Each batch strategy is called once with the values of its attribute across
+    every object in the page (missing values are skipped, as are None values
+    unless nulls are included) and must return the converted values in the
+    same order.
+
+    Args:
+        serializer (watson.serialize.serializers.Instance): The serializer
+        values (list): The objects to be serialized with the plan
+        plan (watson.serialize.plans.Plan): The plan containing batch strategies
+
+    Returns:
+        tuple: (values, plan), the objects wrapped with their converted values
+            and a plan that writes the converted values as is.
+    """
+    include_null = bool(plan.include_null or serializer.include_null)
+    converted = [{} for _ in values]
+    for field in plan.fields:
+        if not field.batch:
+            continue
+        name = field.name
+        indexes, column = [], []
+        for index, value in enumerate(values):
+            value = getattr(value, name, _missing)
+            if value is _missing or (value is None and not include_null):
+                continue
+            indexes.append(index)
+            column.append(value)
+        if column:
+            for index, value in zip(indexes, field.batch(column)):
+                converted[index][name] = value
+    return (
+        [Detached(value, conv) for value, conv in zip(values, converted)],
+        _batched_plan(serializer, plan))
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+import abc
+import collections
+import hashlib
+import pickle
+import threading
+import time
+from sqlalchemy import event
+from watson.common import imports
+
+__all__ = ['Base', 'Memory', 'Client', 'Fragments', 'key']
+
+
+def key(*parts):
+    """Generate a cache key from a series of hashable parts.
+
+    The key is hashed so that it is safe to use with backends such as
+    memcached which restrict the length and characters of keys.
+
+    Returns:
+        string
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+class Base(metaclass=abc.ABCMeta):
+
+    """The interface that all cache storages must implement.
+
+    This mirrors the storage interface from watson-cache, so any of those
+    storages can be used in place of the ones defined here.
+    """
+
+    @abc.abstractmethod
+    def get(self, key, default=None):
+        raise NotImplementedError('get must be implemented')  # pragma: no cover
+
+    @abc.abstractmethod
+    def set(self, key, value, timeout=0):
+        raise NotImplementedError('set must be implemented')  # pragma: no cover
+
+    @abc.abstractmethod
+    def __delitem__(self, key):
+        raise NotImplementedError('__delitem__ must be implemented')  # pragma: no cover
+
+    @abc.abstractmethod
+    def flush(self):
+        raise NotImplementedError('flush must be implemented')  # pragma: no cover
+
+    def __repr__(self):
+        return '<{0}>'.format(imports.get_qualified_name(self))
+
+
+class Memory(Base):
+
+    """A bounded, thread safe LRU cache with an optional timeout for each key.
+
+    Attributes:
+        maxsize (int): The maximum number of items stored
+        timeout (int): The default amount of time in seconds a key is valid for
+        hits (int): The number of successful gets
+        misses (int): The number of gets that were not found or had expired
+    """
+
+    def __init__(self, maxsize=1024, timeout=0):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            stored = self._data.get(key)
+            if stored is None or (stored[1] and stored[1] < time.monotonic()):
+                self._data.pop(key, None)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return stored[0]
+
+    def set(self, key, value, timeout=0):
+        timeout = timeout or self.timeout
+        expires = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def flush(self):
+        with self._lock:
+            self._data.clear()
+        return True
+
+
+class Client(Base):
+
+    """Store items in a memcached or redis style client.
+
+    Any client that implements `get(key)`, `set(key, value[, timeout])` and
+    `delete(key)` can be used (python-memcached, pymemcache and redis-py
+    all do). Values are pickled before they are stored.
+
+    Attributes:
+        client (mixed): The client used to store the values
+        prefix (string): A prefix added to each key
+        timeout (int): The default amount of time in seconds a key is valid for
+
+    Usage:
+
+        .. code-block: python
+
+            cache = caches.Client(redis.StrictRedis(), prefix='api.')
+    """
+
+    def __init__(self, client, prefix='', timeout=0):
+        self.client = client
+        self.prefix = prefix
+        self.timeout = timeout
+
+    def get(self, key, default=None):
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return default
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout=0):
+        timeout = timeout or self.timeout
+        args = (self.prefix + key, pickle.dumps(value))
+        if timeout:
+            args += (timeout,)
+        self.client.set(*args)
+
+    def __delitem__(self, key):
+        self.client.delete(self.prefix + key)
+
+    def flush(self):
+        flush = getattr(self.client, 'flush_all', None) or self.client.flushdb
+        flush()
+        return True
+
+
+class Fragments(object):
+
+    """Cache the serialized output of individual objects.
+
+    Fragments are stored against the Meta class and identifier of the object, and
+    then against the plan used to serialize it (along with the value of the
+    `version` attribute from the Meta class if it is defined). This allows a
+    single object that appears in many collections or nested expands to be
+    serialized once, and all variations of it to be invalidated at once.
+
+    The nested objects embedded within a fragment are recorded when it is
+    stored, so invalidating an object also removes the fragments of every
+    object that embeds it (and so on up to the top level object).
+
+    Objects without an identifier (such as unsaved models) cannot be told
+    apart, so their fragments are never stored.
+
+    Cached fragments are shared between outputs, so they should be treated as
+    read only.
+
+    Attributes:
+        maxsize (int): The maximum number of objects to store fragments for
+        hits (int): The number of fragments that were retrieved
+        misses (int): The number of fragments that were not found
+
+    Usage:
+
+        .. code-block: python
+
+            fragments = caches.Fragments()
+            fragments.listen(Model, SubModel)  # invalidate when rows change
+
+            serializer = serializers.Instance(router)
+            serializer.fragment_cache = fragments
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._dependencies = {}
+        self._dependents = {}
+        self._lock = threading.Lock()
+
+    def _variant(self, instance, plan, variant):
+        if plan.version:
+            return (plan, variant, getattr(instance, plan.version, None))
+        return (plan, variant)
+
+    def get(self, instance, plan, variant=None):
+        """Retrieve the fragment for an object.
+
+        Args:
+            instance (mixed): The object being serialized
+            plan (watson.serialize.plans.Plan): The plan used to serialize the object
+            variant (mixed): Any additional state that affects the output
+
+        Returns:
+            dict: None if the fragment has not been stored
+        """
+        identity = (plan.meta, getattr(instance, plan.identifier, None))
+        if identity[1] is None:
+            return None
+        with self._lock:
+            fragments = self._data.get(identity)
+            fragment = None
+            if fragments is not None:
+                fragment = fragments.get(self._variant(instance, plan, variant))
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(identity)
+            self.hits += 1
+            return fragment
+
+    def set(self, instance, plan, fragment, variant=None):
+        """Store the fragment for an object.
+
+        Args:
+            instance (mixed): The object that was serialized
+            plan (watson.serialize.plans.Plan): The plan used to serialize the object
+            fragment (dict): The serialized object
+            variant (mixed): Any additional state that affects the output
+        """
+        identity = (plan.meta, getattr(instance, plan.identifier, None))
+        if identity[1] is None:
+            return
+        key = self._variant(instance, plan, variant)
+        with self._lock:
+            fragments = self._data.setdefault(identity, {})
+            if plan.version:
+                # older versions of the object will never be requested again
+                for stale in [k for k in fragments if k[-1] != key[-1]]:
+                    del fragments[stale]
+            fragments[key] = fragment
+            self._data.move_to_end(identity)
+            self._depend(identity, _embedded(instance, plan))
+            while len(self._data) > self.maxsize:
+                self._forget(self._data.popitem(last=False)[0])
+
+    def _depend(self, identity, embedded):
+        if not embedded:
+            return
+        dependencies = self._dependencies.setdefault(identity, set())
+        for dependency in embedded - dependencies:
+            self._dependents.setdefault(dependency, set()).add(identity)
+        dependencies |= embedded
+
+    def _forget(self, identity):
+        # remove an object from the dependencies, returning the identities of
+        # the objects that embed it
+        for dependency in self._dependencies.pop(identity, ()):
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(identity)
+                if not dependents:
+                    del self._dependents[dependency]
+        return self._dependents.pop(identity, ())
+
+    def _evict(self, identities):
+        pending = list(identities)
+        while pending:
+            identity = pending.pop()
+            self._data.pop(identity, None)
+            pending.extend(self._forget(identity))
+
+    def previous(self, instance, plan, variant=None):
+        """Retrieve the latest fragment stored for an object.
+
+        Unlike `get`, the fragment is returned even if it was stored for an
+        older version of the object, so that it can be compared against.
+
+        Args:
+            instance (mixed): The object being serialized
+            plan (watson.serialize.plans.Plan): The plan used to serialize the object
+            variant (mixed): Any additional state that affects the output
+
+        Returns:
+            dict: None if no fragment has been stored
+        """
+        identity = (plan.meta, getattr(instance, plan.identifier, None))
+        if identity[1] is None:
+            return None
+        with self._lock:
+            fragments = self._data.get(identity)
+            if not fragments:
+                return None
+            for key, fragment in fragments.items():
+                if key[0] == plan and key[1] == variant:
+                    return fragment
+        return None
+
+    def invalidate(self, model, identifier=None):
+        """Remove the fragments for an object, or all objects of a class.
+
+        Args:
+            model (class): The class of the object
+            identifier (mixed): The identifier of the object, if not specified
+                all fragments for the class will be removed.
+        """
+        meta = model.Meta
+        with self._lock:
+            if identifier is not None:
+                self._evict([(meta, identifier)])
+                return
+            identities = set(self._data).union(self._dependents)
+            self._evict([i for i in identities if i[0] is meta])
+
+    def listen(self, *models):
+        """Invalidate fragments when SQLAlchemy models are updated or deleted.
+
+        Args:
+            models (class): The mapped classes to listen to
+        """
+        for model in models:
+            for name in ('after_update', 'after_delete'):
+                event.listen(model, name, self._on_change, propagate=True)
+
+    def _on_change(self, mapper, connection, target):
+        identifier = target.Meta.attributes[0]
+        self.invalidate(target.__class__, getattr(target, identifier, None))
+
+    def flush(self):
+        with self._lock:
+            self._data.clear()
+            self._dependencies.clear()
+            self._dependents.clear()
+        return True
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _identity(value):
+    return (value.Meta, getattr(value, value.Meta.attributes[0], None))
+
+
+def _embedded(instance, plan):
+    # the identities of the nested objects that a fragment may contain, values
+    # converted by strategies are not serialized as nested objects
+    embedded = set()
+    for field in plan.fields:
+        if field.strategy or field.batch:
+            continue
+        value = getattr(instance, field.name, None)
+        if isinstance(value, list):
+            embedded.update(
+                _identity(item) for item in value if hasattr(item, 'Meta'))
+        elif hasattr(value, 'Meta'):
+            embedded.add(_identity(value))
+    return embedded
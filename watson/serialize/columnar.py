@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from watson.serialize.batches import mapping
+
+__all__ = ['serialize', 'mapping', 'array', 'orients']
+
+orients = ('columns', 'rows')
+_scalars = frozenset((str, int, float, bool, type(None)))
+
+
+def array(values, dtype=None):
+    """Convert a column into a NumPy array, if NumPy is installed.
+
+    Args:
+        values (list): The values of the column
+        dtype (mixed): The dtype of the array
+
+    Returns:
+        numpy.ndarray, or a list if NumPy is not installed
+    """
+    # imported here, as importing NumPy is slow and it is rarely needed
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return list(values)
+    return numpy.asarray(values, dtype=dtype)
+
+
+def _column(serializer, field, values, column_strategy, include_null, context):
+    name = field.name
+    column = [getattr(value, name, None) for value in values]
+    if column_strategy is not None:
+        return list(column_strategy(column))
+    if field.batch:
+        indexes = [
+            index for index, value in enumerate(column)
+            if value is not None or include_null]
+        converted = field.batch([column[index] for index in indexes])
+        for index, value in zip(indexes, converted):
+            column[index] = value
+        return column
+    if field.strategy:
+        strategy = field.strategy
+        return [
+            strategy(value) if value is not None or include_null else None
+            for value in column]
+    for i, value in enumerate(column):
+        if value.__class__ not in _scalars and (
+                isinstance(value, list) or hasattr(value, 'Meta')):
+            column[i] = serializer._serialize_nested(field, value, context)
+    return column
+
+
+def serialize(
+        serializer, instance, expand=None, include=None, exclude=None,
+        orient='columns', arrays=False):
+    """Serialize a collection into columns rather than a list of objects.
+
+    Every object in the collection shares the same columns, so they must all
+    have the same Meta class (a ValueError is raised otherwise), and each
+    column is converted as a whole. A Meta class may
+    define `column_strategies`, which are called once with the complete list
+    of values for an attribute (including None for missing values) and take
+    precedence over the regular per value `strategies`. Batch strategies are
+    applied to the whole column at once, skipping None values unless nulls
+    are included. The limits of the serializer count each object as a row.
+
+    Args:
+        serializer (watson.serialize.serializers.Instance): The serializer
+        instance (mixed): An iterable, Pagination or SQLAlchemy Query
+        expand (list): Attributes to be expanded on the objects
+        include (list): Attributes to be included in the output
+        exclude (list): Attributes to be excluded from the output
+        orient (string): 'columns' for a list of values per attribute, or
+            'rows' for a list of values per object with a shared header
+        arrays (boolean): Convert each column into a NumPy array when NumPy
+            is installed (only applicable to the columns orient)
+
+    Returns:
+        dict: The columns, data, hrefs and meta of the collection
+
+    Usage:
+
+        .. code-block: python
+
+            columnar.serialize(serializer, [Model(id=1, name='a'), Model(id=2, name='b')])
+            # {'columns': ['id', 'name'],
+            #  'data': {'id': [1, 2], 'name': ['a', 'b']},
+            #  'hrefs': ['/models/1', '/models/2'],
+            #  'meta': {...}}
+    """
+    if orient not in orients:
+        raise ValueError(
+            'Invalid orient {0}, must be one of {1}'.format(
+                orient, ', '.join(orients)))
+    values, plan = serializer._prepare_query(instance, expand, include, exclude)
+    if plan is not None:
+        values = list(values)
+    else:
+        values = list(values)
+        if len({getattr(value, 'Meta', None) for value in values}) > 1:
+            raise ValueError(
+                'Columnar output requires every item to have the same Meta class')
+        if values and hasattr(values[0], 'Meta'):
+            serializer._assign_meta(values[0])
+            plan = serializer._collection_plan(expand, include, exclude)[0]
+    columns, data, hrefs = [], {}, None
+    if plan is not None:
+        context = serializer._context()
+        guard = context.guard
+        if guard is not None:
+            for value in values:
+                guard.top(value)
+        include_null = bool(plan.include_null or serializer.include_null)
+        column_strategies = getattr(plan.meta, 'column_strategies', None) or {}
+        columns = list(plan.attributes)
+        for field in plan.fields:
+            data[field.name] = _column(
+                serializer, field, values,
+                column_strategies.get(field.name), include_null, context)
+        if guard is not None and guard.sized:
+            for row in zip(*[data[name] for name in columns]):
+                guard.add(dict(zip(columns, row)))
+        href = plan.href(serializer.router)
+        if href:
+            hrefs = [href(value) for value in data[plan.identifier]]
+    if orient == 'rows':
+        data = [list(row) for row in zip(*[data[name] for name in columns])]
+    elif arrays:
+        data = {name: array(column) for name, column in data.items()}
+    output = {'columns': columns, 'data': data}
+    if hrefs is not None:
+        output['hrefs'] = hrefs
+    if serializer.meta is not None and serializer.expose_meta:
+        output['meta'] = serializer.collection_meta(instance, len(values))
+    return output
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from watson.serialize import plans
+
+__all__ = ['generate', 'function', 'functions']
+
+
+_missing = object()
+_scalars = frozenset((str, int, float, bool))
+functions = plans.Cache()
+
+
+def generate(plan):
+    """Generate a specialized function that serializes objects for a plan.
+
+    The generated function performs the fixed sequence of attribute lookups,
+    null checks, strategy calls and dictionary stores that the plan requires,
+    without consulting the plan (or the Meta class) for each object.
+
+    Nested lists and models are handed back to the `nested` callable (along
+    with the context of the call) so that they are serialized in the same way
+    as the interpreted path.
+
+    Args:
+        plan (watson.serialize.plans.Plan): The plan to generate the function for
+
+    Returns:
+        callable: function(instance, include_null, nested, context) -> dict
+    """
+    namespace = {
+        '_missing': _missing,
+        '_scalars': _scalars,
+    }
+    lines = [
+        'def serialize(instance, include_null, nested, context=None):',
+        '    obj = {}',
+    ]
+    for index, field in enumerate(plan.fields):
+        namespace['field_{}'.format(index)] = field
+        lines.extend([
+            '    value = getattr(instance, {!r}, _missing)'.format(field.name),
+            '    if value is not _missing and (value is not None or include_null):',
+        ])
+        if field.strategy:
+            namespace['strategy_{}'.format(index)] = field.strategy
+            lines.append('        value = strategy_{}(value)'.format(index))
+        else:
+            lines.extend([
+                '        if value.__class__ not in _scalars and (isinstance(value, list) or hasattr(value, "Meta")):',
+                '            value = nested(field_{}, value, context)'.format(index),
+            ])
+        lines.append('        obj[{!r}] = value'.format(field.name))
+    lines.append('    return obj')
+    source = '\n'.join(lines)
+    code = compile(
+        source, '<serializer {}>'.format(plan.meta.__qualname__), 'exec')
+    exec(code, namespace)
+    func = namespace['serialize']
+    func.__source__ = source
+    return func
+
+
+def function(plan):
+    """Retrieve the generated function for a plan, generating it if required.
+
+    Args:
+        plan (watson.serialize.plans.Plan): The plan to retrieve the function for
+    """
+    func = functions.get(plan)
+    if func is None:
+        func = functions.set(plan, generate(plan))
+    return func
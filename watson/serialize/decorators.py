@@ -1,22 +1,71 @@
 # -*- coding: utf-8 -*-
-from watson.serialize import serializers, errors
+from collections import abc as collections
+import inspect
+from watson.common import imports
+from watson.serialize import (
+    aio, caches, encoders, etags, instrumentation, selections, serializers,
+    errors)
 
 __all__ = ['serialize']
 
 
-def serialize(func=None, router=None):
+def serialize(
+        func=None, router=None, compiled=False, project=False,
+        eager_load=False, encoder=None, cache=None, timeout=0, version=None,
+        fragments=None, executor=None, stats=None, columnar=None,
+        limits=None, etag=False, normalized=False):
     """Serialize an iterable object into a format suitable for encoding.
 
     A user can add additional query string parameters to the URL in order to
     include/exclude/expand certain fields that are contained in the models
     being exposed.
 
+    Coroutine functions are wrapped in a coroutine, which awaits the action
+    and consumes any async iterables it returns (such as the result of an
+    AsyncSession), yielding to the event loop as the items are serialized.
+    Output that has to be produced at once (encoded, columnar or normalized)
+    is rendered in the default executor of the loop instead.
+
     Args:
         router (watson.routing.routers.Base): The router to be used, defaults
             to the router retrieved from the container
+        compiled (boolean): Whether or not to use generated serializer functions
+        project (boolean): Whether or not to only load the required columns
+            when a SQLAlchemy query is returned
+        eager_load (boolean): Whether or not to eager load the relationships
+            being serialized when a SQLAlchemy query or Pagination is returned
+        encoder (watson.serialize.encoders.JSONWriter): Encode the output directly
+            into the body of the response rather than returning a dict/list,
+            a list of writers (such as JSONWriter, MessagePackWriter and
+            CBORWriter) will be selected from by the Accept header of the
+            request, defaulting to the first
+        cache (watson.serialize.caches.Base): Cache the output of GET requests
+            for the same route arguments and include/expand/exclude values
+        timeout (int): The amount of time in seconds the output is cached for
+        version (callable): Called with the controller and route arguments,
+            returns a version (or etag) of the data that forms part of the
+            cache key
+        fragments (watson.serialize.caches.Fragments): Cache the serialized
+            output of each individual object
+        executor (concurrent.futures.Executor): Serialize large collections
+            in chunks across the executor
+        stats (callable): Record where time is spent while serializing, called
+            with the controller and the watson.serialize.instrumentation.Stats
+            (see instrumentation.Header and instrumentation.Log)
+        columnar (string): Serialize collections into columns ('columns') or
+            rows with a shared header ('rows'), see watson.serialize.columnar
+        limits (watson.serialize.limits.Limits): The limits on the output,
+            exceeding them responds with a watson.serialize.errors.LimitExceeded
+        etag (boolean): Add an ETag to GET responses derived from the plan and
+            the `version` of each object, and respond with 304 Not Modified
+            without serializing when it matches the If-None-Match header (the
+            ETag is cached along with the output)
+        normalized (boolean): Serialize each distinct nested object once into
+            a top level `included` map, see watson.serialize.included
 
     Returns:
-        A list/dictionary of values suitable for encoding
+        A list/dictionary of values suitable for encoding, or the response
+        if an encoder has been specified
 
     Usage:
 
@@ -66,21 +115,175 @@ def serialize(func=None, router=None):
             # their 'name' attribute
     """
     def decorator(func):
-        def wrapper(self, *args, **kwargs):
-            serializer_kwargs = {}
+        def prepare(self, kwargs):
+            raw = {}
             for arg in ('expand', 'include', 'exclude'):
-                serializer_kwargs[arg] = serializers.split_attributes(self.request.get[arg]) if arg in self.request.get else None
-            try:
-                response = func(self, **kwargs)
-            except errors.Base as exc:
-                response = exc
+                raw[arg] = self.request.get[arg] if arg in self.request.get else None
+            serializer_kwargs = selections.selection(**raw).kwargs()
+            writer = encoder
+            if isinstance(encoder, (list, tuple)):
+                writer = encoders.negotiate(
+                    self.request.headers.get('Accept'), encoder)
+                self.response.headers.add('Vary', 'Accept', replace=True)
+            cache_key = None
+            if cache is not None and self.request.method in ('GET', 'HEAD'):
+                cache_key = _cache_key(
+                    self, func, kwargs, serializer_kwargs, version, writer)
+            return serializer_kwargs, cache_key, writer
+
+        def cached(self, cache_key, encoder):
+            cached = cache.get(cache_key) if cache_key else None
+            if cached is None:
+                return None
+            if etag:
+                cached, tag = cached
+                if not_modified(self, tag):
+                    return self.response
+            if encoder:
+                return _respond(self.response, encoder, cached)
+            return cached
+
+        def create(self, response):
             use_router = router if router else self.container.get('router')
             serializer = serializers.Instance(use_router)
+            serializer.compiled = compiled
+            serializer.project = project
+            serializer.eager_load = eager_load
+            serializer.fragment_cache = fragments
+            serializer.executor = executor
+            serializer.limits = limits
+            serializer.normalized = normalized
+            if stats is not None:
+                serializer.stats = instrumentation.Stats()
             if isinstance(response, errors.Base):
                 self.response.status_code = response.status_code
-            response = serializer(
-                response,
-                **serializer_kwargs)
-            return response
+            return serializer
+
+        def compute(self, serializer, response, serializer_kwargs, encoder):
+            if not etag or self.request.method not in ('GET', 'HEAD') or \
+                    isinstance(response, errors.Base):
+                return None
+            return etags.compute(
+                serializer, response,
+                *[serializer_kwargs[arg] for arg in ('expand', 'include', 'exclude')],
+                encoder.mimetype if encoder else None, columnar)
+
+        def not_modified(self, tag):
+            if tag is None:
+                return False
+            self.response.headers.add('ETag', tag, replace=True)
+            if not etags.matches(self.request.headers.get('If-None-Match'), tag):
+                return False
+            self.response.status_code = 304
+            return True
+
+        def encode(serializer, response, serializer_kwargs, encoder):
+            if serializer.stats is None:
+                return encoder.encode(serializer, response, **serializer_kwargs)
+            serializer.stats.calls += 1
+            return serializer.stats.timed(
+                'serialize', encoder.encode, serializer, response,
+                *[serializer_kwargs[arg] for arg in ('expand', 'include', 'exclude')])
+
+        def render(serializer, response, serializer_kwargs, encoder):
+            if columnar and isinstance(response, collections.Iterable):
+                output = serializer.serialize_columns(
+                    response, orient=columnar, **serializer_kwargs)
+                return encoder.dumps(output) if encoder else output
+            if normalized and encoder:
+                # writers do not normalize the output, so the normalized
+                # output is encoded instead
+                return encoder.dumps(serializer(response, **serializer_kwargs))
+            if encoder:
+                return encode(serializer, response, serializer_kwargs, encoder)
+            return serializer(response, **serializer_kwargs)
+
+        def respond(
+                self, serializer, response, output, cache_key, encoder, tag):
+            if serializer.stats is not None:
+                stats(self, serializer.stats)
+            if cache_key and not isinstance(response, errors.Base):
+                cache.set(cache_key, (output, tag) if etag else output, timeout)
+            if encoder:
+                return _respond(self.response, encoder, output)
+            return output
+
+        def wrapper(self, *args, **kwargs):
+            serializer_kwargs, cache_key, writer = prepare(self, kwargs)
+            output = cached(self, cache_key, writer)
+            if output is not None:
+                return output
+            try:
+                response = func(self, **kwargs)
+            except errors.Base as exc:
+                response = exc
+            serializer = create(self, response)
+            tag = compute(self, serializer, response, serializer_kwargs, writer)
+            if not_modified(self, tag):
+                return self.response
+            try:
+                output = render(
+                    serializer, response, serializer_kwargs, writer)
+            except errors.Base as exc:
+                response = exc
+                serializer = create(self, response)
+                output = render(
+                    serializer, response, serializer_kwargs, writer)
+            return respond(
+                self, serializer, response, output, cache_key, writer, tag)
+
+        async def async_wrapper(self, *args, **kwargs):
+            serializer_kwargs, cache_key, writer = prepare(self, kwargs)
+            output = cached(self, cache_key, writer)
+            if output is not None:
+                return output
+            try:
+                response = await func(self, **kwargs)
+            except errors.Base as exc:
+                response = exc
+            serializer = create(self, response)
+            tag = compute(self, serializer, response, serializer_kwargs, writer)
+            if not_modified(self, tag):
+                return self.response
+            try:
+                if writer or columnar or normalized:
+                    output = await aio.offload(
+                        render, serializer, await aio.collect(response),
+                        serializer_kwargs, writer)
+                else:
+                    output = await serializer.aserialize(
+                        response, **serializer_kwargs)
+            except errors.Base as exc:
+                response = exc
+                serializer = create(self, response)
+                output = render(
+                    serializer, response, serializer_kwargs, writer)
+            return respond(
+                self, serializer, response, output, cache_key, writer, tag)
+
+        if inspect.iscoroutinefunction(func):
+            return async_wrapper
         return wrapper
     return decorator(func) if func else decorator
+
+
+def _cache_key(controller, func, kwargs, serializer_kwargs, version, encoder):
+    return caches.key(
+        imports.get_qualified_name(controller),
+        func.__name__,
+        sorted(kwargs.items()),
+        sorted((arg, tuple(value or ())) for arg, value in serializer_kwargs.items()),
+        version(controller, **kwargs) if version else None,
+        encoder.mimetype if encoder else None)
+
+
+def _respond(response, encoder, body):
+    charset = getattr(encoder, 'charset', 'utf-8')
+    if charset:
+        response.headers.add(
+            'Content-Type', encoder.mimetype, replace=True, charset=charset)
+    else:
+        response.headers.add('Content-Type', encoder.mimetype, replace=True)
+    # The body is already encoded, so bypass the str setter on the response
+    response._body = body
+    return response
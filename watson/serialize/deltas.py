@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import sqlalchemy
+from sqlalchemy import exc as sqlalchemy_exc
+
+__all__ = ['changed', 'diff']
+
+_missing = object()
+
+
+def changed(instance):
+    """Retrieve the attributes of a SQLAlchemy model that have changed.
+
+    The history of each attribute is read without loading any unloaded
+    attributes, and is only available until the session is flushed.
+
+    Args:
+        instance (mixed): The object to inspect
+
+    Returns:
+        set: The names of the changed attributes, or None if the object is
+            not mapped by SQLAlchemy
+    """
+    try:
+        state = sqlalchemy.inspect(instance)
+    except sqlalchemy_exc.NoInspectionAvailable:
+        return None
+    attrs = getattr(state, 'attrs', None)
+    if attrs is None:
+        return None
+    return {attr.key for attr in attrs if attr.history.has_changes()}
+
+
+def diff(previous, current):
+    """Generate a JSON Merge Patch (RFC 7386) between two serialized objects.
+
+    Nested objects are patched recursively, while lists (and any other value)
+    are replaced entirely. Attributes that are no longer present are removed
+    with null.
+
+    Args:
+        previous (dict): The previously serialized object
+        current (dict): The currently serialized object
+
+    Returns:
+        dict: The patch, which will be empty if nothing has changed
+
+    Usage:
+
+        .. code-block: python
+
+            deltas.diff({'id': 1, 'name': 'a', 'age': 3}, {'id': 1, 'name': 'b'})
+            # {'name': 'b', 'age': None}
+    """
+    patch = {}
+    for key, value in current.items():
+        old = previous.get(key, _missing)
+        if old is value or old == value:
+            continue
+        if isinstance(value, dict) and isinstance(old, dict):
+            patch[key] = diff(old, value)
+        else:
+            patch[key] = value
+    for key in previous:
+        if key not in current:
+            patch[key] = None
+    return patch
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+import sqlalchemy
+from sqlalchemy import exc as sqlalchemy_exc
+from watson.common import imports
+from watson.serialize import errors as serialize_errors, plans
+
+__all__ = ['Deserializer', 'generate', 'function', 'functions', 'messages']
+
+
+_missing = object()
+_invalid = (ValueError, TypeError, KeyError, LookupError)
+functions = plans.Cache()
+
+messages = {
+    'required': 'This field is required.',
+    'null': 'This field may not be null.',
+    'object': 'Expected an object.',
+    'list': 'Expected a list.',
+    'unknown': 'Unknown field.',
+    'invalid': 'Invalid value.',
+    'length': 'Ensure this value has at most {} characters.',
+    int: 'Expected an integer.',
+    float: 'Expected a number.',
+    str: 'Expected a string.',
+    bool: 'Expected a boolean.',
+}
+
+# the types that are accepted for each python type of a column, booleans are
+# excluded from numbers as they are a subclass of int
+_accepted = {
+    int: (int,),
+    float: (int, float),
+    str: (str,),
+    bool: (bool,),
+}
+
+
+class _Column(object):
+
+    __slots__ = ('type', 'nullable', 'length', 'related', 'uselist')
+
+    def __init__(
+            self, type=None, nullable=True, length=None, related=None,
+            uselist=False):
+        self.type = type
+        self.nullable = nullable
+        self.length = length
+        self.related = related
+        self.uselist = uselist
+
+
+def _columns(model):
+    # derive the type, nullability and length of each attribute from the
+    # SQLAlchemy mapper of the model, if it has one
+    try:
+        mapper = sqlalchemy.inspect(model)
+    except sqlalchemy_exc.NoInspectionAvailable:
+        return {}
+    columns = {}
+    for prop in mapper.column_attrs:
+        if len(prop.columns) != 1:
+            continue
+        column = prop.columns[0]
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:  # pragma: no cover
+            python_type = None
+        columns[prop.key] = _Column(
+            type=python_type if python_type in _accepted else None,
+            nullable=column.nullable or column.primary_key,
+            length=getattr(column.type, 'length', None) if python_type is str else None)
+    for prop in mapper.relationships:
+        columns[prop.key] = _Column(
+            related=prop.mapper.class_, uselist=prop.uselist)
+    return columns
+
+
+def _message(exc):
+    message = exc.args[0] if exc.args and isinstance(exc, ValueError) else None
+    return message if isinstance(message, str) else messages['invalid']
+
+
+def _nested(model, uselist):
+    # nested functions are resolved when first called, as relationships may
+    # refer back to the model being generated
+    resolved = []
+
+    def nested(value, errors, pointer, partial, strict):
+        if not resolved:
+            resolved.append(function(model))
+        func = resolved[0]
+        if not uselist:
+            if value.__class__ is not dict:
+                errors[pointer] = messages['object']
+                return _missing
+            return func(value, None, errors, pointer, partial, strict)
+        if not isinstance(value, list):
+            errors[pointer] = messages['list']
+            return _missing
+        count = len(errors)
+        items = []
+        for index, item in enumerate(value):
+            item_pointer = '{}/{}'.format(pointer, index)
+            if item.__class__ is not dict:
+                errors[item_pointer] = messages['object']
+                continue
+            items.append(
+                func(item, None, errors, item_pointer, partial, strict))
+        return items if len(errors) == count else _missing
+    return nested
+
+
+def generate(model):
+    """Generate a specialized function that validates and assigns input.
+
+    The attributes of the Meta class of the model (less any `read_only`
+    attributes) are read from the input, checked against the `required`
+    attributes and the type, nullability and length of their SQLAlchemy
+    columns, and converted by their `inverse_strategies`. Values are only
+    assigned once every attribute of the object is valid, so an invalid object
+    is never partially updated.
+
+    Inverse strategies raise a ValueError (or TypeError, KeyError) when the
+    value is invalid, the message of a ValueError is used as the error.
+
+    Args:
+        model (class): The class to generate the function for
+
+    Returns:
+        callable: function(data, instance, errors, pointer, partial) -> object,
+            errors is a dict that each error is added to by its JSON pointer,
+            None is returned if the object was invalid
+    """
+    meta = model.Meta
+    read_only = set(getattr(meta, 'read_only', ()))
+    required = set(getattr(meta, 'required', ()))
+    strategies = getattr(meta, 'inverse_strategies', None) or {}
+    columns = _columns(model)
+    attributes = [attr for attr in meta.attributes if attr not in read_only]
+    namespace = {
+        '_missing': _missing,
+        '_invalid': _invalid,
+        '_message': _message,
+        '_model': model,
+        '_accepted': frozenset(attributes),
+        '_messages': messages,
+    }
+    lines = [
+        'def deserialize(data, instance, errors, pointer, partial, strict=False):',
+        '    count = len(errors)',
+    ]
+    for index, attr in enumerate(attributes):
+        column = columns.get(attr) or _Column()
+        value = 'v{}'.format(index)
+        path = 'pointer + {!r}'.format('/' + attr)
+        lines.append('    {} = data.get({!r}, _missing)'.format(value, attr))
+        if attr in required:
+            lines.extend([
+                '    if {} is _missing:'.format(value),
+                '        if not partial:',
+                '            errors[{}] = _messages["required"]'.format(path),
+                '    elif {} is None:'.format(value),
+            ])
+        else:
+            lines.append('    if {} is None:'.format(value))
+        if column.nullable and attr not in required:
+            lines.append('        pass')
+        else:
+            lines.append('        errors[{}] = _messages["null"]'.format(path))
+        if attr in strategies:
+            namespace['strategy_{}'.format(index)] = strategies[attr]
+            lines.extend([
+                '    elif {} is not _missing:'.format(value),
+                '        try:',
+                '            {0} = strategy_{1}({0})'.format(value, index),
+                '        except _invalid as exc:',
+                '            errors[{}] = _message(exc)'.format(path),
+                '            {} = _missing'.format(value),
+            ])
+        elif column.related is not None:
+            namespace['nested_{}'.format(index)] = _nested(
+                column.related, column.uselist)
+            lines.extend([
+                '    elif {} is not _missing:'.format(value),
+                '        {0} = nested_{1}({0}, errors, {2}, partial, strict)'.format(
+                    value, index, path),
+            ])
+        elif column.type is not None:
+            namespace['type_{}'.format(index)] = column.type
+            namespace['types_{}'.format(index)] = _accepted[column.type]
+            lines.extend([
+                '    elif {} is not _missing:'.format(value),
+                '        if {0}.__class__ not in types_{1}:'.format(value, index),
+                '            errors[{}] = _messages[type_{}]'.format(path, index),
+            ])
+            if column.length:
+                lines.extend([
+                    '        elif len({}) > {}:'.format(value, column.length),
+                    '            errors[{}] = _messages["length"].format({})'.format(
+                        path, column.length),
+                ])
+    lines.extend([
+        '    if strict:',
+        '        for key in data.keys() - _accepted:',
+        '            errors[pointer + "/" + str(key)] = _messages["unknown"]',
+        '    if len(errors) != count:',
+        '        return None',
+        '    if instance is None:',
+        '        instance = _model()',
+    ])
+    for index, attr in enumerate(attributes):
+        lines.extend([
+            '    if v{} is not _missing:'.format(index),
+            '        instance.{} = v{}'.format(attr, index),
+        ])
+    lines.append('    return instance')
+    source = '\n'.join(lines)
+    code = compile(source, '<deserializer {}>'.format(meta.__qualname__), 'exec')
+    exec(code, namespace)
+    func = namespace['deserialize']
+    func.__source__ = source
+    return func
+
+
+def function(model):
+    """Retrieve the generated function for a model, generating it if required.
+
+    Args:
+        model (class): The class to retrieve the function for
+    """
+    key = (model, model.Meta)
+    func = functions.get(key)
+    if func is None:
+        func = functions.set(key, generate(model))
+    return func
+
+
+class Deserializer(object):
+
+    """Validate input and assign it to new or existing objects.
+
+    The same Meta class that a model is serialized with determines the
+    attributes that are accepted, along with the following optional
+    attributes:
+
+        read_only (tuple): Attributes that are never assigned from the input
+        required (tuple): Attributes that must be present and not null
+            (unless partial)
+        inverse_strategies (dict): Callables that convert each input value
+            back into the value of the attribute
+
+    A function is generated once per Meta class (see `generate`), so the cost
+    of each object only depends on the attributes being read. Every error is
+    collected before a watson.serialize.errors.Invalid error is raised, with
+    the errors keyed by the JSON pointer of the invalid value.
+
+    Attributes:
+        model (class): The class of the objects to create
+        partial (boolean): Whether or not to skip required attributes that are
+            not present, such as for PATCH requests
+        strict (boolean): Whether or not unknown attributes are errors
+
+    Usage:
+
+        .. code-block: python
+
+            class Model(BaseModel):
+
+                class Meta(object):
+                    attributes = ('id', 'name', 'status')
+                    read_only = ('id',)
+                    required = ('name',)
+                    strategies = {'status': lambda x: x.name}
+                    inverse_strategies = {'status': lambda x: Status[x]}
+
+            deserializer = deserializers.Deserializer(Model)
+            deserializer({'name': 'Test', 'status': 'active'})  # Model
+            deserializer([{'name': 'Test'}, {'status': 'invalid'}])
+            # errors.Invalid: {'/1/name': 'This field is required.',
+            #                  '/1/status': 'Invalid value.'}
+            deserializer({'name': 'Updated'}, instance=model, partial=True)
+    """
+
+    def __init__(self, model, partial=False, strict=False):
+        self.model = model
+        self.partial = partial
+        self.strict = strict
+
+    @property
+    def function(self):
+        return function(self.model)
+
+    def __call__(self, data, instance=None, partial=None):
+        """Deserialize an object or a list of objects.
+
+        Args:
+            data (dict|list): The decoded input
+            instance (mixed): An existing object to update, only used when a
+                single object is deserialized
+            partial (boolean): Overrides the partial attribute
+
+        Returns:
+            The object, or a list of objects
+
+        Raises:
+            watson.serialize.errors.Invalid: If any value is invalid
+        """
+        func = self.function
+        partial = self.partial if partial is None else partial
+        strict = self.strict
+        errors = {}
+        if data.__class__ is dict:
+            output = func(data, instance, errors, '', partial, strict)
+        elif isinstance(data, list):
+            output = []
+            append = output.append
+            for index, item in enumerate(data):
+                pointer = '/{}'.format(index)
+                if item.__class__ is not dict:
+                    errors[pointer] = messages['object']
+                    continue
+                append(func(item, None, errors, pointer, partial, strict))
+        else:
+            errors[''] = messages['object']
+        if errors:
+            raise serialize_errors.Invalid(errors)
+        return output
+
+    def __repr__(self):
+        return '<{0} model:{1}>'.format(
+            imports.get_qualified_name(self),
+            imports.get_qualified_name(self.model))
@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+from collections import abc as collections
+import json
+import threading
+from watson.serialize import batches, packers
+
+__all__ = [
+    'JSON', 'JSONWriter', 'MessagePackWriter', 'CBORWriter', 'negotiate',
+    'backends', 'msgpack_backends', 'cbor_backends']
+
+
+_missing = object()
+_scalars = frozenset((str, int, float, bool, type(None)))
+
+
+_json_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+_json_constants = {None: b'null', True: b'true', False: b'false'}
+
+
+def _json_dumps(value):
+    class_ = value.__class__
+    if class_ is str:
+        return json.encoder.encode_basestring(value).encode('utf-8')
+    if class_ is int:
+        return str(value).encode('ascii')
+    if value is None or class_ is bool:
+        return _json_constants[value]
+    return _json_encoder.encode(value).encode('utf-8')
+
+
+backends = {
+    'json': _json_dumps
+}
+try:
+    import orjson
+    backends['orjson'] = orjson.dumps
+except ImportError:  # pragma: no cover
+    pass
+try:
+    import ujson
+
+    def _ujson_dumps(value):
+        return ujson.dumps(value, ensure_ascii=False).encode('utf-8')
+    backends['ujson'] = _ujson_dumps
+except ImportError:  # pragma: no cover
+    pass
+
+msgpack_backends = {
+    'python': packers.msgpack
+}
+try:
+    import msgpack
+    msgpack_backends['msgpack'] = msgpack.packb
+except ImportError:  # pragma: no cover
+    pass
+
+cbor_backends = {
+    'python': packers.cbor
+}
+try:
+    import cbor2
+    cbor_backends['cbor2'] = cbor2.dumps
+except ImportError:  # pragma: no cover
+    pass
+
+
+class JSON(object):
+
+    """Incrementally encode serialized objects as JSON.
+
+    Collections are serialized one item at a time and emitted as byte chunks
+    containing `chunk_size` items, so that the entire response never needs to
+    be held in memory.
+
+    Attributes:
+        chunk_size (int): The number of items to write in each chunk
+        encoder (json.JSONEncoder): The encoder used for each item
+        encoding (string): The encoding of the emitted bytes
+
+    Usage:
+
+        .. code-block: python
+
+            encoder = encoders.JSON()
+            serializer = serializers.Instance(router)
+            for chunk in encoder.iterencode(serializer, session.query(Model)):
+                response.write(chunk)
+            # b'{"items":[{"id":1,...},...],"meta":{"limit":...}}'
+    """
+
+    def __init__(self, chunk_size=100, encoder=None, encoding='utf-8'):
+        self.chunk_size = chunk_size
+        self.encoder = encoder or json.JSONEncoder(separators=(',', ':'))
+        self.encoding = encoding
+
+    def encode(self, obj):
+        """Encode a single object into bytes.
+        """
+        return self.encoder.encode(obj).encode(self.encoding)
+
+    def iterencode(
+            self, serializer, instance, expand=None, include=None, exclude=None):
+        """Serialize and encode an object, yielding byte chunks.
+
+        Args:
+            serializer (watson.serialize.serializers.Instance): The serializer to use
+            instance (mixed): The object or iterable to be serialized
+            expand (list): Attributes to be expanded on the object
+            include (list): Attributes to be included in the output
+            exclude (list): Attributes to be excluded from the list
+
+        Yields:
+            bytes
+        """
+        if not isinstance(instance, collections.Iterable):
+            yield self.encode(serializer(
+                instance, expand=expand, include=include, exclude=exclude))
+            return
+        items = serializer.iter_serialize(
+            instance, expand=expand, include=include, exclude=exclude)
+        first = next(items, _missing)
+        envelope = serializer.expose_meta
+        parts = ['{"items":[' if envelope else '[']
+        count = 0
+        if first is not _missing:
+            parts.append(self.encoder.encode(first))
+            count = 1
+            for item in items:
+                if count % self.chunk_size == 0:
+                    yield ''.join(parts).encode(self.encoding)
+                    parts = []
+                parts.append(',')
+                parts.append(self.encoder.encode(item))
+                count += 1
+        if envelope:
+            parts.append('],"meta":')
+            parts.append(self.encoder.encode(
+                serializer.collection_meta(instance, count)))
+            parts.append('}')
+        else:
+            parts.append(']')
+        yield ''.join(parts).encode(self.encoding)
+
+
+class JSONWriter(object):
+
+    """Write serialized objects directly into a buffer of JSON bytes.
+
+    The same include/expand/exclude rules as the serializer are applied, but
+    values are written straight into the buffer rather than building an
+    intermediate tree of dicts and lists that is encoded afterwards.
+
+    Attributes:
+        backend (string): The name of the backend used to encode values
+            (json, orjson or ujson), defaults to the fastest available
+        buffer (bytearray): The buffer that is reused between calls to encode,
+            a separate buffer is used for each thread unless one is specified
+
+    Usage:
+
+        .. code-block: python
+
+            writer = encoders.JSONWriter()
+            serializer = serializers.Instance(router)
+            writer.encode(serializer, models, include=['name'])
+            # b'{"items":[{"id":1,"name":"..."}],"meta":{...}}'
+    """
+
+    mimetype = 'application/json'
+    charset = 'utf-8'
+    _null = b'null'
+
+    def __init__(self, backend=None, buffer=None):
+        if not backend:
+            backend = next(
+                name for name in ('orjson', 'ujson', 'json') if name in backends)
+        self.backend = backend
+        self.dumps = backends[backend]
+        self._buffer = buffer
+        self._local = threading.local()
+
+    @property
+    def buffer(self):
+        if self._buffer is not None:
+            return self._buffer
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = bytearray()
+        return buffer
+
+    def encode(
+            self, serializer, instance, expand=None, include=None, exclude=None):
+        """Serialize and encode an object into bytes.
+
+        Args:
+            serializer (watson.serialize.serializers.Instance): The serializer to use
+            instance (mixed): The object or iterable to be serialized
+            expand (list): Attributes to be expanded on the object
+            include (list): Attributes to be included in the output
+            exclude (list): Attributes to be excluded from the list
+
+        Returns:
+            bytes
+        """
+        buffer = self.buffer
+        del buffer[:]
+        self.write(buffer, serializer, instance, expand, include, exclude)
+        return bytes(buffer)
+
+    def write(
+            self, buffer, serializer, instance,
+            expand=None, include=None, exclude=None, context=None):
+        """Serialize and write an object into an existing buffer.
+
+        A new context is created for the call unless one is specified (such
+        as when writing a nested value).
+        """
+        if context is None:
+            context = serializer._context()
+        if isinstance(instance, collections.Iterable):
+            self._write_collection(
+                buffer, serializer, instance, expand, include, exclude, context)
+        elif not instance:
+            buffer += self._null
+        else:
+            serializer._assign_meta(instance)
+            plan = serializer._plan(expand, include, exclude)
+            if plan.batched:
+                (instance,), plan = batches.apply(serializer, [instance], plan)
+            self._write_planned(
+                buffer, serializer, instance, plan,
+                self._keys(plan), plan.href(serializer.router), context)
+
+    def _keys(self, plan):
+        return [self.dumps(field.name) + b':' for field in plan.fields]
+
+    def _write_collection(
+            self, buffer, serializer, values, expand, include, exclude,
+            context):
+        start = len(buffer)
+        buffer += b'['
+        instance = values
+        keys_by_plan = {}
+        last = None
+        count = 0
+        for value, current, plan, _, href in serializer._iter_planned(
+                values, expand, include, exclude):
+            if count:
+                buffer += b','
+            count += 1
+            if current is None:
+                buffer += self.dumps(value)
+                continue
+            if plan is not last:
+                last = plan
+                keys = keys_by_plan.get(plan)
+                if keys is None:
+                    keys = keys_by_plan[plan] = self._keys(plan)
+            self._write_planned(
+                buffer, current, value, plan, keys, href, context)
+        buffer += b']'
+        if serializer.expose_meta:
+            buffer[start:start] = b'{"items":'
+            buffer += b',"meta":'
+            buffer += self.dumps(serializer.collection_meta(instance, count))
+            buffer += b'}'
+
+    def _write_planned(
+            self, buffer, serializer, instance, plan, keys, href, context):
+        if not instance:
+            buffer += self._null
+            return
+        guard = context.guard
+        if guard is None:
+            self._write_object(
+                buffer, serializer, instance, plan, keys, href, context)
+            return
+        if not serializer.depth:
+            guard.top(instance)
+            self._write_object(
+                buffer, serializer, instance, plan, keys, href, context)
+        elif guard.enter(instance):
+            try:
+                self._write_object(
+                    buffer, serializer, instance, plan, keys, href, context)
+            finally:
+                guard.exit(instance)
+        else:
+            buffer += self.dumps(serializer._reference(instance, plan, href))
+            return
+        if guard.sized:
+            guard.written(len(buffer))
+
+    def _write_object(
+            self, buffer, serializer, instance, plan, keys, href, context):
+        if serializer.stats is not None:
+            serializer.stats.object(serializer.depth)
+        dumps = self.dumps
+        include_null = plan.include_null or serializer.include_null
+        identifier = plan.identifier
+        identifier_value = None
+        separator = b'{'
+        for field, key in zip(plan.fields, keys):
+            value = getattr(instance, field.name, _missing)
+            if value is _missing or (value is None and not include_null):
+                continue
+            buffer += separator
+            buffer += key
+            separator = b','
+            if field.strategy:
+                value = field.strategy(value)
+                buffer += dumps(value)
+                if field.name == identifier:
+                    identifier_value = value
+                continue
+            if field.name == identifier:
+                identifier_value = value
+            if value.__class__ in _scalars:
+                buffer += dumps(value)
+                continue
+            nested, nested_include = serializer._nested(field, value)
+            if nested is None:
+                buffer += dumps(value)
+            else:
+                nested_expand = field.expand
+                guard = context.guard
+                if guard is not None:
+                    nested_include, nested_expand = guard.nested(
+                        serializer.depth + 1, value, nested_include,
+                        nested_expand)
+                self.write(
+                    buffer, nested, value,
+                    expand=nested_expand, include=nested_include,
+                    context=context)
+        if href:
+            buffer += separator
+            buffer += b'"meta":{"href":'
+            buffer += dumps(href(identifier_value))
+            buffer += b'}'
+            separator = b','
+        buffer += b'}' if separator == b',' else b'{}'
+
+
+class _PackedWriter(JSONWriter):
+
+    """Write serialized objects directly into a buffer of a binary format.
+
+    Maps and arrays in MessagePack and CBOR are prefixed with their length,
+    which is not known until the values have been written (as missing and
+    null values are skipped), so the header is inserted once they have been.
+    """
+
+    charset = None
+    backends = None
+    preferred = ()
+
+    def __init__(self, backend=None, buffer=None):
+        if not backend:
+            backend = next(
+                name for name in self.preferred if name in self.backends)
+        self.backend = backend
+        self.dumps = self.backends[backend]
+        self._buffer = buffer
+        self._local = threading.local()
+        self._null = self.dumps(None)
+        self._items_key = self._map(2) + self.dumps('items')
+        self._meta_key = self.dumps('meta')
+        self._href_key = self._map(1) + self.dumps('href')
+
+    def _keys(self, plan):
+        return [self.dumps(field.name) for field in plan.fields]
+
+    def _write_collection(
+            self, buffer, serializer, values, expand, include, exclude,
+            context):
+        start = len(buffer)
+        instance = values
+        keys_by_plan = {}
+        last = None
+        count = 0
+        for value, current, plan, _, href in serializer._iter_planned(
+                values, expand, include, exclude):
+            count += 1
+            if current is None:
+                buffer += self.dumps(value)
+                continue
+            if plan is not last:
+                last = plan
+                keys = keys_by_plan.get(plan)
+                if keys is None:
+                    keys = keys_by_plan[plan] = self._keys(plan)
+            self._write_planned(
+                buffer, current, value, plan, keys, href, context)
+        if serializer.expose_meta:
+            buffer[start:start] = self._items_key + self._array(count)
+            buffer += self._meta_key
+            buffer += self.dumps(serializer.collection_meta(instance, count))
+        else:
+            buffer[start:start] = self._array(count)
+
+    def _write_object(
+            self, buffer, serializer, instance, plan, keys, href, context):
+        if serializer.stats is not None:
+            serializer.stats.object(serializer.depth)
+        dumps = self.dumps
+        include_null = plan.include_null or serializer.include_null
+        identifier = plan.identifier
+        identifier_value = None
+        start = len(buffer)
+        count = 0
+        for field, key in zip(plan.fields, keys):
+            value = getattr(instance, field.name, _missing)
+            if value is _missing or (value is None and not include_null):
+                continue
+            buffer += key
+            count += 1
+            if field.strategy:
+                value = field.strategy(value)
+                buffer += dumps(value)
+                if field.name == identifier:
+                    identifier_value = value
+                continue
+            if field.name == identifier:
+                identifier_value = value
+            if value.__class__ in _scalars:
+                buffer += dumps(value)
+                continue
+            nested, nested_include = serializer._nested(field, value)
+            if nested is None:
+                buffer += dumps(value)
+            else:
+                nested_expand = field.expand
+                guard = context.guard
+                if guard is not None:
+                    nested_include, nested_expand = guard.nested(
+                        serializer.depth + 1, value, nested_include,
+                        nested_expand)
+                self.write(
+                    buffer, nested, value,
+                    expand=nested_expand, include=nested_include,
+                    context=context)
+        if href:
+            buffer += self._meta_key
+            buffer += self._href_key
+            buffer += dumps(href(identifier_value))
+            count += 1
+        buffer[start:start] = self._map(count)
+
+
+class MessagePackWriter(_PackedWriter):
+
+    """Write serialized objects directly into a buffer of MessagePack bytes.
+
+    The msgpack package is used to encode values when it is installed,
+    otherwise a pure Python implementation is used.
+
+    Attributes:
+        backend (string): The name of the backend used to encode values
+            (msgpack or python), defaults to the fastest available
+
+    Usage:
+
+        .. code-block: python
+
+            writer = encoders.MessagePackWriter()
+            writer.encode(serializer, models)
+    """
+
+    mimetype = 'application/msgpack'
+    backends = msgpack_backends
+    preferred = ('msgpack', 'python')
+    _map = staticmethod(packers.msgpack_map)
+    _array = staticmethod(packers.msgpack_array)
+
+
+class CBORWriter(_PackedWriter):
+
+    """Write serialized objects directly into a buffer of CBOR bytes.
+
+    The cbor2 package is used to encode values when it is installed,
+    otherwise a pure Python implementation is used.
+
+    Attributes:
+        backend (string): The name of the backend used to encode values
+            (cbor2 or python), defaults to the fastest available
+
+    Usage:
+
+        .. code-block: python
+
+            writer = encoders.CBORWriter()
+            writer.encode(serializer, models)
+    """
+
+    mimetype = 'application/cbor'
+    backends = cbor_backends
+    preferred = ('cbor2', 'python')
+    _map = staticmethod(packers.cbor_map)
+    _array = staticmethod(packers.cbor_array)
+
+
+def _media_ranges(accept):
+    for media_range in accept.split(','):
+        params = media_range.split(';')
+        mimetype = params[0].strip().lower()
+        if not mimetype:
+            continue
+        quality = 1.0
+        for param in params[1:]:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        yield mimetype, quality
+
+
+def negotiate(accept, writers):
+    """Select the writer to use for the value of an Accept header.
+
+    The most specific media range that matches the mimetype of each writer
+    determines its quality, and the writer with the highest quality is used.
+    Writers earlier in the list are preferred when the qualities are equal,
+    and the first writer is used when none of them are acceptable.
+
+    Args:
+        accept (string): The value of the Accept header
+        writers (list): The writers that can be used
+
+    Returns:
+        The selected writer
+    """
+    if not accept:
+        return writers[0]
+    ranges = list(_media_ranges(accept))
+    selected, selected_quality = writers[0], 0.0
+    for writer in writers:
+        type_, _, subtype = writer.mimetype.partition('/')
+        specificity, quality = -1, 0.0
+        for mimetype, range_quality in ranges:
+            if mimetype == writer.mimetype:
+                current = 2
+            elif mimetype == type_ + '/*':
+                current = 1
+            elif mimetype == '*/*':
+                current = 0
+            else:
+                continue
+            if current > specificity:
+                specificity, quality = current, range_quality
+        if quality > selected_quality:
+            selected, selected_quality = writer, quality
+    return selected
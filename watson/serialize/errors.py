@@ -44,3 +44,80 @@ class Base(RuntimeError):
         self.developer_message = '{}: {}'.format(
             self.__class__.__name__,
             developer_message or message)
+
+
+class LimitExceeded(Base):
+    """Raised when the output of a serializer would exceed its limits.
+
+    See watson.serialize.limits.Limits.
+    """
+
+    def __init__(self, limit, maximum):
+        """Initialize the error.
+
+        Args:
+            limit (string): The name of the limit that was exceeded
+            maximum (int): The value of the limit
+        """
+        super(LimitExceeded, self).__init__(
+            code=1,
+            message='The requested response is too large',
+            status_code=413,
+            developer_message='The {} limit of {} was exceeded'.format(
+                limit, maximum))
+        self.limit = limit
+        self.maximum = maximum
+
+
+class InvalidCursor(Base):
+    """Raised when the key of a cursor cannot be converted to the type of the
+    attribute it paginates by.
+
+    See watson.serialize.pagination.Cursor.
+    """
+
+    def __init__(self, name, value):
+        """Initialize the error.
+
+        Args:
+            name (string): The name of the argument (after or before)
+            value (string): The value that could not be converted
+        """
+        super(InvalidCursor, self).__init__(
+            code=3,
+            message='The requested page is invalid',
+            status_code=400,
+            developer_message='Invalid {} value {!r}'.format(name, value))
+
+
+class Invalid(Base):
+    """Raised when input cannot be deserialized.
+
+    See watson.serialize.deserializers.Deserializer.
+
+    Usage:
+
+        .. code-block: python
+
+            # {'code': '4222', 'message': 'The request contains invalid values',
+            #  'developer_message': 'Invalid: 1 invalid value',
+            #  'errors': {'/name': 'This field is required.'}}
+    """
+
+    class Meta(object):
+        attributes = Base.Meta.attributes + ('errors',)
+
+    def __init__(self, errors):
+        """Initialize the error.
+
+        Args:
+            errors (dict): The error message of each invalid value, keyed by
+                its JSON pointer
+        """
+        super(Invalid, self).__init__(
+            code=2,
+            message='The request contains invalid values',
+            status_code=422,
+            developer_message='{} invalid value{}'.format(
+                len(errors), '' if len(errors) == 1 else 's'))
+        self.errors = errors
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+from collections import abc as collections
+import hashlib
+from watson.db import utils
+from watson.serialize import pagination, queries
+
+__all__ = ['compute', 'matches']
+
+
+def _signature(plan):
+    # strategies are excluded as their repr differs between processes
+    return (
+        plan.meta.__module__,
+        plan.meta.__qualname__,
+        tuple((field.name, field.include, field.expand) for field in plan.fields),
+        plan.include_null,
+        plan.route,
+        plan.expose_meta)
+
+
+def _version(serializer, plans, value, expand, include, exclude):
+    meta = value.Meta
+    plan = plans.get(meta)
+    if plan is None:
+        if meta is serializer.meta:
+            plan = serializer._collection_plan(expand, include, exclude)[0]
+        else:
+            plan = serializer._sibling(meta)._collection_plan(
+                expand, include, exclude)[0]
+        plans[meta] = plan
+    if not plan.version:
+        return None
+    return (
+        plan,
+        getattr(value, plan.identifier, None),
+        getattr(value, plan.version, None))
+
+
+def _query_versions(serializer, query, expand, include, exclude):
+    model = queries.entity(query)
+    if model is None or not hasattr(model, 'Meta'):
+        return None, None
+    serializer._assign_meta(model)
+    plan = serializer._collection_plan(expand, include, exclude)[0]
+    columns = [
+        getattr(model, name, None) for name in (plan.identifier, plan.version)
+        if name]
+    if len(columns) != 2 or not all(
+            hasattr(column, 'expression') for column in columns):
+        return None, None
+    return plan, query.with_entities(*columns).all()
+
+
+def compute(serializer, instance, expand=None, include=None, exclude=None, *parts):
+    """Compute a strong ETag for the output of a serializer.
+
+    The ETag is derived from the plan that each object will be serialized
+    with (and therefore the requested include/expand/exclude values) along
+    with the identifier and `version` attribute of each object, so that the
+    objects do not need to be serialized. SQLAlchemy queries only select the
+    identifier and version columns.
+
+    The version of an object should change whenever its output does,
+    including the output of any nested values.
+
+    Args:
+        serializer (watson.serialize.serializers.Instance): The serializer
+        instance (mixed): The object, iterable, Pagination, Cursor or query
+        expand (list): Attributes to be expanded on the object
+        include (list): Attributes to be included in the output
+        exclude (list): Attributes to be excluded from the output
+        parts (mixed): Anything else that affects the output, such as the
+            mimetype of the encoder
+
+    Returns:
+        string: The quoted ETag, or None if a Meta class does not define a
+            version (or the instance cannot be versioned without consuming it)
+    """
+    key = [parts]
+    if isinstance(instance, utils.Pagination):
+        key.append((instance.page, instance.limit, instance.total))
+    elif isinstance(instance, pagination.Cursor):
+        key.append((instance.after, instance.before, instance.limit, instance.total))
+    if hasattr(instance, 'Meta'):
+        serializer._assign_meta(instance)
+        plan = serializer._plan(expand, include, exclude)
+        if not plan.version:
+            return None
+        key.append((
+            _signature(plan),
+            getattr(instance, plan.identifier, None),
+            getattr(instance, plan.version, None)))
+    elif queries.entity(instance) is not None:
+        plan, rows = _query_versions(
+            serializer, instance, expand, include, exclude)
+        if plan is None or not plan.version:
+            return None
+        key.append((_signature(plan),))
+        key.append(tuple((0,) + tuple(row) for row in rows))
+    elif isinstance(instance, collections.Iterable) and not isinstance(
+            instance, collections.Iterator):
+        # each plan is only added to the key once, and referred to by index
+        plans, indexes, signatures, versions = {}, {}, [], []
+        for value in instance:
+            if not hasattr(value, 'Meta'):
+                versions.append(value)
+                continue
+            serializer._assign_meta(value)
+            version = _version(
+                serializer, plans, value, expand, include, exclude)
+            if version is None:
+                return None
+            index = indexes.get(id(version[0]))
+            if index is None:
+                index = indexes[id(version[0])] = len(signatures)
+                signatures.append(_signature(version[0]))
+            versions.append((index,) + version[1:])
+        key.append(tuple(signatures))
+        key.append(tuple(versions))
+    else:
+        return None
+    return '"{}"'.format(hashlib.sha1(repr(key).encode('utf-8')).hexdigest())
+
+
+def matches(header, etag):
+    """Determine whether an If-None-Match header matches an ETag.
+
+    Weak comparison is used, as required for If-None-Match.
+
+    Args:
+        header (string): The value of the If-None-Match header
+        etag (string): The quoted ETag of the current representation
+
+    Returns:
+        boolean
+    """
+    if not header or not etag:
+        return False
+    if header.strip() == '*':
+        return True
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+__all__ = ['Included']
+
+
+class Included(object):
+
+    """The nested objects of a normalized output.
+
+    Each distinct object (by class and identifier) is serialized once and
+    stored here, while the output only contains a reference to it. An object
+    that is nested with different plans (such as different includes) has the
+    attributes of each merged together.
+
+    Attributes:
+        objects (dict): The serialized objects, keyed by the `type` of their
+            Meta class (or the qualified name of their class) and then their
+            identifier (as a string, as the keys of a JSON object must be)
+        seen (set): The plans that each object has been serialized with
+
+    Usage:
+
+        .. code-block: python
+
+            class Meta(object):
+                attributes = ('id', 'name')
+                type = 'Author'
+
+            serializer.normalized = True
+            serializer(articles, expand=['author(*)'])
+            # {'items': [{'id': 1, 'author': {'id': 5}}, ...],
+            #  'meta': {...},
+            #  'included': {'Author': {'5': {'id': 5, 'name': '...'}}}}
+    """
+
+    __slots__ = ('objects', 'seen')
+
+    def __init__(self):
+        self.objects = {}
+        self.seen = set()
+
+    def add(self, plan, identifier):
+        """Record that an object is about to be serialized with a plan.
+
+        Returns:
+            boolean: False if the object has already been serialized with the
+                plan, and does not need to be serialized again
+        """
+        key = (plan, identifier)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
+
+    def set(self, name, identifier, obj):
+        """Store a serialized object.
+
+        Args:
+            name (string): The type name of the object
+            identifier (mixed): The identifier of the object
+            obj (dict): The serialized object
+        """
+        objects = self.objects.get(name)
+        if objects is None:
+            objects = self.objects[name] = {}
+        key = str(identifier)
+        existing = objects.get(key)
+        if existing is not None:
+            # serialized objects may be shared by a fragment cache, so they
+            # are copied rather than updated in place
+            obj = dict(existing, **obj)
+        objects[key] = obj
+
+    def __bool__(self):
+        return bool(self.objects)
+
+    def __len__(self):
+        return sum(len(objects) for objects in self.objects.values())
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+import collections
+import logging
+import time
+from watson.common import imports
+
+__all__ = ['Stats', 'Header', 'Log']
+
+
+class Timed(object):
+
+    """Wraps a strategy to record the cumulative time spent within it.
+
+    Timed strategies compare and hash equal to the strategy they wrap, so
+    instrumented plans share fragments and compiled functions with the plans
+    they were derived from.
+    """
+
+    __slots__ = ('strategy', 'name', 'totals')
+
+    def __init__(self, strategy, name, totals):
+        self.strategy = strategy
+        self.name = name
+        self.totals = totals
+
+    def __call__(self, value):
+        start = time.perf_counter()
+        try:
+            return self.strategy(value)
+        finally:
+            self.totals[self.name] += time.perf_counter() - start
+
+    def __eq__(self, other):
+        return self.strategy == getattr(other, 'strategy', other)
+
+    def __hash__(self):
+        return hash(self.strategy)
+
+
+class Stats(object):
+
+    """Records where a serializer spends its time.
+
+    Instrumentation is disabled by default (the `stats` attribute of a
+    serializer is None), in which case none of these hooks are called. When
+    enabled, the stats are shared with every nested serializer. Stats are not
+    thread safe, so a new instance should be used for each request. Strategies
+    applied within worker processes are not recorded.
+
+    Attributes:
+        calls (int): The number of top level serializer calls
+        objects (int): The number of objects serialized
+        depth (int): The deepest level of nesting serialized
+        timings (dict): The cumulative time in seconds spent in each phase
+            (serialize, plan, fields, nested, href, collection_meta)
+        strategies (dict): The cumulative time in seconds spent in each strategy
+        hits (collections.Counter): Cache hits for plans and fragments
+        misses (collections.Counter): Cache misses for plans and fragments
+
+    Usage:
+
+        .. code-block: python
+
+            serializer = serializers.Instance(router)
+            serializer.stats = instrumentation.Stats()
+            serializer(query)
+            serializer.stats.as_dict()
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.objects = 0
+        self.depth = 0
+        self.timings = collections.defaultdict(float)
+        self.strategies = collections.defaultdict(float)
+        self.hits = collections.Counter()
+        self.misses = collections.Counter()
+        self._plans = {}
+
+    def add(self, phase, elapsed):
+        """Add the time spent in a phase.
+
+        Args:
+            phase (string): The name of the phase
+            elapsed (float): The time in seconds
+        """
+        self.timings[phase] += elapsed
+
+    def timed(self, phase, func, *args):
+        """Call a function and add the time spent within it to a phase.
+        """
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[phase] += time.perf_counter() - start
+
+    def object(self, depth):
+        """Record that an object was serialized at a certain depth.
+        """
+        self.objects += 1
+        if depth > self.depth:
+            self.depth = depth
+
+    def instrument(self, plan):
+        """Derive a plan with strategies that record their time.
+
+        Batch strategies are timed once per call, rather than per value.
+
+        Args:
+            plan (watson.serialize.plans.Plan): The plan to instrument
+
+        Returns:
+            watson.serialize.plans.Plan
+        """
+        instrumented = self._plans.get(plan)
+        if instrumented is None:
+            meta = plan.meta.__qualname__
+            if meta.endswith('.Meta'):
+                meta = meta[:-5]
+            fields = []
+            for field in plan.fields:
+                name = '{}.{}'.format(meta, field.name)
+                if field.strategy:
+                    field = field._replace(strategy=Timed(
+                        field.strategy, name, self.strategies))
+                elif field.batch:
+                    field = field._replace(batch=Timed(
+                        field.batch, name, self.strategies))
+                fields.append(field)
+            instrumented = self._plans[plan] = plan._replace(
+                fields=tuple(fields))
+        return instrumented
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'objects': self.objects,
+            'depth': self.depth,
+            'timings': dict(self.timings),
+            'strategies': dict(self.strategies),
+            'hits': dict(self.hits),
+            'misses': dict(self.misses),
+        }
+
+    def server_timing(self):
+        """Format the timings as the value of a Server-Timing header.
+
+        Returns:
+            string
+        """
+        return ', '.join(
+            '{};dur={:.3f}'.format(phase, elapsed * 1000)
+            for phase, elapsed in sorted(self.timings.items()))
+
+    def __repr__(self):
+        return '<{0} calls:{1} objects:{2} depth:{3}>'.format(
+            imports.get_qualified_name(self),
+            self.calls,
+            self.objects,
+            self.depth)
+
+
+class Header(object):
+
+    """Expose the stats of a request as a response header.
+
+    Usage:
+
+        .. code-block: python
+
+            @serialize(stats=instrumentation.Header())
+            def GET(self):
+                ...
+    """
+
+    def __init__(self, name='Server-Timing'):
+        self.name = name
+
+    def __call__(self, controller, stats):
+        controller.response.headers.add(
+            self.name, stats.server_timing(), replace=True)
+
+
+class Log(object):
+
+    """Emit the stats of a request as a log record.
+
+    The complete stats are attached to the record as `serialize_stats`.
+    """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def __call__(self, controller, stats):
+        self.logger.log(
+            self.level,
+            '%s serialized %d objects in %.3fms',
+            imports.get_qualified_name(controller),
+            stats.objects,
+            stats.timings.get('serialize', 0) * 1000,
+            extra={'serialize_stats': stats.as_dict()})
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+import collections
+import threading
+from watson.serialize import errors
+
+__all__ = ['Limits', 'Guard', 'ThreadedGuard']
+
+_scalars = frozenset((str, int, float, bool, type(None)))
+
+
+class Limits(collections.namedtuple(
+        'Limits', ('depth', 'items', 'fanout', 'size'))):
+
+    """The limits placed upon the output of a serializer.
+
+    Limits can be set globally on a serializer, and a Meta class can define
+    its own `limits` to tighten the depth and fanout of nested values of that
+    model (the lower of the two applies). Unset limits are not enforced.
+
+    Attributes:
+        depth (int): The deepest level of nesting that will be expanded,
+            nested values below it are output as identifier only references
+        items (int): The maximum number of objects in the output
+        fanout (int): The maximum number of items in a nested list
+        size (int): The maximum size of the output in bytes, estimated from
+            the scalar values of each object (or measured exactly when
+            written by a watson.serialize.encoders.JSONWriter)
+
+    Usage:
+
+        .. code-block: python
+
+            serializer.limits = limits.Limits(depth=3, items=10000)
+
+            class Meta(object):
+                attributes = ('id', 'children')
+                limits = limits.Limits(fanout=100)
+    """
+
+    __slots__ = ()
+
+
+Limits.__new__.__defaults__ = (None, None, None, None)
+
+
+class Guard(object):
+
+    """Enforces the limits of a serializer for a single call.
+
+    A guard is shared by a serializer and all of its nested serializers. It
+    tracks the objects that are currently being serialized, so that an object
+    nested within itself is output as a reference rather than recursing
+    forever.
+
+    Exceeding the items, fanout or size limits will raise a
+    watson.serialize.errors.LimitExceeded error.
+
+    Attributes:
+        limits (Limits): The global limits
+        objects (int): The number of objects serialized
+        size (int): The estimated size of the output in bytes
+        root (mixed): The top level object currently being serialized
+        path (set): The identities of the nested objects currently being
+            serialized
+        sized (boolean): Whether the size of the output is limited
+    """
+
+    __slots__ = (
+        'limits', 'objects', 'size', 'root', 'path', 'sized', '_items',
+        '_limits')
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.objects = 0
+        self.size = 0
+        self.root = None
+        self.path = set()
+        self.sized = limits.size is not None
+        self._items = limits.items
+        self._limits = {}
+
+    def top(self, instance):
+        """Record that a top level object is about to be serialized.
+
+        Top level objects cannot be nested within anything, so rather than
+        being added to the path they are only compared against nested objects.
+        """
+        self.root = instance
+        self.objects += 1
+        if self._items is not None and self.objects > self._items:
+            raise errors.LimitExceeded('items', self._items)
+
+    def enter(self, instance):
+        """Record that a nested object is about to be serialized.
+
+        Returns:
+            boolean: False if the object is already being serialized, in
+                which case it should be output as a reference
+        """
+        path = self.path
+        key = id(instance)
+        if key in path or instance is self.root:
+            return False
+        path.add(key)
+        self.objects += 1
+        if self._items is not None and self.objects > self._items:
+            raise errors.LimitExceeded('items', self._items)
+        return True
+
+    def exit(self, instance):
+        self.path.discard(id(instance))
+
+    def _limit(self, meta):
+        limits = self._limits.get(meta)
+        if limits is None:
+            limits = self.limits
+            own = getattr(meta, 'limits', None)
+            if own is not None:
+                limits = limits._replace(
+                    depth=_lower(limits.depth, own.depth),
+                    fanout=_lower(limits.fanout, own.fanout))
+            self._limits[meta] = limits
+        return limits
+
+    def nested(self, depth, value, include, expand=None):
+        """Check the limits of a nested value before it is serialized.
+
+        Args:
+            depth (int): The level of nesting of the value
+            value (mixed): The nested object or list
+            include (tuple): The attributes that would be included
+            expand (tuple): The attributes that would be expanded
+
+        Returns:
+            tuple: (include, expand), only the identifier will be included
+                (and nothing expanded) when the value is nested too deeply
+        """
+        is_list = isinstance(value, list)
+        item = (value[0] if value else None) if is_list else value
+        meta = getattr(item, 'Meta', None)
+        limits = self._limit(meta)
+        if is_list and limits.fanout is not None and len(value) > limits.fanout:
+            raise errors.LimitExceeded('fanout', limits.fanout)
+        if limits.depth is not None and depth > limits.depth and meta is not None:
+            return (meta.attributes[0],), ()
+        return include, expand
+
+    def add(self, obj):
+        """Add the estimated size of a serialized object to the total.
+        """
+        if self.sized:
+            self.written(self.size + _estimate(obj))
+
+    def written(self, size):
+        """Check the size of the output written so far.
+
+        Args:
+            size (int): The size of the output in bytes
+        """
+        self.size = size
+        maximum = self.limits.size
+        if maximum is not None and size > maximum:
+            raise errors.LimitExceeded('size', maximum)
+
+
+class ThreadedGuard(Guard):
+
+    """A guard for serializers that are called from several threads at once.
+
+    Each thread tracks the objects that it is currently serializing, so that
+    an object shared between threads is not mistaken for a cycle.
+    """
+
+    __slots__ = ('_local',)
+
+    def __init__(self, limits):
+        self._local = threading.local()
+        super(ThreadedGuard, self).__init__(limits)
+
+    @property
+    def root(self):
+        return getattr(self._local, 'root', None)
+
+    @root.setter
+    def root(self, instance):
+        self._local.root = instance
+
+    @property
+    def path(self):
+        path = getattr(self._local, 'path', None)
+        if path is None:
+            path = self._local.path = set()
+        return path
+
+    @path.setter
+    def path(self, path):
+        self._local.path = path
+
+
+def _lower(current, value):
+    if current is None:
+        return value
+    if value is None:
+        return current
+    return min(current, value)
+
+
+def _estimate(obj):
+    # the size of the scalar values as JSON, nested objects are estimated
+    # separately when they are serialized
+    size = 2
+    for key, value in obj.items():
+        size += len(key) + 4
+        cls = value.__class__
+        if cls is str:
+            size += len(value)
+        elif cls in _scalars:
+            size += len(str(value))
+        elif key == 'meta' and isinstance(value, dict):
+            size += _estimate(value)
+    return size
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""Pure Python MessagePack and CBOR encoders.
+
+These are used by the binary writers in watson.serialize.encoders when the
+msgpack or cbor2 packages are not installed. Only the types that the
+serializer outputs are supported (None, booleans, numbers, strings, bytes,
+lists, tuples and dicts).
+"""
+import struct
+
+__all__ = [
+    'msgpack', 'msgpack_map', 'msgpack_array', 'cbor', 'cbor_map',
+    'cbor_array']
+
+_pack_b = struct.Struct('>b').pack
+_pack_h = struct.Struct('>h').pack
+_pack_i = struct.Struct('>i').pack
+_pack_q = struct.Struct('>q').pack
+_pack_B = struct.Struct('>B').pack
+_pack_H = struct.Struct('>H').pack
+_pack_I = struct.Struct('>I').pack
+_pack_Q = struct.Struct('>Q').pack
+_pack_d = struct.Struct('>d').pack
+
+
+def _unsupported(value):
+    return TypeError('Object of type {} is not serializable'.format(
+        value.__class__.__name__))
+
+
+# MessagePack
+
+def _msgpack_int(value):
+    if 0 <= value < 0x80:
+        return bytes((value,))
+    if -0x20 <= value < 0:
+        return bytes((value & 0xff,))
+    if value > 0:
+        if value < 0x100:
+            return b'\xcc' + _pack_B(value)
+        if value < 0x10000:
+            return b'\xcd' + _pack_H(value)
+        if value < 0x100000000:
+            return b'\xce' + _pack_I(value)
+        if value < 0x10000000000000000:
+            return b'\xcf' + _pack_Q(value)
+    else:
+        if value >= -0x80:
+            return b'\xd0' + _pack_b(value)
+        if value >= -0x8000:
+            return b'\xd1' + _pack_h(value)
+        if value >= -0x80000000:
+            return b'\xd2' + _pack_i(value)
+        if value >= -0x8000000000000000:
+            return b'\xd3' + _pack_q(value)
+    raise OverflowError('Integer value out of range')
+
+
+def _msgpack_str(value):
+    value = value.encode('utf-8')
+    length = len(value)
+    if length < 0x20:
+        return bytes((0xa0 | length,)) + value
+    if length < 0x100:
+        return b'\xd9' + _pack_B(length) + value
+    if length < 0x10000:
+        return b'\xda' + _pack_H(length) + value
+    return b'\xdb' + _pack_I(length) + value
+
+
+def _msgpack_bin(value):
+    length = len(value)
+    if length < 0x100:
+        return b'\xc4' + _pack_B(length) + value
+    if length < 0x10000:
+        return b'\xc5' + _pack_H(length) + value
+    return b'\xc6' + _pack_I(length) + value
+
+
+def msgpack_array(length):
+    """The header of a MessagePack array with `length` items.
+    """
+    if length < 0x10:
+        return bytes((0x90 | length,))
+    if length < 0x10000:
+        return b'\xdc' + _pack_H(length)
+    return b'\xdd' + _pack_I(length)
+
+
+def msgpack_map(length):
+    """The header of a MessagePack map with `length` pairs.
+    """
+    if length < 0x10:
+        return bytes((0x80 | length,))
+    if length < 0x10000:
+        return b'\xde' + _pack_H(length)
+    return b'\xdf' + _pack_I(length)
+
+
+_msgpack_constants = {None: b'\xc0', False: b'\xc2', True: b'\xc3'}
+
+
+def msgpack(value):
+    """Encode a value as MessagePack.
+
+    Args:
+        value (mixed): The value to encode
+
+    Returns:
+        bytes
+    """
+    class_ = value.__class__
+    if class_ is str:
+        return _msgpack_str(value)
+    if class_ is int:
+        return _msgpack_int(value)
+    if value is None or class_ is bool:
+        return _msgpack_constants[value]
+    if class_ is float:
+        return b'\xcb' + _pack_d(value)
+    if isinstance(value, dict):
+        parts = [msgpack_map(len(value))]
+        for key, item in value.items():
+            parts.append(msgpack(key))
+            parts.append(msgpack(item))
+        return b''.join(parts)
+    if isinstance(value, (list, tuple)):
+        parts = [msgpack_array(len(value))]
+        parts.extend(msgpack(item) for item in value)
+        return b''.join(parts)
+    if isinstance(value, (bytes, bytearray)):
+        return _msgpack_bin(value)
+    if isinstance(value, bool):
+        return _msgpack_constants[bool(value)]
+    if isinstance(value, int):
+        return _msgpack_int(int(value))
+    if isinstance(value, str):
+        return _msgpack_str(str(value))
+    if isinstance(value, float):
+        return b'\xcb' + _pack_d(value)
+    raise _unsupported(value)
+
+
+# CBOR (RFC 8949)
+
+def _cbor_head(major, value):
+    major <<= 5
+    if value < 24:
+        return bytes((major | value,))
+    if value < 0x100:
+        return bytes((major | 24, value))
+    if value < 0x10000:
+        return bytes((major | 25,)) + _pack_H(value)
+    if value < 0x100000000:
+        return bytes((major | 26,)) + _pack_I(value)
+    if value < 0x10000000000000000:
+        return bytes((major | 27,)) + _pack_Q(value)
+    raise OverflowError('Integer value out of range')
+
+
+def _cbor_int(value):
+    if value >= 0:
+        if value < 24:
+            return bytes((value,))
+        return _cbor_head(0, value)
+    return _cbor_head(1, -1 - value)
+
+
+def _cbor_str(value):
+    value = value.encode('utf-8')
+    return _cbor_head(3, len(value)) + value
+
+
+def cbor_array(length):
+    """The header of a CBOR array with `length` items.
+    """
+    return _cbor_head(4, length)
+
+
+def cbor_map(length):
+    """The header of a CBOR map with `length` pairs.
+    """
+    return _cbor_head(5, length)
+
+
+_cbor_constants = {None: b'\xf6', False: b'\xf4', True: b'\xf5'}
+
+
+def cbor(value):
+    """Encode a value as CBOR.
+
+    Args:
+        value (mixed): The value to encode
+
+    Returns:
+        bytes
+    """
+    class_ = value.__class__
+    if class_ is str:
+        return _cbor_str(value)
+    if class_ is int:
+        return _cbor_int(value)
+    if value is None or class_ is bool:
+        return _cbor_constants[value]
+    if class_ is float:
+        return b'\xfb' + _pack_d(value)
+    if isinstance(value, dict):
+        parts = [_cbor_head(5, len(value))]
+        for key, item in value.items():
+            parts.append(cbor(key))
+            parts.append(cbor(item))
+        return b''.join(parts)
+    if isinstance(value, (list, tuple)):
+        parts = [_cbor_head(4, len(value))]
+        parts.extend(cbor(item) for item in value)
+        return b''.join(parts)
+    if isinstance(value, (bytes, bytearray)):
+        return _cbor_head(2, len(value)) + bytes(value)
+    if isinstance(value, bool):
+        return _cbor_constants[bool(value)]
+    if isinstance(value, int):
+        return _cbor_int(int(value))
+    if isinstance(value, str):
+        return _cbor_str(str(value))
+    if isinstance(value, float):
+        return b'\xfb' + _pack_d(value)
+    raise _unsupported(value)
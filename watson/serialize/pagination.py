@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+from urllib import parse
+import sqlalchemy
+from watson.common import imports
+from watson.serialize import errors, queries
+
+__all__ = ['Cursor', 'estimate', 'totals']
+
+totals = ('count', 'estimate')
+
+_estimates = {
+    'postgresql': (
+        'SELECT reltuples FROM pg_class '
+        'WHERE oid = CAST(:table AS regclass)'),
+    'mysql': (
+        'SELECT table_rows FROM information_schema.tables '
+        'WHERE table_schema = DATABASE() AND table_name = :table'),
+}
+_estimates['mariadb'] = _estimates['mysql']
+
+
+def estimate(query):
+    """Estimate the number of rows in the table that a query selects from.
+
+    The estimate is read from the statistics the database keeps about the
+    table, so it is constant time but ignores any filters on the query. Only
+    PostgreSQL and MySQL are supported.
+
+    Args:
+        query (sqlalchemy.orm.Query): The query to estimate
+
+    Returns:
+        int: The estimated number of rows, or None if it is not available
+    """
+    model = queries.entity(query)
+    if model is None:
+        return None
+    dialect = query.session.get_bind().dialect.name
+    statement = _estimates.get(dialect)
+    if statement is None:
+        return None
+    table = sqlalchemy.inspect(model).local_table
+    value = query.session.execute(
+        sqlalchemy.text(statement), {'table': table.name}).scalar()
+    if value is None or value < 0:
+        return None
+    return int(value)
+
+
+class Cursor(object):
+
+    """Keyset (cursor) pagination for SQLAlchemy queries.
+
+    Rather than skipping over `(page - 1) * limit` rows, each page is selected
+    relative to the identifier of the last (or first) object of the previous
+    page, so deep pages cost the same as the first one. One more row than the
+    limit is fetched to determine whether there is a next page, and the total
+    is not counted unless requested.
+
+    The query is ordered by the key, replacing any existing ordering. Keys
+    from the query string are converted to the type of the key, raising a
+    watson.serialize.errors.InvalidCursor error if they cannot be.
+
+    Attributes:
+        query (sqlalchemy.orm.Query): The query to be paginated
+        key (sqlalchemy.orm.attributes.InstrumentedAttribute): The unique,
+            ordered attribute to paginate by, defaults to the primary key
+        after (mixed): Retrieve the objects after this key
+        before (mixed): Retrieve the objects before this key
+        limit (int): The maximum number of objects on a page
+        totals (mixed): None to skip the total, 'count' to count it, 'estimate'
+            to estimate it from the database statistics, or a callable that
+            receives the query
+        items (list): The objects on the page
+        has_next (boolean): Whether or not there is a page after this one
+        has_previous (boolean): Whether or not there is a page before this one
+
+    Usage:
+
+        .. code-block:: python
+
+            @serialize
+            def GET(self):
+                return pagination.Cursor(
+                    self.repository.query,
+                    after=self.request.get.get('after'),
+                    before=self.request.get.get('before'))
+            # {'items': [...],
+            #  'meta': {'limit': 20, 'total': None, 'href': '/models',
+            #           'next': '/models?after=20'}}
+    """
+
+    def __init__(
+            self, query, after=None, before=None, limit=20, key=None,
+            totals=None):
+        if key is None:
+            model = queries.entity(query)
+            mapper = sqlalchemy.inspect(model)
+            key = getattr(
+                model, mapper.get_property_by_column(mapper.primary_key[0]).key)
+        self.query = query
+        self.key = key
+        self.limit = limit
+        self.totals = totals
+        self.after = self._coerce('after', after)
+        self.before = self._coerce('before', before)
+        self._total = None
+        self._counted = False
+        self.__prepare()
+
+    @property
+    def name(self):
+        """The name of the key attribute on the objects.
+        """
+        return self.key.key
+
+    @property
+    def next(self):
+        """The key to retrieve the next page with.
+
+        Returns:
+            mixed: None if there is no next page
+        """
+        if self.has_next and self.items:
+            return getattr(self.items[-1], self.name)
+        return None
+
+    @property
+    def previous(self):
+        """The key to retrieve the previous page with.
+
+        Returns:
+            mixed: None if there is no previous page
+        """
+        if self.has_previous and self.items:
+            return getattr(self.items[0], self.name)
+        return None
+
+    @property
+    def total(self):
+        """The total number of objects, depending on `totals`.
+
+        Returns:
+            int: None if the total is skipped or cannot be estimated
+        """
+        if not self._counted:
+            self._counted = True
+            if self.totals == 'count':
+                self._total = self.query.order_by(None).count()
+            elif self.totals == 'estimate':
+                self._total = estimate(self.query)
+            elif callable(self.totals):
+                self._total = self.totals(self.query)
+        return self._total
+
+    def href(self, path, **params):
+        """Append the cursor parameters to a path.
+
+        Args:
+            path (string): The path of the collection
+            params (mixed): The cursor parameters, None values are ignored
+
+        Returns:
+            string
+        """
+        params = [(key, value) for key, value in params.items() if value is not None]
+        if not params:
+            return path
+        return '{}?{}'.format(path, parse.urlencode(params))
+
+    def _coerce(self, name, value):
+        # values from the query string are strings, which the database may
+        # not compare with the key as expected
+        if value is None or not isinstance(value, str):
+            return value
+        try:
+            python_type = self.key.type.python_type
+        except (AttributeError, NotImplementedError):  # pragma: no cover
+            return value
+        if python_type is str:
+            return value
+        try:
+            return python_type(value)
+        except (ValueError, TypeError):
+            raise errors.InvalidCursor(name, value)
+
+    # Internals
+
+    def __bool__(self):
+        return True if self.items else False
+
+    def __iter__(self):
+        for result in self.items:
+            yield result
+
+    def __len__(self):
+        return len(self.items)
+
+    def __prepare(self):
+        key, limit = self.key, self.limit
+        query = self.query.order_by(None)
+        if self.before is not None and self.after is None:
+            items = query.filter(key < self.before).order_by(
+                key.desc()).limit(limit + 1).all()
+            self.has_previous = len(items) > limit
+            self.has_next = True
+            items = items[:limit]
+            items.reverse()
+        else:
+            if self.after is not None:
+                query = query.filter(key > self.after)
+            items = query.order_by(key).limit(limit + 1).all()
+            self.has_next = len(items) > limit
+            self.has_previous = self.after is not None
+            items = items[:limit]
+        self.items = items
+
+    def __repr__(self):
+        return '<{0} after:{1} before:{2} limit:{3}>'.format(
+            imports.get_qualified_name(self),
+            self.after, self.before, self.limit)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+from concurrent import futures
+import functools
+
+__all__ = ['serialize', 'apply_strategies', 'Detached', 'original']
+
+
+class Missing(object):
+    """Marks an attribute that does not exist on an object sent to a worker.
+    """
+
+
+def _applied(value):
+    return value
+
+
+def apply_strategies(meta, names, include_null, rows):
+    """Apply the strategies from a Meta class to rows of detached values.
+
+    This is executed within the worker processes, so only the Meta class (which
+    is pickled by reference) and the plain values are sent to it.
+
+    Args:
+        meta (class): The Meta class containing the strategies
+        names (tuple): The names of the attributes in each row
+        include_null (boolean): Whether or not None values will be serialized
+        rows (list): A list of tuples containing the values for each attribute
+
+    Returns:
+        list: The rows with the strategies applied
+    """
+    strategies = [meta.strategies[name] for name in names]
+    output = []
+    for row in rows:
+        output.append(tuple(
+            value if value is Missing or (value is None and not include_null)
+            else strategy(value)
+            for strategy, value in zip(strategies, row)))
+    return output
+
+
+class Detached(object):
+
+    """An object with values that have already been converted by a worker.
+
+    Any attribute that was not sent to the worker is retrieved from the
+    original object.
+    """
+
+    __slots__ = ('_instance', '_values')
+
+    def __init__(self, instance, values):
+        self._instance = instance
+        self._values = values
+
+    def __getattr__(self, name):
+        values = self._values
+        if name in values:
+            value = values[name]
+            if value is Missing:
+                raise AttributeError(name)
+            return value
+        return getattr(self._instance, name)
+
+
+def original(value):
+    """Retrieve the object that a Detached object was created from.
+
+    Args:
+        value (mixed): The object, which is returned as is if not detached
+    """
+    while value.__class__ is Detached:
+        value = value._instance
+    return value
+
+
+def _detached_plan(serializer, plan):
+    key = ('detached', plan)
+    detached = serializer.plan_cache.get(key)
+    if detached is None:
+        detached = serializer.plan_cache.set(key, plan._replace(fields=tuple(
+            field._replace(strategy=_applied) if field.strategy else field
+            for field in plan.fields)))
+    return detached
+
+
+def _map_processes(serializer, chunks, plan, rows, context):
+    names = tuple(field.name for field in plan.fields if field.strategy)
+    if not names or plan.batched:
+        # batch strategies are applied per chunk within the calling process
+        for chunk in chunks:
+            yield serializer._serialize_chunk(chunk, plan, context, rows)
+        return
+    include_null = bool(plan.include_null or serializer.include_null)
+    pending = []
+    for chunk in chunks:
+        payload = [
+            tuple(getattr(value, name, Missing) for name in names)
+            for value in chunk if rows or hasattr(value, 'Meta')]
+        pending.append((chunk, serializer.executor.submit(
+            apply_strategies, plan.meta, names, include_null, payload)))
+    detached_plan = _detached_plan(serializer, plan)
+    writer = serializer._writer(detached_plan)
+    href = detached_plan.href(serializer.router)
+    for chunk, future in pending:
+        applied = iter(future.result())
+        output = []
+        for value in chunk:
+            if rows or hasattr(value, 'Meta'):
+                value = serializer._serialize_planned(
+                    Detached(value, dict(zip(names, next(applied)))),
+                    detached_plan, writer, href, context)
+            output.append(value)
+        yield output
+
+
+def serialize(
+        serializer, values, expand=None, include=None, exclude=None,
+        context=None):
+    """Serialize a collection by partitioning it across the serializers executor.
+
+    Collections smaller than the `parallel_threshold` of the serializer will
+    be serialized serially. The order of the items is always preserved.
+
+    When the executor is a ProcessPoolExecutor only the values of attributes
+    with strategies are sent to the worker processes (along with a reference
+    to the Meta class), and the rest of the object (nested values and metadata)
+    is serialized within the calling process.
+
+    Args:
+        serializer (watson.serialize.serializers.Instance): The serializer
+        values (mixed): The iterable to be serialized
+        expand (list): Attributes to be expanded on the object
+        include (list): Attributes to be included in the output
+        exclude (list): Attributes to be excluded from the list
+        context (watson.serialize.serializers.Context): The state of the call,
+            created if not specified
+
+    Returns:
+        list: The serialized items
+    """
+    if context is None:
+        context = serializer._context()
+    values, plan = serializer._prepare_query(values, expand, include, exclude)
+    rows = plan is not None
+    values = list(values)
+    if len(values) < serializer.parallel_threshold or not rows and len(
+            {value.Meta for value in values if hasattr(value, 'Meta')}) > 1:
+        # mixed collections are dispatched per class by the serial path
+        if rows:
+            return serializer._serialize_chunk(values, plan, context, rows)
+        return list(serializer._iter_collection(
+            values, context, expand, include, exclude))
+    if not rows:
+        first = next((value for value in values if hasattr(value, 'Meta')), None)
+        if first is None:
+            return values
+        serializer._assign_meta(first)
+        plan = serializer._collection_plan(expand, include, exclude)[0]
+    size = serializer.parallel_chunk_size
+    chunks = [values[i:i + size] for i in range(0, len(values), size)]
+    if isinstance(serializer.executor, futures.ProcessPoolExecutor):
+        results = _map_processes(serializer, chunks, plan, rows, context)
+    else:
+        results = serializer.executor.map(
+            functools.partial(
+                serializer._serialize_chunk, plan=plan, context=context,
+                rows=rows),
+            chunks)
+    return [item for chunk in results for item in chunk]
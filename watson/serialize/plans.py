@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+import collections
+import threading
+
+__all__ = ['Plan', 'Field', 'Href', 'Cache', 'cache', 'hrefs', 'freeze']
+
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+
+def freeze(values):
+    """Convert a list of requested attributes into a hashable tuple.
+
+    Args:
+        values (list): The include/expand/exclude values to freeze
+
+    Returns:
+        tuple: An empty tuple if no values were supplied
+    """
+    if not values:
+        return ()
+    return tuple(values)
+
+
+class Field(collections.namedtuple(
+        'Field', ('name', 'strategy', 'include', 'expand', 'batch'))):
+
+    """A single attribute that will be written to the serialized output.
+
+    Attributes:
+        name (string): The name of the attribute on the model
+        strategy (callable): The strategy used to convert the value, if any
+        include (tuple): Attributes to include on nested models
+        expand (tuple): Attributes to expand on nested models
+        batch (callable): The batch strategy used to convert the values of
+            every object in a collection at once, if any
+    """
+
+    __slots__ = ()
+
+
+Field.__new__.__defaults__ = (None,)
+
+
+class Plan(collections.namedtuple(
+        'Plan', (
+            'meta',
+            'identifier',
+            'fields',
+            'include_null',
+            'route',
+            'expose_meta',
+            'version'))):
+
+    """An immutable description of how to serialize a model.
+
+    A plan only depends on the Meta class of the model and the requested
+    include/expand/exclude attributes, so it can be computed once and shared
+    between every object in a collection (and every request that asks for the
+    same attributes). Plans for nested models are compiled lazily through
+    the same cache when a nested value is first encountered.
+
+    Attributes:
+        meta (class): The Meta class the plan was compiled from
+        identifier (string): The identifying attribute of the model
+        fields (tuple): The ordered Field objects to be serialized
+        include_null (boolean): True if the wildcard include was requested
+        route (string): The name of the route used to generate the href
+        expose_meta (boolean): Whether or not to attach metadata to the output
+        version (string): The attribute that changes whenever the object does
+    """
+
+    __slots__ = ()
+
+    @property
+    def attributes(self):
+        return tuple(field.name for field in self.fields)
+
+    @property
+    def batched(self):
+        return any(field.batch for field in self.fields)
+
+    def href(self, router):
+        """Retrieve the precompiled href for objects serialized by the plan.
+
+        Args:
+            router (watson.routing.routers.Base): The router to assemble the route with
+
+        Returns:
+            Href: None if no metadata is exposed for the plan
+        """
+        if not self.route or not self.expose_meta:
+            return None
+        key = (router, self.route, self.identifier)
+        href = hrefs.get(key)
+        if href is None:
+            href = hrefs.set(key, Href(router, self.route, self.identifier))
+        return href
+
+
+Plan.__new__.__defaults__ = (None, True, None)
+
+
+class Href(object):
+
+    """A route that has been assembled once with a placeholder identifier.
+
+    Generating the href for each object is then a simple concatenation of the
+    identifier value, rather than assembling the route each time. Routes that
+    cannot be templated (or values that the router would treat differently,
+    such as empty values for optional segments) fall back to the router.
+
+    Attributes:
+        router (watson.routing.routers.Base): The router the route belongs to
+        route (string): The name of the route
+        identifier (string): The name of the identifying attribute
+        prefix (string): The assembled path before the identifier
+        suffix (string): The assembled path after the identifier
+    """
+
+    __slots__ = ('router', 'route', 'identifier', 'prefix', 'suffix')
+
+    placeholder = '__watson_serialize_identifier__'
+
+    def __init__(self, router, route, identifier):
+        self.router = router
+        self.route = route
+        self.identifier = identifier
+        self.prefix = self.suffix = None
+        path = router.assemble(route, **{identifier: self.placeholder})
+        if path.count(self.placeholder) == 1:
+            self.prefix, self.suffix = path.split(self.placeholder)
+
+    @property
+    def templated(self):
+        return self.prefix is not None
+
+    def __call__(self, value):
+        if self.prefix is None or not value:
+            return self.router.assemble(self.route, **{self.identifier: value})
+        return self.prefix + str(value) + self.suffix
+
+
+class Cache(object):
+
+    """A bounded, thread safe LRU cache for compiled plans.
+
+    Usage:
+
+        .. code-block: python
+
+            cache = plans.Cache(maxsize=128)
+            plan = cache.get(key)
+            if plan is None:
+                plan = cache.set(key, compile_plan())
+            cache.info()  # CacheInfo(hits=0, misses=1, maxsize=128, currsize=1)
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+cache = Cache()
+hrefs = Cache()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import sqlalchemy
+from sqlalchemy import orm
+
+__all__ = ['entity', 'columns', 'project', 'rows', 'eager_options', 'load']
+
+
+def entity(query):
+    """Retrieve the mapped class that a SQLAlchemy query will return.
+
+    Args:
+        query (sqlalchemy.orm.Query): The query to inspect
+
+    Returns:
+        The mapped class, or None if the query does not return a single entity
+        (or is not a query at all).
+    """
+    descriptions = getattr(query, 'column_descriptions', None)
+    if not descriptions or len(descriptions) != 1:
+        return None
+    description = descriptions[0]
+    if description['entity'] is None or description['type'] is not description['entity']:
+        return None
+    return description['entity']
+
+
+def columns(model, plan):
+    """Retrieve the names of the fields in a plan that are mapped columns.
+
+    Args:
+        model (class): The mapped class
+        plan (watson.serialize.plans.Plan): The plan being serialized
+
+    Returns:
+        list: The names of the column attributes, in the order of the plan
+    """
+    column_attrs = sqlalchemy.inspect(model).column_attrs
+    return [field.name for field in plan.fields if field.name in column_attrs]
+
+
+def project(query, model, plan):
+    """Only load the columns from the database that the plan requires.
+
+    Args:
+        query (sqlalchemy.orm.Query): The query to project
+        model (class): The mapped class returned by the query
+        plan (watson.serialize.plans.Plan): The plan being serialized
+
+    Returns:
+        sqlalchemy.orm.Query
+    """
+    names = columns(model, plan)
+    if not names:
+        return query
+    return query.options(
+        orm.load_only(*[getattr(model, name) for name in names]))
+
+
+def rows(query, model, plan):
+    """Convert the query into one that returns tuples of the plan's columns.
+
+    This avoids creating ORM objects (and the identity map overhead that goes
+    with them) entirely, but is only possible when every field in the plan is
+    a mapped column.
+
+    Args:
+        query (sqlalchemy.orm.Query): The query to project
+        model (class): The mapped class returned by the query
+        plan (watson.serialize.plans.Plan): The plan being serialized
+
+    Returns:
+        sqlalchemy.orm.Query: None if the plan contains non-column fields
+    """
+    names = columns(model, plan)
+    if not names or len(names) != len(plan.fields):
+        return None
+    return query.with_entities(*[getattr(model, name) for name in names])
+
+
+def eager_options(model, plan, nested_plan, depth=5):
+    """Generate loader options for every relationship that the plan will access.
+
+    Collections are loaded with `selectinload` and scalar relationships with
+    `joinedload`, recursing into the plans of the related models so that
+    expanded relationships of relationships are loaded as well.
+
+    Args:
+        model (class): The mapped class
+        plan (watson.serialize.plans.Plan): The plan being serialized
+        nested_plan (callable): Returns the plan for a related model, called
+            with the field, the related class and whether it is a collection
+        depth (int): The maximum depth of relationships to load
+
+    Returns:
+        list: The loader options to apply to the query
+    """
+    if depth <= 0:
+        return []
+    relationships = sqlalchemy.inspect(model).relationships
+    options = []
+    for field in plan.fields:
+        if field.name not in relationships:
+            continue
+        relationship = relationships[field.name]
+        attr = getattr(model, field.name)
+        if relationship.uselist:
+            loader = orm.selectinload(attr)
+        else:
+            loader = orm.joinedload(attr)
+        related = relationship.mapper.class_
+        if not field.strategy and hasattr(related, 'Meta'):
+            related_options = eager_options(
+                related,
+                nested_plan(field, related, relationship.uselist),
+                nested_plan,
+                depth - 1)
+            if related_options:
+                loader = loader.options(*related_options)
+        options.append(loader)
+    return options
+
+
+def load(query, model, instances, options):
+    """Apply loader options to instances that have already been loaded.
+
+    The instances are selected again by their primary key with the options
+    applied, which populates the relationships of the instances already in
+    the session rather than lazy loading them one at a time.
+
+    Args:
+        query (sqlalchemy.orm.Query): The query the instances were loaded from
+        model (class): The mapped class of the instances
+        instances (list): The loaded instances
+        options (list): The loader options to apply
+    """
+    mapper = sqlalchemy.inspect(model)
+    if not instances or not options or len(mapper.primary_key) != 1:
+        return
+    identities = [
+        mapper.primary_key_from_instance(instance)[0] for instance in instances]
+    query.session.query(model).filter(
+        mapper.primary_key[0].in_(identities)).options(*options).all()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import collections
+import re
+from watson.common import strings
+from watson.serialize import plans
+
+__all__ = ['Selection', 'Attribute', 'parse', 'selection', 'expands', 'cache']
+
+
+class Attribute(collections.namedtuple('Attribute', ('name', 'selection'))):
+
+    """A single attribute requested in the query string.
+
+    Attributes:
+        name (string): The name of the attribute
+        selection (Selection): The attributes requested on the nested value,
+            None if no parentheses were given
+    """
+
+    __slots__ = ()
+
+
+class Selection(collections.namedtuple(
+        'Selection', ('include', 'expand', 'exclude'))):
+
+    """The attributes requested for an object, parsed from the query string.
+
+    A selection can be passed directly to a serializer, and nested selections
+    are passed down to the nested serializers as is, so the query string is
+    only ever parsed once.
+
+    Attributes:
+        include (tuple): The names of the attributes to include
+        expand (tuple): The Attribute objects to expand
+        exclude (tuple): The names of the attributes to exclude
+    """
+
+    __slots__ = ()
+
+    def kwargs(self):
+        """Convert the selection into the arguments for a serializer.
+
+        Returns:
+            dict: The expand, include and exclude arguments
+        """
+        return {
+            'expand': self.expand or None,
+            'include': self.include or None,
+            'exclude': self.exclude or None,
+        }
+
+
+Selection.__new__.__defaults__ = ((), (), ())
+
+cache = plans.Cache(maxsize=256)
+
+
+_tokens = re.compile(r'[(),]|[^(),]+')
+
+
+def _parse(tokens):
+    # the parents of the current attribute are kept on a stack rather than
+    # recursing, so deeply nested parentheses cannot exhaust the stack
+    stack = []
+    attributes = []
+    name = ''
+    children = None
+    for token in tokens:
+        if token == '(':
+            stack.append((attributes, name))
+            attributes, name, children = [], '', None
+        elif token == ',' or token == ')':
+            if token == ')' and not stack:
+                continue
+            name = name.strip()
+            if name:
+                attributes.append(Attribute(name, _nested(children)))
+            name, children = '', None
+            if token == ')':
+                children = tuple(attributes)
+                attributes, name = stack.pop()
+        elif children is None:
+            name += token
+    while True:
+        name = name.strip()
+        if name:
+            attributes.append(Attribute(name, _nested(children)))
+        if not stack:
+            return tuple(attributes)
+        children = tuple(attributes)
+        attributes, name = stack.pop()
+
+
+def _nested(children):
+    if children is None:
+        return None
+    return Selection(
+        include=tuple(child.name for child in children if child.selection is None),
+        expand=tuple(
+            child._replace(name=strings.snakecase(child.name))
+            for child in children if child.selection is not None))
+
+
+def parse(string):
+    """Parse a comma separated list of attributes into a tree.
+
+    Attributes may be followed by a comma separated list of nested attributes
+    within parentheses, which may themselves be nested. The result is cached
+    against the string.
+
+    Args:
+        string (string): The value from the query string
+
+    Returns:
+        tuple: The Attribute objects in the order they were requested
+
+    Usage:
+
+        .. code-block: python
+
+            parse('id,related(id,name)')
+            # (Attribute('id', None),
+            #  Attribute('related', Selection(include=('id', 'name'), expand=(), exclude=())))
+    """
+    attributes = cache.get(string)
+    if attributes is None:
+        attributes = cache.set(string, _parse(_tokens.findall(string)))
+    return attributes
+
+
+def _names(values):
+    if isinstance(values, str):
+        values = (values,)
+    return tuple(
+        attribute.name for value in values for attribute in parse(value))
+
+
+def expands(values):
+    """Convert the requested expands into Attribute objects.
+
+    Args:
+        values (mixed): A string, a list of strings, or Attribute objects that
+            have already been parsed (which are returned as is)
+
+    Returns:
+        tuple: The expanded Attribute objects, with snakecased names
+    """
+    if not values:
+        return ()
+    if isinstance(values, str):
+        values = (values,)
+    output = []
+    for value in values:
+        if isinstance(value, Attribute):
+            output.append(value)
+            continue
+        output.extend(
+            attribute._replace(name=strings.snakecase(attribute.name))
+            for attribute in parse(value))
+    return tuple(output)
+
+
+def selection(include=None, expand=None, exclude=None):
+    """Parse the raw include, expand and exclude values of a request.
+
+    The selection is cached against the raw values, as clients will usually
+    repeat the same combinations.
+
+    Args:
+        include (string): The attributes to include
+        expand (string): The attributes to expand
+        exclude (string): The attributes to exclude
+
+    Returns:
+        Selection
+    """
+    key = ('selection', include, expand, exclude)
+    selection = cache.get(key)
+    if selection is None:
+        selection = cache.set(key, Selection(
+            include=_names(include) if include else (),
+            expand=expands(expand),
+            exclude=_names(exclude) if exclude else ()))
+    return selection
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 import abc
+import itertools
 from collections import abc as collections
-import re
 from watson.common import imports, strings
 from watson.db import utils
+from watson.serialize import (
+    aio, batches, columnar, compiler, deltas, included, limits, pagination,
+    parallel, plans, queries, selections)
+
+
+_missing = object()
 
 
 def split_attributes(string):
@@ -21,6 +27,29 @@ def split_attributes(string):
     return parts
 
 
+class Context(object):
+
+    """The state of a single top level call to a serializer.
+
+    A context is created for each call and passed down to the nested
+    serializers explicitly, rather than being stored on them, so that a
+    serializer can be shared between calls that are interleaved (such as
+    streaming or async calls).
+
+    Attributes:
+        guard (watson.serialize.limits.Guard): Enforces the limits of the
+            serializer, None if no limits are set
+        included (watson.serialize.included.Included): The nested objects of
+            a normalized output, None if the output is not normalized
+    """
+
+    __slots__ = ('guard', 'included')
+
+    def __init__(self, guard=None, included=None):
+        self.guard = guard
+        self.included = included
+
+
 class Base(metaclass=abc.ABCMeta):
 
     router = None
@@ -43,6 +72,36 @@ class Instance(Base):
         include_name (boolean): Whether or not to include null values in the output
         strategies
         type (mixed): The class name of the object being serialized
+        compiled (boolean): Whether or not to serialize objects with a function
+            generated specifically for the plan (see watson.serialize.compiler)
+        project (boolean): Whether or not to only load the columns required
+            from SQLAlchemy queries (see watson.serialize.queries)
+        eager_load (boolean): Whether or not to eager load the relationships
+            that will be serialized from SQLAlchemy queries and Pagination
+        fragment_cache (watson.serialize.caches.Fragments): The cache to store
+            the serialized output of individual objects in
+        executor (concurrent.futures.Executor): Serialize large collections in
+            chunks across the executor (see watson.serialize.parallel)
+        parallel_threshold (int): The minimum size of a collection to be
+            serialized with the executor
+        parallel_chunk_size (int): The number of items sent to the executor at once
+        batch_size (int): The number of objects passed to the batch strategies
+            of a Meta class at once when iterating a collection (nested values
+            are batched per parent object)
+        plan_cache (watson.serialize.plans.Cache): The cache to store plans in
+        stats (watson.serialize.instrumentation.Stats): Record where time is
+            spent while serializing, disabled by default
+        limits (watson.serialize.limits.Limits): The limits on the depth,
+            number of objects, fanout and size of the output, which are not
+            enforced by default
+        normalized (boolean): Whether or not to serialize each distinct nested
+            object once into a top level `included` map, referencing it by
+            its identifier wherever it is nested (see watson.serialize.included)
+        depth (int): The level of nesting of the serializer
+
+    Nested serializers are created once and reused, so the serializer should
+    be configured before it is first called. The state of each call is kept
+    in a Context, so a configured serializer can be shared between calls.
 
     Returns:
         A list of objects that are suitable to be json encoded
@@ -66,6 +125,20 @@ class Instance(Base):
     meta = None
     expand = True
     include_null = None
+    compiled = False
+    project = False
+    eager_load = False
+    fragment_cache = None
+    executor = None
+    parallel_threshold = 1000
+    parallel_chunk_size = 250
+    batch_size = 1000
+    plan_cache = plans.cache
+    stats = None
+    limits = None
+    normalized = False
+    depth = 0
+    _children = None
 
     @property
     def identifier(self):
@@ -86,13 +159,17 @@ class Instance(Base):
     def strategies(self):
         return getattr(self.meta, 'strategies', None)
 
+    @property
+    def batch_strategies(self):
+        return getattr(self.meta, 'batch_strategies', None)
+
     @property
     def expose_meta(self):
         return getattr(self.meta, 'expose_meta', True)
 
     def _assign_meta(self, instance):
         if not self.meta and hasattr(instance, 'Meta'):
-            self.type = instance.__class__
+            self.type = instance if isinstance(instance, type) else instance.__class__
             self.meta = instance.Meta
             self.expand = getattr(instance.Meta, 'expand', True)
             if self.include_null is None:
@@ -107,8 +184,7 @@ class Instance(Base):
 
     def _generate_attributes(self, expand=None, include=None, exclude=None):
         if include and include[0] == '*':
-            self.include_null = True
-            include.remove('*')
+            include = include[1:]
         _attributes = set(self.attributes)
         if not include:
             attributes = _attributes
@@ -118,87 +194,467 @@ class Instance(Base):
             attributes = self._cleaned_attribute_names(
                 attributes, _attributes, include)
         if exclude:
-            try:
-                exclude.remove(self.identifier)
-            except ValueError:
-                pass
-            attributes = attributes - set(exclude)
+            attributes = attributes - (set(exclude) - set([self.identifier]))
         if expand:
             attributes = self._cleaned_attribute_names(
                 attributes, _attributes, expand)
         return attributes
 
-    def _generate_expands(self, expands=None):
-        output = {}
-        for expand in expands or []:
-            m = re.search(r'(\w+)\((.*)\)', expand)
-            if not m:
-                output[expand] = None
+    def _compile_plan(self, expand=None, include=None, exclude=None):
+        expands = {
+            attribute.name: attribute.selection
+            for attribute in selections.expands(expand)}
+        attributes = self._generate_attributes(expands.keys(), include, exclude)
+        strategies = self.strategies or {}
+        batch_strategies = self.batch_strategies or {}
+        fields = []
+        for attr in self.attributes:
+            if attr not in attributes:
                 continue
-            output[strings.snakecase(m.group(1))] = [
-                v.strip() for v in split_attributes(m.group(2))
-            ]
-        return output
+            selection = expands.get(attr) or selections.Selection()
+            batch = batch_strategies.get(attr)
+            fields.append(plans.Field(
+                attr,
+                None if batch else strategies.get(attr),
+                selection.include,
+                selection.expand,
+                batch))
+        return plans.Plan(
+            meta=self.meta,
+            identifier=self.identifier,
+            fields=tuple(fields),
+            include_null=bool(include and include[0] == '*'),
+            route=getattr(self.meta, 'route', None),
+            expose_meta=self.expose_meta,
+            version=getattr(self.meta, 'version', None))
+
+    def _plan(self, expand=None, include=None, exclude=None):
+        """Retrieve the compiled plan for the current Meta class.
+
+        Plans are cached on the `plan_cache` so that the requested attributes
+        are only calculated once per Meta class and query.
+        """
+        include, expand, exclude = (
+            plans.freeze(include), plans.freeze(expand), plans.freeze(exclude))
+        key = (self.__class__, self.meta, include, expand, exclude)
+        plan = self.plan_cache.get(key)
+        stats = self.stats
+        if stats is not None:
+            if plan is None:
+                stats.misses['plans'] += 1
+                plan = self.plan_cache.set(key, stats.timed(
+                    'plan', self._compile_plan, expand, include, exclude))
+            else:
+                stats.hits['plans'] += 1
+            return stats.instrument(plan)
+        if plan is None:
+            plan = self.plan_cache.set(
+                key, self._compile_plan(expand, include, exclude))
+        return plan
+
+    def _writer(self, plan):
+        # instrumented plans time their strategies, which generated functions
+        # would bypass
+        if self.compiled and self.stats is None:
+            return compiler.function(plan)
+        return None
 
     def _serialize_collection(
-            self, values, expand=None, include=None, exclude=None):
-        output = []
+            self, values, context, expand=None, include=None, exclude=None):
+        if self.executor is not None:
+            return parallel.serialize(
+                self, values, expand, include, exclude, context)
+        return list(self._iter_collection(
+            values, context, expand, include, exclude))
+
+    def _serialize_chunk(self, values, plan, context, rows=False):
+        if plan.batched:
+            indexes = [
+                index for index, value in enumerate(values)
+                if rows or hasattr(value, 'Meta')]
+            batched, plan = batches.apply(
+                self, [values[index] for index in indexes], plan)
+            values = list(values)
+            for index, value in zip(indexes, batched):
+                values[index] = value
+        writer = self._writer(plan)
+        href = plan.href(self.router)
+        return [
+            self._serialize_planned(value, plan, writer, href, context)
+            if rows or hasattr(value, 'Meta') else value
+            for value in values]
+
+    def _prepare_query(self, values, expand=None, include=None, exclude=None):
+        """Push the plan down into a SQLAlchemy query.
+
+        Depending on the `project` and `eager_load` settings, the query will
+        only select the columns that are required and eager load the
+        relationships that will be serialized.
+
+        Returns:
+            tuple: (values, plan), the plan will only be returned if the values
+                have been converted to rows of columns rather than models.
+        """
+        if not self.project and not self.eager_load:
+            return values, None
+        is_paginator = isinstance(values, (utils.Pagination, pagination.Cursor))
+        query = values.query if is_paginator else values
+        model = queries.entity(query)
+        if model is None or not hasattr(model, 'Meta'):
+            return values, None
+        self._assign_meta(model)
+        if not self.expand:
+            include = [self.identifier]
+        plan = self._plan(expand, include, exclude)
+        options = []
+        if self.eager_load:
+            options = queries.eager_options(model, plan, self._nested_plan)
+        if is_paginator:
+            queries.load(query, model, values.items, options)
+            return values, None
+        if self.project:
+            rows = queries.rows(values, model, plan)
+            if rows is not None:
+                return rows, plan
+            values = queries.project(values, model, plan)
+        if options:
+            values = values.options(*options)
+        return values, None
+
+    def _nested_plan(self, field, model, collection):
+        serializer, include = self._nested(field, [] if collection else model)
+        serializer._assign_meta(model)
+        if collection and not serializer.expand:
+            include = [serializer.identifier]
+        return serializer._plan(field.expand, include)
+
+    def _iter_collection(
+            self, values, context, expand=None, include=None, exclude=None):
+        for value, serializer, plan, writer, href in self._iter_planned(
+                values, expand, include, exclude):
+            if serializer is not None:
+                value = serializer._serialize_planned(
+                    value, plan, writer, href, context)
+            yield value
+
+    def _iter_planned(
+            self, values, expand=None, include=None, exclude=None,
+            dispatch=None):
+        """Pair each item of a collection with the plan to serialize it with.
+
+        Once an item with batch strategies is found, the rest of the
+        collection is consumed in pages of `batch_size` so that the batch
+        strategies can be applied to each page at once.
+
+        Yields:
+            tuple: (value, serializer, plan, writer, href), the serializer
+                will be None for items that are not serialized
+        """
+        values, plan = self._prepare_query(values, expand, include, exclude)
+        if plan is not None:
+            href = plan.href(self.router)
+            if not plan.batched:
+                entry = (self, plan, self._writer(plan), href)
+                for value in values:
+                    yield (value,) + entry
+                return
+            for page in batches.pages(values, self.batch_size):
+                page, batched = batches.apply(self, page, plan)
+                entry = (self, batched, self._writer(batched), href)
+                for value in page:
+                    yield (value,) + entry
+            return
+        if dispatch is None:
+            dispatch = {}
+        last = entry = None
+        values = iter(values)
         for value in values:
+            if not hasattr(value, 'Meta'):
+                yield value, None, None, None, None
+                continue
+            if value.__class__ is not last:
+                last = value.__class__
+                entry = self._dispatch(value, dispatch, expand, include, exclude)
+                if entry[1].batched:
+                    yield from self._iter_pages(
+                        itertools.chain((value,), values), dispatch,
+                        expand, include, exclude)
+                    return
+            yield (value,) + entry
+
+    def _iter_pages(self, values, dispatch, expand, include, exclude):
+        for page in batches.pages(values, self.batch_size):
+            entries = [
+                self._dispatch(value, dispatch, expand, include, exclude)
+                if hasattr(value, 'Meta') else None
+                for value in page]
+            groups = {}
+            for index, entry in enumerate(entries):
+                if entry is not None and entry[1].batched:
+                    groups.setdefault(entry, []).append(index)
+            for entry, indexes in groups.items():
+                serializer, plan, _, href = entry
+                batched, plan = batches.apply(
+                    serializer, [page[index] for index in indexes], plan)
+                entry = (serializer, plan, serializer._writer(plan), href)
+                for index, value in zip(indexes, batched):
+                    page[index] = value
+                    entries[index] = entry
+            for value, entry in zip(page, entries):
+                if entry is None:
+                    yield value, None, None, None, None
+                else:
+                    yield (value,) + entry
+
+    def _collection_plan(self, expand=None, include=None, exclude=None):
+        if not self.expand:
+            include = [self.identifier]
+        plan = self._plan(expand, include, exclude)
+        return plan, self._writer(plan), plan.href(self.router)
+
+    def _dispatch(
+            self, value, dispatch, expand=None, include=None, exclude=None):
+        """Retrieve the serializer and plan for an item in a collection.
+
+        The first item with a Meta class is serialized by this serializer,
+        while items with a different Meta class are serialized by a serializer
+        for their own Meta. Each is resolved once per class and stored in
+        `dispatch`, so mixed collections are not re-planned per item.
+
+        Returns:
+            tuple: (serializer, plan, writer, href)
+        """
+        cls = value.__class__
+        entry = dispatch.get(cls)
+        if entry is None:
             self._assign_meta(value)
-            if hasattr(value, 'Meta'):
-                if not self.expand:
-                    include = [self.identifier]
-                value = self._serialize_instance(
-                    value, expand=expand, include=include, exclude=exclude)
-            output.append(value)
-        return output
-
-    def _includes_expands_from_expand(self, expand):
-        expands = []
-        includes = []
-        for expand_ in expand or []:
-            if '(' in expand_:
-                expands.append(expand_)
+            serializer = self
+            if value.Meta is not self.meta:
+                serializer = self._sibling(value.Meta)
+            entry = dispatch[cls] = (serializer,) + serializer._collection_plan(
+                expand, include, exclude)
+        return entry
+
+    def _sibling(self, meta):
+        children = self._children
+        if children is None:
+            children = self._children = {}
+        key = ('sibling', meta)
+        serializer = children.get(key)
+        if serializer is None:
+            serializer = Instance.from_meta(meta, router=self.router)
+            serializer.expand = getattr(meta, 'expand', True)
+            serializer.include_null = getattr(meta, 'include_null', False)
+            self._inherit(serializer, self.depth)
+            children[key] = serializer
+        return serializer
+
+    def _inherit(self, serializer, depth):
+        serializer.compiled = self.compiled
+        serializer.plan_cache = self.plan_cache
+        serializer.fragment_cache = self.fragment_cache
+        serializer.limits = self.limits
+        serializer.depth = depth
+        if self.stats is not None:
+            serializer.stats = self.stats
+
+    def _context(self, normalized=False):
+        """Create the state of a top level call.
+
+        Args:
+            normalized (boolean): Whether or not the output of the call can be
+                normalized, which requires the complete output to be returned
+                at once (rather than streamed or written by an encoder)
+
+        Returns:
+            Context
+        """
+        guard = None
+        if self.limits is not None:
+            if self.executor is None:
+                guard = limits.Guard(self.limits)
             else:
-                includes.append(expand_)
-        return includes, expands
+                guard = limits.ThreadedGuard(self.limits)
+        return Context(
+            guard, included.Included() if normalized and self.normalized else None)
 
     def _serialize_instance(
-            self, instance, expand=None, include=None, exclude=None):
+            self, instance, context, expand=None, include=None, exclude=None):
         if not instance:
             return None
         self._assign_meta(instance)
+        plan = self._plan(expand, include, exclude)
+        if plan.batched:
+            (instance,), plan = batches.apply(self, [instance], plan)
+        return self._serialize_planned(
+            instance, plan, self._writer(plan), plan.href(self.router), context)
+
+    def _serialize_planned(self, instance, plan, writer, href, context):
+        if not instance:
+            return None
+        if context.included is not None and self.depth and getattr(
+                instance, plan.identifier, None) is not None:
+            return self._serialize_included(
+                instance, plan, writer, href, context)
+        guard = context.guard
+        if guard is None:
+            return self._serialize_object(instance, plan, writer, href, context)
+        if not self.depth:
+            guard.top(instance)
+            obj = self._serialize_object(instance, plan, writer, href, context)
+        elif guard.enter(instance):
+            try:
+                obj = self._serialize_object(
+                    instance, plan, writer, href, context)
+            finally:
+                guard.exit(instance)
+        else:
+            return self._reference(instance, plan, href)
+        if guard.sized:
+            guard.add(obj)
+        return obj
+
+    def _serialize_included(self, instance, plan, writer, href, context):
+        # nested objects are serialized once into the included objects, and
+        # only referenced by their identifier within the output
+        reference = self._reference(instance, plan, href)
+        identifier = reference[plan.identifier]
+        if len(plan.fields) < 2 or not context.included.add(plan, identifier):
+            return reference
+        guard = context.guard
+        if guard is None:
+            obj = self._serialize_object(instance, plan, writer, href, context)
+        elif guard.enter(instance):
+            try:
+                obj = self._serialize_object(
+                    instance, plan, writer, href, context)
+            finally:
+                guard.exit(instance)
+            if guard.sized:
+                guard.add(obj)
+        else:
+            return reference
+        # objects may be wrapped with the values converted by batch strategies
+        # or worker processes, which are keyed by the class of the original
+        name = getattr(plan.meta, 'type', None) or imports.get_qualified_name(
+            parallel.original(instance).__class__)
+        context.included.set(name, identifier, obj)
+        return reference
+
+    def _serialize_object(self, instance, plan, writer, href, context):
+        stats = self.stats
+        if stats is not None:
+            stats.object(self.depth)
+        include_null = bool(plan.include_null or self.include_null)
+        # the nested objects of normalized output are only references, which
+        # would be missing from the included objects if a fragment was reused,
+        # and the output of a limited call depends upon where the object was
+        # nested (and must be counted against the limits)
+        fragments = self.fragment_cache
+        if context.included is not None or context.guard is not None:
+            fragments = None
+        if fragments is not None:
+            variant = (self.router, include_null)
+            obj = fragments.get(instance, plan, variant)
+            if stats is not None:
+                (stats.misses if obj is None else stats.hits)['fragments'] += 1
+            if obj is not None:
+                return obj
+        if writer:
+            obj = writer(instance, include_null, self._serialize_nested, context)
+        elif stats is None or self.depth:
+            obj = self._serialize_fields(instance, plan, include_null, context)
+        else:
+            obj = stats.timed(
+                'fields', self._serialize_fields, instance, plan, include_null,
+                context)
+        if stats is None:
+            obj = self._attach_object_meta(obj, href)
+        else:
+            obj = stats.timed('href', self._attach_object_meta, obj, href)
+        if fragments is not None:
+            fragments.set(instance, plan, obj, variant)
+        return obj
+
+    def _serialize_fields(self, instance, plan, include_null, context):
         obj = {}
-        expands = self._generate_expands(expand)
-        for attr in self._generate_attributes(expands.keys(), include, exclude):
-            if not hasattr(instance, attr):
+        for field in plan.fields:
+            value = getattr(instance, field.name, _missing)
+            if value is _missing:
                 continue
-            value = getattr(instance, attr)
-            if value is not None or self.include_null:
-                if self.strategies and attr in self.strategies:
-                    value = self.strategies[attr](value)
-                elif isinstance(value, list):
-                    serializer = Instance(self.router)
-                    sub_includes, sub_expands = self._includes_expands_from_expand(
-                        expands.get(attr))
-                    if sub_includes:
-                        serializer.expand = True
-                    value = serializer(
-                        value,
-                        include=sub_includes, expand=sub_expands)
-                elif hasattr(value, 'Meta'):
-                    serializer = Instance.from_meta(
-                        value.Meta, router=self.router)
-                    sub_includes, sub_expands = self._includes_expands_from_expand(
-                        expands.get(attr))
-                    if not sub_includes:
-                        sub_includes = [serializer.identifier]
-                    value = serializer(
-                        value, include=sub_includes, expand=sub_expands)
-                obj[attr] = value
-        return self._attach_object_meta(obj)
-
-    def _attach_object_meta(self, instance):
+            if value is not None or include_null:
+                if field.strategy:
+                    value = field.strategy(value)
+                elif isinstance(value, list) or hasattr(value, 'Meta'):
+                    value = self._serialize_nested(field, value, context)
+                obj[field.name] = value
+        return obj
+
+    def _nested(self, field, value):
+        """Retrieve the serializer and includes for a nested value.
+
+        Nested serializers are created once per Meta class (and kind of value)
+        and then reused for every nested value, inheriting the configuration
+        of this serializer at the time they were created.
+
+        Returns:
+            tuple: (serializer, include), serializer will be None if the value
+                does not need to be serialized.
+        """
+        is_list = isinstance(value, list)
+        if is_list:
+            # the Meta of a list serializer is assigned from its first item
+            key = ('list', getattr(value[0], 'Meta', None) if value else None)
+        elif hasattr(value, 'Meta'):
+            key = ('object', value.Meta)
+        else:
+            return None, None
+        children = self._children
+        if children is None:
+            children = self._children = {}
+        serializer = children.get(key)
+        if serializer is None:
+            if is_list:
+                serializer = Instance(self.router)
+            else:
+                serializer = Instance.from_meta(value.Meta, router=self.router)
+            self._inherit(serializer, self.depth + 1)
+            if key[1] is not None:
+                children[key] = serializer
+        if is_list:
+            return serializer, field.include
+        return serializer, field.include or (serializer.identifier,)
+
+    def _reference(self, instance, plan, href):
+        """Serialize only the identifier (and href) of an object.
+
+        Used for objects that are nested within themselves.
+        """
+        identifier = plan.identifier
+        return self._attach_object_meta(
+            {identifier: getattr(instance, identifier, None)}, href)
+
+    def _serialize_nested(self, field, value, context):
+        serializer, include = self._nested(field, value)
+        if serializer is None:
+            return value
+        expand = field.expand
+        guard = context.guard
+        if guard is not None:
+            include, expand = guard.nested(
+                self.depth + 1, value, include, expand)
+        if self.stats is not None and not self.depth:
+            return self.stats.timed(
+                'nested', serializer._serialize, value, expand, include,
+                None, context)
+        return serializer._serialize(value, expand, include, None, context)
+
+    def _attach_object_meta(self, instance, href=None):
+        if href:
+            instance['meta'] = {
+                'href': href(instance[href.identifier])
+            }
+            return instance
         if not hasattr(self.meta, 'route') or not self.expose_meta:
             return instance
         instance['meta'] = {
@@ -210,43 +666,229 @@ class Instance(Base):
     def _attach_collection_meta(self, obj, instance):
         if not self.expose_meta:
             return obj
-        obj = {
-            'items': obj
+        if self.stats is not None:
+            meta = self.stats.timed(
+                'collection_meta', self.collection_meta, instance, len(obj))
+        else:
+            meta = self.collection_meta(instance, len(obj))
+        return {
+            'items': obj,
+            'meta': meta
         }
-        is_paginator = isinstance(instance, utils.Pagination)
+
+    def collection_meta(self, instance, count):
+        """Generate the metadata for a serialized collection.
+
+        Args:
+            instance (mixed): The iterable that was serialized
+            count (int): The number of items that were serialized
+
+        Cursors output the hrefs of the next and previous pages (when they
+        exist) rather than the page number, and only output a total if they
+        were asked to count or estimate it.
+
+        Returns:
+            dict: The limit, page, total and href of the collection
+        """
+        if isinstance(instance, pagination.Cursor):
+            return self._cursor_meta(instance)
         pages = ''
         page = 1
-        limit = 0
-        total = 0
-        if is_paginator:
+        if isinstance(instance, utils.Pagination):
             limit = instance.limit
             total = instance.total
             page = instance.page
-            pages = [str(page) for page in instance.iter_pages() if page.id == instance.page]
+            if 1 <= page <= instance.pages:
+                pages = str(utils.Page(page))
         else:
-            total = len(obj['items'])
+            total = count
             limit = total
-        obj['meta'] = {
+        meta = {
             'limit': limit,
             'page': page,
             'total': total
         }
         if hasattr(self.meta, 'route'):
-            obj['meta']['href'] = '{}{}'.format(
-                self.router.assemble(self.meta.route), ''.join(pages))
-        return obj
+            meta['href'] = '{}{}'.format(
+                self.router.assemble(self.meta.route), pages)
+        return meta
+
+    def _cursor_meta(self, instance):
+        meta = {
+            'limit': instance.limit,
+            'total': instance.total
+        }
+        if hasattr(self.meta, 'route'):
+            path = self.router.assemble(self.meta.route)
+            meta['href'] = instance.href(
+                path, after=instance.after, before=instance.before)
+            if instance.next is not None:
+                meta['next'] = instance.href(path, after=instance.next)
+            if instance.previous is not None:
+                meta['prev'] = instance.href(path, before=instance.previous)
+        return meta
+
+    def iter_serialize(
+            self, instance, expand=None, include=None, exclude=None,
+            chunk_size=1000):
+        """Serialize the items of an iterable one at a time.
+
+        Unlike calling the serializer directly, the serialized items are never
+        held in memory together, which makes it suitable for exporting large
+        result sets. SQLAlchemy queries will be fetched in batches of
+        `chunk_size` rows via `yield_per`.
+
+        Args:
+            instance (mixed): An iterable, Pagination or SQLAlchemy Query
+            expand (list): Attributes to be expanded on the object
+            include (list): Attributes to be included in the output
+            exclude (list): Attributes to be excluded from the list
+            chunk_size (int): The number of rows to fetch from the database at a time
+
+        Yields:
+            The serialized representation of each item
+        """
+        return self._iter_serialize(
+            instance, self._context(), expand, include, exclude, chunk_size)
+
+    def _iter_serialize(
+            self, instance, context, expand=None, include=None, exclude=None,
+            chunk_size=1000):
+        if hasattr(instance, 'yield_per'):
+            instance = instance.yield_per(chunk_size)
+        return self._iter_collection(
+            instance, context, expand, include, exclude)
 
-    def _serialize(self, instance, expand=None, include=None, exclude=None):
+    def serialize_columns(
+            self, instance, expand=None, include=None, exclude=None,
+            orient='columns', arrays=False):
+        """Serialize a collection into columns rather than a list of objects.
+
+        See watson.serialize.columnar.serialize.
+
+        Returns:
+            dict: The columns, data, hrefs and meta of the collection
+        """
+        return columnar.serialize(
+            self, instance, expand, include, exclude, orient, arrays)
+
+    def delta(
+            self, instance, expand=None, include=None, exclude=None,
+            previous=None):
+        """Serialize only the attributes of an object that have changed.
+
+        The output is a JSON Merge Patch (RFC 7386) of the changes, along with
+        the href of the object in its metadata. Changes are found by comparing
+        against `previous` (an earlier output for the object), or the latest
+        fragment of the object in the `fragment_cache`. Otherwise the history
+        of a SQLAlchemy model is used, which only contains the attributes
+        changed since the session was last flushed (and not changes within
+        nested objects). Any other object is serialized in full.
+
+        Args:
+            instance (mixed): The object to be serialized
+            expand (list): Attributes to be expanded on the object
+            include (list): Attributes to be included in the output
+            exclude (list): Attributes to be excluded from the list
+            previous (dict): The previously serialized object
+
+        Returns:
+            dict: The patch, or None if nothing has changed
+
+        Usage:
+
+            .. code-block: python
+
+                model.name = 'Updated'
+                serializer.delta(model)
+                # {'name': 'Updated', 'meta': {'href': '/models/1'}}
+        """
+        if not instance:
+            return None
+        context = self._context()
+        self._assign_meta(instance)
+        plan = self._plan(expand, include, exclude)
+        if plan.batched:
+            (instance,), plan = batches.apply(self, [instance], plan)
+        href = plan.href(self.router)
+        include_null = bool(plan.include_null or self.include_null)
+        fragments = self.fragment_cache
+        variant = (self.router, include_null)
+        if previous is None and fragments is not None:
+            previous = fragments.previous(instance, plan, variant)
+        if previous is not None:
+            current = self._attach_object_meta(self._serialize_fields(
+                instance, plan, include_null, context), href)
+            if fragments is not None:
+                fragments.set(instance, plan, current, variant)
+            patch = deltas.diff(previous, current)
+            patch.pop('meta', None)
+        else:
+            names = deltas.changed(instance)
+            if names is not None:
+                # removed values are patched with null
+                include_null = True
+                plan = plan._replace(fields=tuple(
+                    field for field in plan.fields if field.name in names))
+            patch = self._serialize_fields(
+                instance, plan, include_null, context)
+        if not patch:
+            return None
+        if href:
+            patch['meta'] = {
+                'href': href(getattr(instance, plan.identifier, None))}
+        return patch
+
+    def aiter_serialize(
+            self, instance, expand=None, include=None, exclude=None,
+            chunk_size=100):
+        """Serialize the items of a sync or async iterable as they arrive.
+
+        Control is yielded to the event loop after every `chunk_size` items.
+        See watson.serialize.aio.iter_serialize.
+
+        Yields:
+            The serialized representation of each item
+        """
+        return aio.iter_serialize(
+            self, instance, expand, include, exclude, chunk_size)
+
+    async def aserialize(
+            self, instance, expand=None, include=None, exclude=None,
+            chunk_size=100):
+        """Serialize an object without blocking the event loop.
+
+        Async iterables (such as the results of an AsyncSession) are consumed
+        directly. See watson.serialize.aio.serialize.
+
+        Return:
+            A list/dictionary representation of the instance
+        """
+        return await aio.serialize(
+            self, instance, expand, include, exclude, chunk_size)
+
+    def _serialize(
+            self, instance, expand=None, include=None, exclude=None,
+            context=None):
         is_iterable = isinstance(instance, collections.Iterable)
         serialize_method = '_serialize_instance'
         if is_iterable:
             serialize_method = '_serialize_collection'
         obj = getattr(self, serialize_method)(
-            instance, expand, include, exclude)
+            instance, context, expand, include, exclude)
         if is_iterable:
             obj = self._attach_collection_meta(obj, instance)
+        if context.included is not None and not self.depth:
+            obj = self._attach_included(obj, context)
         return obj
 
+    def _attach_included(self, obj, context):
+        if obj is None:
+            return obj
+        if isinstance(obj, list):
+            return {'items': obj, 'included': context.included.objects}
+        return dict(obj, included=context.included.objects)
+
     def __call__(self, instance, expand=None, include=None, exclude=None):
         """Serialize an object.
 
@@ -259,8 +901,14 @@ class Instance(Base):
         Return:
             A list/dictionary representation of the instance
         """
-        return self._serialize(
-            instance, expand=expand, include=include, exclude=exclude)
+        context = self._context(normalized=True)
+        stats = self.stats
+        if stats is None or self.depth:
+            return self._serialize(instance, expand, include, exclude, context)
+        stats.calls += 1
+        return stats.timed(
+            'serialize', self._serialize, instance, expand, include, exclude,
+            context)
 
     def __repr__(self):
         return '<{0} type:{1} include null:{2} expand:{3} attributes:{4}>'.format(